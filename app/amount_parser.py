@@ -0,0 +1,132 @@
+# app/amount_parser.py
+"""
+한국어 금액 표현 → 원 단위 정수
+
+    parse_amount("1만2천원")   → 12000
+    parse_amount("삼천오백원") → 3500
+    parse_amount("8.5천")      → 8500
+    parse_amount("12,000원")   → 12000
+    parse_amount("1억 2천만원") → 120000000
+
+find_amounts()는 문장 안에서 금액으로 보이는 부분을 모두 찾아 (금액, (start, end))로 돌려준다.
+모든 메시지에 대해 돌릴 수 있도록 정규식 1회 + 글자 단위 1회 순회로만 처리한다.
+"""
+from __future__ import annotations
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+_DIGITS = {str(d): d for d in range(10)}
+_HANGUL_DIGITS = {
+    "영": 0, "공": 0, "일": 1, "이": 2, "삼": 3, "사": 4,
+    "오": 5, "육": 6, "칠": 7, "팔": 8, "구": 9,
+}
+_SMALL_UNITS = {"십": 10, "백": 100, "천": 1000}
+_BIG_UNITS = {"만": 10 ** 4, "억": 10 ** 8, "조": 10 ** 12}
+
+# 쉼표는 세 자리 묶음일 때만 숫자의 일부로 본다 ('12,000'은 금액, '1,2,3'은 아님)
+_INT = r"(?:\d{1,3}(?:,\d{3})+|\d+)"
+_NUM = rf"(?:{_INT}(?:\.\d+)?|[영공일이삼사오육칠팔구])"
+_UNIT = r"[십백천만억조]"
+
+# 1) 단위가 하나 이상 들어간 표현: '8천', '1만2천', '삼천오백', '만', '1억 2천만'
+# 2) 숫자만 있는 표현: '12000', '12,000'
+#    - 날짜/번호의 일부('2026-01-05', '1번', '3일')는 금액으로 보지 않는다
+_AMOUNT_PATTERN = re.compile(
+    # 숫자/단위 글자로 시작하지 않는 위치는 바로 건너뛴다
+    r"(?=[\d영공일이삼사오육칠팔구십백천만억조])(?:"
+    rf"(?:{_NUM}\s*)?{_UNIT}(?:\s*(?:{_NUM}\s*)?{_UNIT})*"
+    # 마지막 단위 뒤의 일 단위 숫자: '1만2천500원', '구천구백구십구원'
+    # (한글 숫자는 '원' 앞에서만 - '5만이면'의 '이'를 2로 읽지 않도록)
+    rf"(?:\s*{_INT}|[영공일이삼사오육칠팔구](?=\s*원))?(?:\s*원)?"
+    rf"|(?<![\d\-/:.,]){_INT}(?:\.\d+)?(?![\d\-/:]|,\d)"
+    r"(?:\s*원|(?!\s*(?:일|월|년|번|시|분|초|개|잔|명|건|장|병|권|주|층|호|회|살|%))))"
+)
+_HAS_ARABIC = re.compile(r"\d")
+_COMMA_GROUPS = re.compile(r"\d+(?:,\d+)+")
+_VALID_COMMA_GROUPS = re.compile(r"\d{1,3}(?:,\d{3})+")
+# 숫자도 단위도 없는 메시지는 정규식 전체를 돌리지 않고 바로 건너뛴다
+_QUICK_CHECK = re.compile(r"[\d십백천만억조]")
+
+
+@lru_cache(maxsize=4096)
+def parse_amount(text: str) -> Optional[int]:
+    """
+    금액 표현 하나를 원 단위 정수로 바꾼다. 해석할 수 없으면 None.
+    (같은 표현이 반복해서 들어오므로 결과를 캐시한다)
+    """
+    s = text.strip()
+    if s.endswith("원"):
+        s = s[:-1]
+    if "," in s and not all(_VALID_COMMA_GROUPS.fullmatch(g) for g in _COMMA_GROUPS.findall(s)):
+        return None  # '1,2,3', '12,00' 같은 잘못된 쉼표 묶음
+    plain = s.replace(",", "")
+    if plain.isdigit():
+        return int(plain) or None
+
+    total = 0.0      # 만/억/조 단위까지 끝난 값
+    section = 0.0    # 현재 만 단위 미만 값
+    number = 0.0     # 지금 읽고 있는 숫자
+    has_number = False
+    i, n = 0, len(s)
+    while i < n:
+        ch = s[i]
+        if ch in _DIGITS:
+            j = i
+            while j < n and (s[j] in _DIGITS or s[j] in ",."):
+                j += 1
+            try:
+                number = float(s[i:j].replace(",", ""))
+            except ValueError:
+                return None
+            has_number = True
+            i = j
+            continue
+        if ch in _HANGUL_DIGITS:
+            number = number * 10 + _HANGUL_DIGITS[ch] if has_number else _HANGUL_DIGITS[ch]
+            has_number = True
+        elif ch in _SMALL_UNITS:
+            section += (number if has_number else 1) * _SMALL_UNITS[ch]
+            number, has_number = 0.0, False
+        elif ch in _BIG_UNITS:
+            section += number
+            total += (section or 1) * _BIG_UNITS[ch]
+            section, number, has_number = 0.0, 0.0, False
+        elif ch != " ":
+            return None
+        i += 1
+
+    value = int(round(total + section + number))
+    return value if value > 0 else None
+
+
+def find_amounts(text: str) -> List[Tuple[int, Tuple[int, int]]]:
+    """
+    문장 안의 금액 표현을 모두 찾는다.
+    - 한글 숫자/단위만으로 된 표현('삼천오백원', '만원')은 '원'이 붙어야 금액으로 본다
+      ('만나서', '천천히', '사원' 같은 일반 단어와 구분하기 위해)
+    - '원'이나 단위가 없는 100 미만 숫자는 수량으로 보고 제외한다 (예: 커피 2잔)
+    """
+    found = []
+    if not _QUICK_CHECK.search(text):
+        return found
+    for m in _AMOUNT_PATTERN.finditer(text):
+        raw = m.group(0).rstrip()
+        has_won = raw.endswith("원")
+        if not _HAS_ARABIC.search(raw) and not has_won:
+            continue
+        amount = parse_amount(raw)
+        if amount is None:
+            continue
+        if amount < 100 and not has_won and raw.isdigit():
+            continue
+        found.append((amount, (m.start(), m.start() + len(raw))))
+    return found
+
+
+def find_amount(text: str) -> Optional[int]:
+    """문장에 금액이 정확히 하나만 있으면 그 값을, 아니면 None을 반환한다."""
+    amounts = find_amounts(text)
+    if len(amounts) != 1:
+        return None
+    return amounts[0][0]
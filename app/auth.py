@@ -0,0 +1,197 @@
+# app/auth.py
+"""
+Authorization(JWT) 클레임 확인
+
+권한 검사는 백엔드가 한다. 라우터는 클레임(sub / role / exp)을 꺼내서
+- 만료된 토큰은 모델 호출 전에 바로 401로 돌려보낸다 (어차피 백엔드 호출이 모두 401이 된다)
+- role을 tool_router에 넘겨 일반 사용자에게 관리자 전용 tool을 보내지 않는다
+- 사용자별 상태(세션, 결과 캐시, single-flight, 사용량 장부)의 키를 만든다 (user_key)
+에 쓴다. 클레임은 토큰 해시를 키로 캐시한다 (LRU).
+
+exp/role은 서명 없이 읽어도 된다 (위조해 봐야 자기 요청만 거절되거나, 백엔드가 권한을 다시 검사한다).
+subject는 AUTH_JWT_SECRET으로 HS256/384/512 서명을 확인한 토큰에서만 키로 쓴다.
+그 밖의 토큰(비밀키 미설정, 서명 불일치, JWT가 아닌 불투명 토큰)은 토큰 해시가 사용자 키다
+(다른 사람의 sub를 넣은 위조 토큰으로 그 사람의 세션을 건드릴 수 없도록).
+
+설정(환경변수)
+- AUTH_CACHE_SIZE  : 클레임 캐시 크기 (기본 10000)
+- AUTH_EXP_LEEWAY  : 만료 판단 여유(초, 기본 30) - 백엔드와의 시계 차이 대비
+- AUTH_ROLE_CLAIMS : role을 찾을 클레임 이름 (쉼표 구분, 기본 role,auth,roles,authorities)
+- AUTH_JWT_SECRET  : 백엔드와 같은 HMAC 서명 키 (기본: 없음 = subject를 키로 쓰지 않음).
+                     "base64:"로 시작하면 base64로 디코딩해서 쓴다
+"""
+from __future__ import annotations
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional
+
+CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+EXP_LEEWAY = float(os.getenv("AUTH_EXP_LEEWAY", "30"))
+ROLE_CLAIMS = [c.strip() for c in os.getenv("AUTH_ROLE_CLAIMS", "role,auth,roles,authorities").split(",") if c.strip()]
+
+
+def _load_secret(value: str) -> bytes:
+    if value.startswith("base64:"):
+        return base64.b64decode(value[len("base64:"):])
+    return value.encode("utf-8")
+
+
+JWT_SECRET = _load_secret(os.getenv("AUTH_JWT_SECRET", ""))
+_HMAC_ALGORITHMS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+EXPIRED_MESSAGE = "로그인이 만료되었습니다. 다시 로그인해주세요."
+
+
+@dataclass(frozen=True)
+class TokenInfo:
+    subject: Optional[str] = None
+    role: Optional[str] = None
+    expires_at: Optional[float] = None
+    # JWT로 읽을 수 없는 토큰
+    opaque: bool = False
+    # AUTH_JWT_SECRET으로 서명을 확인한 토큰
+    verified: bool = False
+    # 토큰 sha256 앞 32자 (검증되지 않은 토큰의 사용자 키)
+    token_hash: str = ""
+
+
+_OPAQUE = TokenInfo(opaque=True)
+
+# 토큰 해시 -> TokenInfo
+_CACHE: "OrderedDict[str, TokenInfo]" = OrderedDict()
+_STATS: Dict[str, int] = {"hit": 0, "miss": 0, "opaque": 0, "expired": 0, "verified": 0, "bad_signature": 0}
+
+
+def _b64url_json(segment: str) -> Any:
+    padded = segment + "=" * (-len(segment) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+
+
+def _role(claims: Dict[str, Any]) -> Optional[str]:
+    for name in ROLE_CLAIMS:
+        value = claims.get(name)
+        if isinstance(value, str) and value:
+            return value
+        if isinstance(value, list) and value:
+            # ["ROLE_USER", "ROLE_ADMIN"] / [{"authority": "ROLE_ADMIN"}] 형태
+            roles = [v.get("authority") if isinstance(v, dict) else v for v in value]
+            roles = [r for r in roles if isinstance(r, str)]
+            admin = next((r for r in roles if r.upper() in ("ADMIN", "ROLE_ADMIN")), None)
+            if admin or roles:
+                return admin or roles[0]
+    return None
+
+
+def _verify(parts: List[str]) -> bool:
+    """AUTH_JWT_SECRET이 있고 HMAC 서명이 맞으면 True"""
+    if not JWT_SECRET:
+        return False
+    try:
+        header = _b64url_json(parts[0])
+        signature = base64.urlsafe_b64decode((parts[2] + "=" * (-len(parts[2]) % 4)).encode("ascii"))
+        signed = f"{parts[0]}.{parts[1]}".encode("ascii")
+    except (ValueError, binascii.Error, UnicodeError):
+        return False
+    digest = _HMAC_ALGORITHMS.get(header.get("alg")) if isinstance(header, dict) else None
+    if digest is None:
+        return False
+    return hmac.compare_digest(hmac.new(JWT_SECRET, signed, digest).digest(), signature)
+
+
+def decode(token: str) -> TokenInfo:
+    """JWT payload를 읽는다 (AUTH_JWT_SECRET이 있으면 서명도 확인). JWT가 아니면 opaque."""
+    parts = token.split(".")
+    if len(parts) != 3:
+        return _OPAQUE
+    try:
+        claims = _b64url_json(parts[1])
+    except (ValueError, binascii.Error, UnicodeError):
+        return _OPAQUE
+    if not isinstance(claims, dict):
+        return _OPAQUE
+
+    subject = claims.get("sub")
+    exp = claims.get("exp")
+    return TokenInfo(
+        subject=str(subject) if subject not in (None, "") else None,
+        role=_role(claims),
+        expires_at=float(exp) if isinstance(exp, (int, float)) and not isinstance(exp, bool) else None,
+        verified=_verify(parts),
+    )
+
+
+def inspect(auth_header: Optional[str]) -> Optional[TokenInfo]:
+    """Authorization 값의 클레임 (헤더가 없으면 None). 결과는 토큰 해시 기준으로 캐시한다."""
+    if not auth_header:
+        return None
+    token = auth_header[7:] if auth_header[:7].lower() == "bearer " else auth_header
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+    info = _CACHE.get(key)
+    if info is not None:
+        _STATS["hit"] += 1
+        _CACHE.move_to_end(key)
+        return info
+
+    _STATS["miss"] += 1
+    info = replace(decode(token.strip()), token_hash=key)
+    if info.opaque:
+        _STATS["opaque"] += 1
+    elif info.verified:
+        _STATS["verified"] += 1
+    elif JWT_SECRET:
+        _STATS["bad_signature"] += 1
+    _CACHE[key] = info
+    while len(_CACHE) > CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    return info
+
+
+def is_expired(auth_header: Optional[str], now: Optional[float] = None) -> bool:
+    """exp 클레임이 (여유 시간을 두고) 지났으면 True. exp가 없거나 JWT가 아니면 False."""
+    info = inspect(auth_header)
+    if info is None or info.expires_at is None:
+        return False
+    return (time.time() if now is None else now) > info.expires_at + EXP_LEEWAY
+
+
+def reject_expired(auth_header: Optional[str]) -> bool:
+    """요청 입구에서 부른다. 만료된 토큰이면 카운트하고 True."""
+    if is_expired(auth_header):
+        _STATS["expired"] += 1
+        return True
+    return False
+
+
+def role(auth_header: Optional[str]) -> Optional[str]:
+    info = inspect(auth_header)
+    return info.role if info is not None else None
+
+
+def user_key(auth_header: Optional[str]) -> str:
+    """
+    사용자별 상태의 키. 서명을 확인한 토큰이면 "sub:<subject>" (토큰이 갱신돼도 같은 사용자),
+    아니면 "tok:<토큰 해시>", 헤더가 없으면 "anonymous". 원래 토큰 문자열은 키에 들어가지 않는다.
+    """
+    info = inspect(auth_header)
+    if info is None:
+        return "anonymous"
+    if info.verified and info.subject:
+        return "sub:" + info.subject
+    return "tok:" + info.token_hash
+
+
+def stats() -> Dict[str, Any]:
+    lookups = _STATS["hit"] + _STATS["miss"]
+    return {
+        "cache_entries": len(_CACHE),
+        **_STATS,
+        "hit_rate": round(_STATS["hit"] / lookups, 4) if lookups else 0.0,
+    }
@@ -1,9 +1,12 @@
 # app/backend_api.py
 from __future__ import annotations
+import logging
 import os
 import requests
 from typing import Any, Dict, List, Optional, Tuple
 
+from app import log
+
 BACKEND_BASE_URL = os.getenv("BACKEND_BASE_URL", "http://localhost:8080")
 
 # timeout을 '짧고 명확하게' (connect, read)
@@ -294,12 +297,11 @@ def confirm_update_by_chat(
             "detail": "수정할 값(date/amount/memo) 중 최소 1개 필요"
         }
 
-    print("[DEBUG] Sending to Backend (corrected):", payload)
-    print("[DEBUG] Authorization Header:", auth_header)
+    log.event("backend_request", level=logging.DEBUG, url=url, payload=payload)
 
     r = _SESSION.post(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
 
-    print(f"[DEBUG] Backend Response ({r.status_code}): {r.text}")
+    log.event("backend_response", level=logging.DEBUG, url=url, status=r.status_code, body_length=len(r.content))
 
     r.raise_for_status()
 
@@ -528,11 +530,11 @@ def confirm_update_income_by_chat(
             "detail": "수정할 값(date/amount/memo) 중 최소 1개 필요"
         }
 
-    print("[DEBUG] Sending to Backend:", payload)
+    log.event("backend_request", level=logging.DEBUG, url=url, payload=payload)
 
     r = _SESSION.post(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
 
-    print(f"[DEBUG] Backend Response ({r.status_code}): {r.text}")
+    log.event("backend_response", level=logging.DEBUG, url=url, status=r.status_code, body_length=len(r.content))
 
     r.raise_for_status()
 
@@ -0,0 +1,1182 @@
+# app/backend_api_async.py
+"""
+backend_api의 비동기 버전(httpx.AsyncClient).
+함수 이름/인자/반환값은 backend_api와 동일하며, 호출만 await로 바뀐다.
+"""
+from __future__ import annotations
+import logging
+import os
+import httpx
+from typing import Any, Dict, List, Optional
+
+from app import log
+from app.backend_api import BACKEND_BASE_URL, CONNECT_TIMEOUT, READ_TIMEOUT, _headers
+
+TIMEOUT = httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT)
+
+# 연결 재사용(AsyncClient) - 워커 하나가 여러 요청을 동시에 처리하므로 풀 크기를 넉넉히
+LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("BACKEND_MAX_CONNECTIONS", "200")),
+    max_keepalive_connections=int(os.getenv("BACKEND_MAX_KEEPALIVE", "50")),
+)
+_CLIENT = httpx.AsyncClient(limits=LIMITS, timeout=TIMEOUT)
+
+async def aclose() -> None:
+    """앱 종료 시 커넥션 풀 정리"""
+    await _CLIENT.aclose()
+
+
+
+# transaction-controller (CRUD)
+async def create_expense(auth_header: Optional[str], date: str, amount: int, category: str, memo: str = "") -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/transactions"
+    payload = {
+        "type": "EXPENSE",
+        "amount": int(amount),
+        "category": category,
+        "memo": memo or "",
+        "date": date,
+    }
+    r = await _CLIENT.post(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "Backend 인증 실패(Authorization 전달 필요)"}
+
+    r.raise_for_status()
+    expense_id = r.json()
+    return {
+        "ok": True,
+        "message": f"{date} {amount}원 \"{memo}\" [{category}] 등록 완료",
+        "item": {
+            "id": expense_id,
+            "date": date,
+            "amount": amount,
+            "category": category,
+            "memo": memo,
+            "type": "EXPENSE"
+        }
+    }
+
+async def create_expense_batch(
+    auth_header: Optional[str],
+    transactions: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+    """
+    여러 지출을 한 번에 등록
+    POST /api/transactions/batch
+    """
+    url = f"{BACKEND_BASE_URL}/api/transactions/batch"
+
+    payload = {
+        "transactions": [
+            {
+                "type": "EXPENSE",
+                "date": tx["date"],
+                "amount": int(tx["amount"]),
+                "category": tx["category"],
+                "memo": tx.get("memo", "")
+            }
+            for tx in transactions
+        ]
+    }
+
+    r = await _CLIENT.post(
+        url,
+        json=payload,
+        headers=_headers(auth_header),
+        timeout=TIMEOUT
+    )
+
+    if r.status_code == 401:
+        return {
+            "ok": False,
+            "error": "UNAUTHORIZED",
+            "detail": "Backend 인증 실패(Authorization 전달 필요)"
+        }
+
+    r.raise_for_status()
+    result = r.json()
+
+    return {
+        "ok": True,
+        "type": "EXPENSE",
+        "successCount": result.get("successCount", 0),
+        "failCount": result.get("failCount", 0),
+        "failures": result.get("failures", [])
+    }
+
+
+async def list_expenses(auth_header: Optional[str], start: str, end: str, limit: int = 10) -> Dict[str, Any]:
+    """
+    기간(start~end) 내 지출 내역 조회
+    start, end: "YYYY-MM-DD" 형식 문자열
+    """
+    safe_limit = max(1, min(int(limit), 50))
+    url = f"{BACKEND_BASE_URL}/api/transactions/period"
+    
+    params = {
+        "start": start,
+        "end": end,
+        "type": "EXPENSE",
+        "limit": safe_limit
+    }
+
+    r = await _CLIENT.get(url, params=params, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "Backend 인증 실패"}
+
+    r.raise_for_status()
+    items: List[Dict[str, Any]] = r.json()
+    simplified = [
+        {
+            "date": it.get("date"),
+            "amount": it.get("amount"),
+            "category": it.get("category"),
+            "memo": it.get("memo"),
+            "type": it.get("type"),
+        }
+        for it in items
+    ]
+    return {"ok": True, "items": simplified}
+
+async def top_expense_weekday_avg(
+    *,
+    auth_header: Optional[str],
+    scope: str,
+    month: Optional[str] = None,
+    year: Optional[str] = None,
+    ) -> Dict[str, Any]:
+    """요일별 평균 지출(기간: month/year) 중 최댓값 조회"""
+    url = f"{BACKEND_BASE_URL}/api/transactions/weekday/top"
+    params: Dict[str, Any] = {"scope": scope}
+    if month:
+        params["month"] = month
+    if year:
+        params["year"] = year
+
+    r = await _CLIENT.get(url, headers=_headers(auth_header), params=params, timeout=TIMEOUT)
+    r.raise_for_status()
+    return r.json()
+
+async def delete_expense(auth_header: Optional[str], expense_id: int) -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/transactions/{int(expense_id)}"
+    r = await _CLIENT.delete(url, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "Backend 인증 실패(Authorization 전달 필요)"}
+
+    if r.status_code == 403:
+        return {"ok": False, "error": "FORBIDDEN", "detail": "본인 거래 내역만 삭제할 수 있음"}
+
+    r.raise_for_status()
+    return {"ok": True, "deleted_id": int(expense_id)}
+
+async def update_expense(
+        auth_header: Optional[str],
+        expense_id: int,
+        date: str,
+        amount: int,
+        category: str,
+        memo: str = "",
+) -> Dict[str, Any]:
+    """지출 수정(PUT /api/transactions)."""
+    url = f"{BACKEND_BASE_URL}/api/transactions"
+    payload = {
+        "id": int(expense_id),
+        "type": "EXPENSE",
+        "amount": int(amount),
+        "category": category,
+        "memo": memo or "",
+        "date": date,
+    }
+    r = await _CLIENT.put(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "Backend 인증 실패(Authorization 전달 필요)"}
+    if r.status_code == 403:
+        return {"ok": False, "error": "FORBIDDEN", "detail": "본인 거래 내역만 수정할 수 있음"}
+    if r.status_code == 404:
+        return {"ok": False, "error": "NOT_FOUND", "detail": "해당 지출 ID를 찾을 수 없음"}
+
+    r.raise_for_status()
+    return {"ok": True, "updated_id": int(expense_id)}
+
+async def delete_expense_by_chat(auth_header, date, amount=0, memo=""):
+    url = f"{BACKEND_BASE_URL}/api/transactions/chat/delete"
+    payload = {"date": date, "amount": amount, "memo": memo or "", "type":"EXPENSE"}
+
+    r = await _CLIENT.post(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 409:
+        return {
+            "ok": True,
+            "status": 409,
+            "candidates": r.json()
+        }
+
+    r.raise_for_status()
+    return {"ok": True, "status": 200}
+
+async def confirm_delete_by_chat(auth_header, selected_indexes):
+    url = f"{BACKEND_BASE_URL}/api/transactions/chat/delete/confirm"
+    payload = {"selectedIndexes": selected_indexes, "type":"EXPENSE"}
+
+    r = await _CLIENT.post(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+    r.raise_for_status()
+    
+    return {
+        "ok": True,
+        "status": r.status_code,
+        "message": r.json().get("message", "선택된 항목 삭제 완료")
+    }
+
+async def update_expense_by_chat(auth_header: Optional[str], date: Optional[str] = None, amount: Optional[int] = None, memo: Optional[str] = None) -> Dict[str, Any]:
+    """
+    날짜/금액/메모 기준으로 후보 지출 내역 조회
+    - 후보가 1개 이상일 때 status=409 + 후보 목록 반환
+    """
+    url = f"{BACKEND_BASE_URL}/api/transactions/chat/update"
+    payload: Dict[str, Any] = {
+        "type":"EXPENSE"
+    }
+
+    if date:
+        payload["date"] = date
+    if amount is not None:
+        payload["amount"] = int(amount)
+    if memo:
+        payload["memo"] = memo
+
+    r = await _CLIENT.post(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 409:
+        candidates = r.json().get("candidates", [])
+        # 후보를 번호/날짜/금액/메모 형태로 간단히 구조화
+        structured = [
+            {
+                "number": c.get("number"),
+                "date": c.get("date"),
+                "amount": c.get("amount"),
+                "memo": c.get("memo", "")
+            }
+            for c in candidates
+        ]
+        return {"ok": True, "status": 409, "candidates": structured}
+
+    r.raise_for_status()
+    return {"ok": True, "status": 200}
+
+
+async def confirm_update_by_chat(
+    auth_header: Optional[str],
+    selected_index: int,
+    new_date: Optional[str] = None,
+    new_amount: Optional[int] = None,
+    new_memo: Optional[str] = None
+) -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/transactions/chat/update/confirm"
+
+    # ✅ DTO 구조에 맞게 newData 안에 넣기
+    payload: Dict[str, Any] = {
+        "candidateIndex": int(selected_index),
+        "newData": {} , # 반드시 dict로 초기화
+        "type" : "EXPENSE"
+    }
+
+    if new_date is not None:
+        payload["newData"]["date"] = new_date
+    if new_amount is not None:
+        payload["newData"]["amount"] = int(new_amount)
+    if new_memo is not None:
+        payload["newData"]["memo"] = new_memo
+
+    # 최소 1개 수정값 필요
+    if not payload["newData"]:
+        return {
+            "ok": False,
+            "error": "BAD_REQUEST",
+            "detail": "수정할 값(date/amount/memo) 중 최소 1개 필요"
+        }
+
+    log.event("backend_request", level=logging.DEBUG, url=url, payload=payload)
+
+    r = await _CLIENT.post(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    log.event("backend_response", level=logging.DEBUG, url=url, status=r.status_code, body_length=len(r.content))
+
+    r.raise_for_status()
+
+    return {
+        "ok": True,
+        "status": r.status_code,
+        "message": r.json().get("message", "선택한 항목 수정 완료")
+    }
+
+async def create_income(auth_header: Optional[str], date: str, amount: int, category: str, memo: str = "") -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/transactions"
+    payload = {
+        "type": "INCOME",
+        "amount": int(amount),
+        "category": category,
+        "memo": memo or "",
+        "date": date,
+    }
+    r = await _CLIENT.post(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "Backend 인증 실패(Authorization 전달 필요)"}
+
+    r.raise_for_status()
+    income_id = r.json()
+    return {
+        "ok": True,
+        "message": f"{date} {amount}원 \"{memo}\" [{category}] 수입 등록 완료",
+        "item": {
+            "id": income_id,
+            "date": date,
+            "amount": amount,
+            "category": category,
+            "memo": memo,
+            "type": "INCOME"
+        }
+    }
+
+async def create_income_batch(
+    auth_header: Optional[str],
+    transactions: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    여러 수입을 한 번에 등록
+    POST /api/transactions/batch
+    """
+    url = f"{BACKEND_BASE_URL}/api/transactions/batch"
+
+    payload = {
+        "transactions": [
+            {
+                "type": "INCOME",
+                "date": tx["date"],
+                "amount": int(tx["amount"]),
+                "category": tx["category"],
+                "memo": tx.get("memo", "")
+            }
+            for tx in transactions
+        ]
+    }
+
+    r = await _CLIENT.post(
+        url,
+        json=payload,
+        headers=_headers(auth_header),
+        timeout=TIMEOUT
+    )
+
+    if r.status_code == 401:
+        return {
+            "ok": False,
+            "error": "UNAUTHORIZED",
+            "detail": "Backend 인증 실패(Authorization 전달 필요)"
+        }
+
+    r.raise_for_status()
+    result = r.json()
+
+    return {
+        "ok": True,
+        "type": "INCOME",
+        "successCount": result.get("successCount", 0),
+        "failCount": result.get("failCount", 0),
+        "failures": result.get("failures", [])
+    }
+
+
+async def list_incomes(auth_header: Optional[str], start: str, end: str, limit: int = 10) -> Dict[str, Any]:
+    """
+    기간(start~end) 내 수입 내역 조회
+    start, end: "YYYY-MM-DD" 형식 문자열
+    """
+    safe_limit = max(1, min(int(limit), 50))
+    url = f"{BACKEND_BASE_URL}/api/transactions/period"
+    
+    params = {
+        "start": start,
+        "end": end,
+        "type": "INCOME",
+        "limit": safe_limit
+    }
+
+    r = await _CLIENT.get(url, params=params, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "Backend 인증 실패"}
+
+    r.raise_for_status()
+    items: List[Dict[str, Any]] = r.json()
+    simplified = [
+        {
+            "date": it.get("date"),
+            "amount": it.get("amount"),
+            "category": it.get("category"),
+            "memo": it.get("memo"),
+            "type": it.get("type"),
+        }
+        for it in items
+    ]
+    return {"ok": True, "items": simplified}
+
+async def delete_income_by_chat(auth_header, date, amount=0, memo=""):
+    url = f"{BACKEND_BASE_URL}/api/transactions/chat/delete"
+    payload = {
+        "date": date,
+        "amount": amount,
+        "memo": memo or "",
+        "type": "INCOME"
+    }
+
+    r = await _CLIENT.post(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 409:
+        return {
+            "ok": True,
+            "status": 409,
+            "candidates": r.json()
+        }
+
+    r.raise_for_status()
+    return {"ok": True, "status": 200}
+
+async def confirm_delete_income_by_chat(auth_header, selected_indexes):
+    url = f"{BACKEND_BASE_URL}/api/transactions/chat/delete/confirm"
+    payload = {
+        "selectedIndexes": selected_indexes,
+        "type": "INCOME"
+    }
+
+    r = await _CLIENT.post(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+    r.raise_for_status()
+    
+    return {
+        "ok": True,
+        "status": r.status_code,
+        "message": r.json().get("message", "선택된 항목 삭제 완료")
+    }
+
+async def update_income_by_chat(
+    auth_header: Optional[str],
+    date: Optional[str] = None,
+    amount: Optional[int] = None,
+    memo: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    날짜/금액/메모 기준으로 후보 수입 내역 조회
+    - 후보가 1개 이상일 때 status=409 + 후보 목록 반환
+    """
+    url = f"{BACKEND_BASE_URL}/api/transactions/chat/update"
+    payload: Dict[str, Any] = {
+        "type": "INCOME"
+    }
+
+    if date:
+        payload["date"] = date
+    if amount is not None:
+        payload["amount"] = int(amount)
+    if memo:
+        payload["memo"] = memo
+
+    r = await _CLIENT.post(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 409:
+        candidates = r.json().get("candidates", [])
+        structured = [
+            {
+                "number": c.get("number"),
+                "date": c.get("date"),
+                "amount": c.get("amount"),
+                "memo": c.get("memo", "")
+            }
+            for c in candidates
+        ]
+        return {"ok": True, "status": 409, "candidates": structured}
+
+    r.raise_for_status()
+    return {"ok": True, "status": 200}
+
+
+async def confirm_update_income_by_chat(
+    auth_header: Optional[str],
+    selected_index: int,
+    new_date: Optional[str] = None,
+    new_amount: Optional[int] = None,
+    new_memo: Optional[str] = None
+) -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/transactions/chat/update/confirm"
+
+    payload: Dict[str, Any] = {
+        "candidateIndex": int(selected_index),
+        "newData": {},
+        "type": "INCOME"
+    }
+
+    if new_date is not None:
+        payload["newData"]["date"] = new_date
+    if new_amount is not None:
+        payload["newData"]["amount"] = int(new_amount)
+    if new_memo is not None:
+        payload["newData"]["memo"] = new_memo
+
+    if not payload["newData"]:
+        return {
+            "ok": False,
+            "error": "BAD_REQUEST",
+            "detail": "수정할 값(date/amount/memo) 중 최소 1개 필요"
+        }
+
+    log.event("backend_request", level=logging.DEBUG, url=url, payload=payload)
+
+    r = await _CLIENT.post(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    log.event("backend_response", level=logging.DEBUG, url=url, status=r.status_code, body_length=len(r.content))
+
+    r.raise_for_status()
+
+    return {
+        "ok": True,
+        "status": r.status_code,
+        "message": r.json().get("message", "선택한 항목 수정 완료")
+    }
+
+async def get_expense_summary(
+    auth_header: Optional[str],
+    period: str,
+    date: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    GET /summary
+    type=EXPENSE
+    """
+    url = f"{BACKEND_BASE_URL}/api/transactions/summary"
+
+    params: Dict[str, Any] = {
+        "period": period,
+        "type": "EXPENSE",
+    }
+
+    if date:
+        params["date"] = date
+
+    r = await _CLIENT.get(
+        url,
+        params=params,
+        headers=_headers(auth_header),
+        timeout=TIMEOUT
+    )
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED"}
+
+    if r.status_code == 400:
+        return {"ok": False, "error": "BAD_REQUEST", "detail": r.json()}
+
+    r.raise_for_status()
+    data = r.json()
+
+    return {
+        "ok": True,
+        "period": data["period"],
+        "type": data["type"],
+        "baseDate": data["baseDate"],
+        "start": data["start"],
+        "end": data["end"],
+        "totalAmount": data["totalAmount"],
+    }
+
+async def get_income_summary(
+    auth_header: Optional[str],
+    period: str,
+    date: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    GET /summary
+    type=INCOME
+    """
+    url = f"{BACKEND_BASE_URL}/api/transactions/summary"
+
+    params: Dict[str, Any] = {
+        "period": period,
+        "type": "INCOME",
+    }
+
+    if date:
+        params["date"] = date
+
+    r = await _CLIENT.get(
+        url,
+        params=params,
+        headers=_headers(auth_header),
+        timeout=TIMEOUT
+    )
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED"}
+
+    if r.status_code == 400:
+        return {"ok": False, "error": "BAD_REQUEST", "detail": r.json()}
+
+    r.raise_for_status()
+    data = r.json()
+
+    return {
+        "ok": True,
+        "period": data["period"],
+        "type": data["type"],
+        "baseDate": data["baseDate"],
+        "start": data["start"],
+        "end": data["end"],
+        "totalAmount": data["totalAmount"],
+    }
+
+async def get_top_expense_category(
+    auth_header: Optional[str],
+    period: str,
+    date: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    GET /api/transactions/top-expense-category
+    지출(EXPENSE) 전용
+    """
+    url = f"{BACKEND_BASE_URL}/api/transactions/top-expense-category"
+
+    params: Dict[str, Any] = {
+        "period": period,
+    }
+
+    if date:
+        params["date"] = date
+
+    r = await _CLIENT.get(
+        url,
+        params=params,
+        headers=_headers(auth_header),
+        timeout=TIMEOUT
+    )
+
+    if r.status_code == 401:
+        return {
+            "ok": False,
+            "error": "UNAUTHORIZED",
+            "detail": "Backend 인증 실패(Authorization 전달 필요)"
+        }
+
+    if r.status_code == 400:
+        return {
+            "ok": False,
+            "error": "BAD_REQUEST",
+            "detail": r.json()
+        }
+
+    r.raise_for_status()
+    data = r.json()
+
+    return {
+        "ok": True,
+        "period": data.get("period"),
+        "category": data.get("category"),
+        "totalAmount": data.get("totalAmount"),
+        "start": data.get("start"),
+        "end": data.get("end"),
+    }
+
+async def delete_latest_transaction(auth_header: Optional[str]) -> Dict[str, Any]:
+    """
+    서버 기준 가장 최근 거래 1건 삭제
+    DELETE /api/transactions/latest
+    """
+    url = f"{BACKEND_BASE_URL}/api/transactions/latest"
+
+    r = await _CLIENT.delete(
+        url,
+        headers=_headers(auth_header),
+        timeout=TIMEOUT
+    )
+
+    if r.status_code == 401:
+        return {
+            "ok": False,
+            "error": "UNAUTHORIZED",
+            "detail": "Backend 인증 실패(Authorization 전달 필요)"
+        }
+
+    if r.status_code == 404:
+        return {
+            "ok": False,
+            "error": "NOT_FOUND",
+            "detail": "삭제할 최근 거래가 없음"
+        }
+
+    r.raise_for_status()
+
+    return {
+        "ok": True,
+        "message": "최근 거래 1건 삭제 완료"
+    }
+
+async def update_latest_transaction(
+    auth_header: Optional[str],
+    date: Optional[str] = None,
+    amount: Optional[int] = None,
+    memo: Optional[str] = None
+) -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/transactions/latest"
+
+    payload = {}
+    if date is not None:
+        payload["date"] = date
+    if amount is not None:
+        payload["amount"] = amount
+    if memo is not None:
+        payload["memo"] = memo
+
+    if not payload:
+        return {
+            "ok": False,
+            "error": "BAD_REQUEST",
+            "detail": "수정할 값이 없음"
+        }
+
+    r = await _CLIENT.put(
+        url,
+        json=payload,
+        headers=_headers(auth_header),
+        timeout=TIMEOUT
+    )
+
+    r.raise_for_status()
+
+    return {
+        "ok": True,
+        "transaction": r.json()
+    }
+
+
+
+# reply-controller (CRUD)
+async def create_reply(auth_header: Optional[str], bno: int, content: str) -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/replies"
+    payload = {"bno": int(bno), "content": content}
+    r = await _CLIENT.post(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "Backend 인증 실패(Authorization 전달 필요)"}
+
+    r.raise_for_status()
+    reply_id = r.json()  # ReplyController는 Long id 반환
+    return {"ok": True, "reply_id": reply_id}
+
+async def list_replies(auth_header: Optional[str], bno: int, limit: int = 10) -> Dict[str, Any]:
+    # PageRequestDTO.size 최소 10이라 limit은 10~20으로 clamp
+    size = max(10, min(int(limit), 20))
+    url = f"{BACKEND_BASE_URL}/api/replies/board/{int(bno)}"
+    r = await _CLIENT.get(url, params={"page": 1, "size": size}, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    r.raise_for_status()
+    data = r.json()
+
+    # 페이로드 축소(Phase2-lite: 결과 크기/필드 제한)
+    dto_list: List[Dict[str, Any]] = data.get("dtoList", []) or []
+    simplified = [
+        {
+            "id": it.get("id"),
+            "content": it.get("content"),
+            "deleted": it.get("deleted"),
+            "mid": it.get("mid"),
+            "nickname": it.get("nickname"),
+        }
+        for it in dto_list
+    ]
+    return {"ok": True, "items": simplified, "total": data.get("total")}
+
+async def delete_reply(auth_header: Optional[str], reply_id: int) -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/replies/{int(reply_id)}"
+    r = await _CLIENT.delete(url, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "Backend 인증 실패(Authorization 전달 필요)"}
+    if r.status_code == 403:
+        return {"ok": False, "error": "FORBIDDEN", "detail": "본인 댓글만 삭제할 수 있음"}
+    if r.status_code == 404:
+        return {"ok": False, "error": "NOT_FOUND", "detail": "해당 댓글 ID를 찾을 수 없음"}
+
+    r.raise_for_status()
+    return {"ok": True, "deleted_id": int(reply_id)}
+
+async def update_reply(auth_header: Optional[str], reply_id: int, content: str) -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/replies/{int(reply_id)}"
+    payload = {"content": content}
+    r = await _CLIENT.put(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "Backend 인증 실패(Authorization 필요)"}
+    if r.status_code == 403:
+        return {"ok": False, "error": "FORBIDDEN", "detail": "본인 댓글만 수정할 수 있음"}
+    if r.status_code == 404:
+        return {"ok": False, "error": "NOT_FOUND", "detail": "해당 댓글 ID를 찾을 수 없음"}
+
+    r.raise_for_status()
+    return {"ok": True, "updated_id": int(reply_id)}
+
+# notice-controller (CRUD)
+async def create_notice(auth_header: Optional[str], title: str, content: str, imageUrl: str = "") -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/notices"
+    payload = {"title": title, "content": content, "imageUrl": imageUrl or ""}
+    r = await _CLIENT.post(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "Backend 인증 실패(Authorization 필요)"}
+
+    r.raise_for_status()
+    notice_id = r.json()
+    return {"ok": True, "notice_id": notice_id}
+
+async def list_notices(auth_header: Optional[str], limit: int = 10) -> Dict[str, Any]:
+    size = max(10, min(int(limit), 20))
+    url = f"{BACKEND_BASE_URL}/api/notices/list"
+    r = await _CLIENT.get(url, params={"page": 1, "size": size}, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    r.raise_for_status()
+    data = r.json()
+
+    dto_list = data.get("dtoList", []) or []
+    simplified = [
+        {
+            "id": it.get("id"),
+            "title": it.get("title"),
+            "createTime": it.get("createTime"),
+            "mid": it.get("mid"),
+            "nickname": it.get("nickname"),
+        }
+        for it in dto_list
+    ]
+    return {"ok": True, "items": simplified, "total": data.get("total")}
+
+async def delete_notice(auth_header: Optional[str], notice_id: int) -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/notices/{int(notice_id)}"
+    r = await _CLIENT.delete(url, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "Backend 인증 실패(Authorization 필요)"}
+    if r.status_code == 403:
+        return {"ok": False, "error": "FORBIDDEN", "detail": "본인 공지사항만 삭제할 수 있음"}
+    if r.status_code == 404:
+        return {"ok": False, "error": "NOT_FOUND", "detail": "해당 공지 ID를 찾을 수 없음"}
+
+    r.raise_for_status()
+    return {"ok": True, "deleted_id": int(notice_id)}
+
+async def update_notice(
+    auth_header: Optional[str],
+    notice_id: int,
+    title: str,
+    content: str,
+    imageUrl: str = ""
+) -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/notices/{int(notice_id)}"
+    payload = {"title": title, "content": content, "imageUrl": imageUrl or ""}
+
+    r = await _CLIENT.put(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "Backend 인증 실패(Authorization 필요)"}
+    if r.status_code == 403:
+        return {"ok": False, "error": "FORBIDDEN", "detail": "본인 공지사항만 수정할 수 있음"}
+    if r.status_code == 404:
+        return {"ok": False, "error": "NOT_FOUND", "detail": "해당 공지 ID를 찾을 수 없음"}
+
+    r.raise_for_status()
+    return {"ok": True, "updated_id": int(notice_id)}
+
+# member-controller (CRUD)
+async def list_members(auth_header: Optional[str], limit: int = 10) -> Dict[str, Any]:
+    size = max(10, min(int(limit), 20))
+    url = f"{BACKEND_BASE_URL}/api/members/list"
+    r = await _CLIENT.get(url, params={"page": 1, "size": size}, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "로그인이 필요함"}
+    if r.status_code == 403:
+        return {"ok": False, "error": "FORBIDDEN", "detail": "관리자만 조회 가능"}
+
+    r.raise_for_status()
+    data = r.json()
+
+    # 결과 크기 제한(Phase2-lite): 핵심 필드만
+    dto_list: List[Dict[str, Any]] = data.get("dtoList", []) or []
+    simplified = [
+        {
+            "id": it.get("id"),
+            "username": it.get("username"),
+            "nickname": it.get("nickname"),
+            "role": it.get("role"),
+        }
+        for it in dto_list
+    ]
+    return {"ok": True, "items": simplified, "total": data.get("total")}
+
+async def verify_password(auth_header: Optional[str], password: str) -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/members/verify-password"
+    payload = {"password": password}
+    r = await _CLIENT.post(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "로그인이 필요함"}
+    if r.status_code == 400:
+        return {"ok": False, "error": "BAD_REQUEST", "detail": "password가 필요함"}
+
+    r.raise_for_status()
+    return {"ok": True, "matches": bool(r.json())}
+
+async def delete_member(auth_header: Optional[str], member_id: int) -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/members/{int(member_id)}"
+    r = await _CLIENT.delete(url, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "로그인이 필요함"}
+    if r.status_code == 403:
+        return {"ok": False, "error": "FORBIDDEN", "detail": "본인 또는 관리자만 삭제 가능"}
+
+    r.raise_for_status()
+    return {"ok": True, "deleted_id": int(member_id)}
+
+async def update_member_info(
+    auth_header: Optional[str],
+    nickname: Optional[str] = None,
+    password: Optional[str] = None
+) -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/members/change-info"
+
+    payload: Dict[str, Any] = {}
+    if nickname is not None:
+        payload["nickname"] = nickname
+    if password is not None:
+        payload["password"] = password
+
+    # 최소 1개는 있어야 함(백엔드도 400 처리하지만, Router에서도 즉시 방어)
+    if not payload:
+        return {"ok": False, "error": "BAD_REQUEST", "detail": "nickname 또는 password 중 최소 1개가 필요함"}
+
+    r = await _CLIENT.put(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "로그인이 필요함"}
+    if r.status_code == 400:
+        return {"ok": False, "error": "BAD_REQUEST", "detail": "입력값이 유효하지 않음"}
+
+    r.raise_for_status()
+    return {"ok": True}
+
+# budget-controller (CRUD)
+async def create_budget(
+    auth_header: Optional[str],
+    year: int,
+    month: int,
+    limitAmount: int,
+    usedAmount: int = 0
+) -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/budget"
+    payload = {
+        "year": int(year),
+        "month": int(month),
+        "limitAmount": int(limitAmount),
+        "usedAmount": int(usedAmount),
+    }
+    r = await _CLIENT.post(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "로그인이 필요함"}
+
+    r.raise_for_status()
+    return {"ok": True}
+
+async def list_budgets(auth_header: Optional[str], mid: int, limit: int = 10) -> Dict[str, Any]:
+    size = max(10, min(int(limit), 20))
+    url = f"{BACKEND_BASE_URL}/api/budget/list/{int(mid)}"
+    r = await _CLIENT.get(url, params={"page": 1, "size": size}, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "로그인이 필요함"}
+
+    r.raise_for_status()
+    data = r.json()
+
+    # Phase2-lite: 결과 필드 축소
+    dto_list: List[Dict[str, Any]] = data.get("dtoList", []) or []
+    simplified = [
+        {
+            "id": it.get("id"),
+            "year": it.get("year"),
+            "month": it.get("month"),
+            "limitAmount": it.get("limitAmount"),
+            "usedAmount": it.get("usedAmount"),
+        }
+        for it in dto_list
+    ]
+    return {"ok": True, "items": simplified, "total": data.get("total")}
+
+async def adjust_budget_limit(auth_header: Optional[str], mid: int, delta: int) -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/budget/limit/{int(mid)}"
+
+    # PATCH + query param(delta)
+    r = await _CLIENT.patch(
+        url,
+        params={"delta": int(delta)},
+        headers=_headers(auth_header),
+        timeout=TIMEOUT
+    )
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "로그인이 필요함"}
+    if r.status_code == 403:
+        return {"ok": False, "error": "FORBIDDEN", "detail": "본인(mid)만 예산을 조정할 수 있음"}
+    if r.status_code == 400:
+        return {"ok": False, "error": "BAD_REQUEST", "detail": "delta 값이 유효하지 않음"}
+
+    r.raise_for_status()
+    return {"ok": True, "mid": int(mid), "delta": int(delta)}
+
+# board-controller (CRUD)
+async def create_board(auth_header: Optional[str], title: str, content: str, imageUrl: str = "") -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/boards"
+    payload = {"title": title, "content": content, "imageUrl": imageUrl or ""}
+    r = await _CLIENT.post(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "로그인이 필요함"}
+
+    r.raise_for_status()
+    board_id = r.json()
+    return {"ok": True, "board_id": int(board_id)}
+
+async def get_board(auth_header: Optional[str], board_id: int) -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/boards/{int(board_id)}"
+    r = await _CLIENT.get(url, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 404:
+        return {"ok": False, "error": "NOT_FOUND", "detail": "해당 게시글을 찾을 수 없음"}
+
+    r.raise_for_status()
+    data = r.json()
+
+    # Phase2-lite: 결과 크기 제한(필드 축소)
+    return {"ok": True, "board": {
+        "id": data.get("id"),
+        "title": data.get("title"),
+        "content": data.get("content"),
+        "mid": data.get("mid"),
+        "nickname": data.get("nickname"),
+        "readcount": data.get("readcount"),
+        "createTime": data.get("createTime"),
+        "updateTime": data.get("updateTime"),
+        "imageUrl": data.get("imageUrl"),
+    }}
+
+async def delete_board(auth_header: Optional[str], board_id: int) -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/boards/{int(board_id)}"
+    r = await _CLIENT.delete(url, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "로그인이 필요함"}
+    if r.status_code == 403:
+        return {"ok": False, "error": "FORBIDDEN", "detail": "본인 게시글만 삭제 가능"}
+    if r.status_code == 404:
+        return {"ok": False, "error": "NOT_FOUND", "detail": "해당 게시글을 찾을 수 없음"}
+
+    r.raise_for_status()
+    return {"ok": True, "deleted_id": int(board_id)}
+
+async def list_boards(
+    auth_header: Optional[str],
+    page: int = 1,
+    limit: int = 10,
+    keyword: str = "",
+    types: str = ""
+) -> Dict[str, Any]:
+    size = max(10, min(int(limit), 20))
+    page = max(1, int(page))
+
+    url = f"{BACKEND_BASE_URL}/api/boards/list"
+
+    params: Dict[str, Any] = {"page": page, "size": size}
+    if keyword:
+        params["keyword"] = keyword
+    if types:
+        # PageRequestDTO에서 types를 어떤 형태로 받는지에 맞춰 전달해야 함.
+        # 일반적으로 types=t&types=c 형태를 기대하면 리스트로 보내야 하나,
+        # 현재는 최소 구현으로 문자열 그대로 전달(백엔드가 문자열 파싱이면 그대로 동작).
+        params["types"] = types
+
+    r = await _CLIENT.get(url, params=params, headers=_headers(auth_header), timeout=TIMEOUT)
+    r.raise_for_status()
+    data = r.json()
+
+    # Phase2-lite: 결과 크기 제한(목록은 핵심 필드만)
+    dto_list: List[Dict[str, Any]] = data.get("dtoList", []) or []
+    simplified = [
+        {
+            "id": it.get("id"),
+            "title": it.get("title"),
+            "nickname": it.get("nickname"),
+            "readcount": it.get("readcount"),
+            "createTime": it.get("createTime"),
+        }
+        for it in dto_list
+    ]
+    return {"ok": True, "items": simplified, "total": data.get("total"), "page": page, "size": size}
+
+async def update_board(
+    auth_header: Optional[str],
+    board_id: int,
+    title: str,
+    content: str,
+    imageUrl: str = ""
+) -> Dict[str, Any]:
+    url = f"{BACKEND_BASE_URL}/api/boards/{int(board_id)}"
+    payload = {"title": title, "content": content, "imageUrl": imageUrl or ""}
+
+    r = await _CLIENT.put(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    if r.status_code == 401:
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "로그인이 필요함"}
+    if r.status_code == 403:
+        return {"ok": False, "error": "FORBIDDEN", "detail": "본인 게시글만 수정 가능"}
+    if r.status_code == 404:
+        return {"ok": False, "error": "NOT_FOUND", "detail": "해당 게시글을 찾을 수 없음"}
+
+    r.raise_for_status()
+    return {"ok": True, "updated_id": int(board_id)}
+
+# authentication-controller (only sign-in)
+async def sign_in(auth_header: Optional[str], username: str, password: str) -> Dict[str, Any]:
+    # auth_header는 sign-in에서는 보통 None (인증 전)
+    url = f"{BACKEND_BASE_URL}/api/authentication/sign-in"
+    payload = {"username": username, "password": password}
+
+    r = await _CLIENT.post(url, json=payload, headers=_headers(auth_header), timeout=TIMEOUT)
+
+    # 보통 인증 실패는 401/403 중 하나로 오므로 둘 다 처리(백엔드 구현에 따라 다름)
+    if r.status_code in (401, 403):
+        return {"ok": False, "error": "UNAUTHORIZED", "detail": "아이디 또는 비밀번호가 올바르지 않음"}
+
+    r.raise_for_status()
+    data = r.json()
+
+    # Phase2-lite: 결과 크기 제한(불필요 필드 제거)
+    return {
+        "ok": True,
+        "token": data.get("token"),
+        "member": {
+            "id": data.get("id"),
+            "username": data.get("username"),
+            "name": data.get("name"),
+            "role": data.get("role"),
+        }
+    }
@@ -0,0 +1,65 @@
+# app/date_utils.py
+from __future__ import annotations
+import re
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple
+
+# 문장 안에서 날짜 표현을 찾을 때 쓰는 패턴 (parse_human_date가 이해하는 형태만)
+DATE_PATTERN = re.compile(
+    r"\d{4}-\d{2}-\d{2}"
+    r"|\d{1,2}월\s*\d{1,2}일"
+    r"|\d+일\s*[전후]"
+    r"|오늘|어제|그저께|그제|내일|모레"
+)
+
+_RELATIVE_DAYS = {
+    "오늘": 0,
+    "어제": -1,
+    "그제": -2,
+    "그저께": -2,
+    "내일": 1,
+    "모레": 2,
+}
+
+
+def parse_human_date(date_str: str, today: Optional[date] = None) -> str:
+    """ '오늘', '어제', '그제', '내일', '2일 전', '3일 후', '1월 5일' → YYYY-MM-DD """
+    today = today or datetime.today().date()
+    date_str = date_str.strip()
+
+    if date_str in _RELATIVE_DAYS:
+        return (today + timedelta(days=_RELATIVE_DAYS[date_str])).isoformat()
+
+    m = re.match(r"(\d+)일\s*(전|후)", date_str)
+    if m:
+        n = int(m.group(1))
+        return (today - timedelta(days=n) if m.group(2) == "전" else today + timedelta(days=n)).isoformat()
+
+    # 'M월 D일' → 올해 기준
+    m = re.match(r"(\d{1,2})월\s*(\d{1,2})일$", date_str)
+    if m:
+        try:
+            return date(today.year, int(m.group(1)), int(m.group(2))).isoformat()
+        except ValueError:
+            raise ValueError(f"날짜 형식이 올바르지 않습니다: {date_str}")
+
+    # 그냥 YYYY-MM-DD 형식이면 그대로 반환
+    try:
+        datetime.strptime(date_str, "%Y-%m-%d")
+        return date_str
+    except ValueError:
+        raise ValueError(f"날짜 형식이 올바르지 않습니다: {date_str}")
+
+
+def find_date(text: str, today: Optional[date] = None) -> Optional[Tuple[str, Tuple[int, int]]]:
+    """
+    문장에서 첫 번째 날짜 표현을 찾아 (YYYY-MM-DD, (start, end))를 반환한다.
+    날짜 표현이 없거나 해석할 수 없으면 None.
+    """
+    m = DATE_PATTERN.search(text)
+    if not m:
+        return None
+    try:
+        return parse_human_date(m.group(0), today=today), m.span()
+    except ValueError:
+        return None
@@ -0,0 +1,301 @@
+# app/fast_path.py
+"""
+모델 호출 없이 처리할 수 있는 단순 지출/수입 기록 메시지를 규칙으로 해석한다.
+예: "오늘 점심 8천원", "어제 택시 12000원", "월급 300만원 들어왔어"
+
+확신도가 FAST_PATH_MIN_CONFIDENCE 이상일 때만 create_expense / create_income
+호출 인자를 만들어 돌려주고, 나머지는 None을 반환해 기존 모델 경로로 넘긴다.
+
+match_relaxed() / match_read()는 모델을 쓸 수 없을 때(degraded 모드)만 쓰는 느슨한 해석이다.
+match_relaxed()도 기록(쓰기)이므로 FAST_PATH_RELAXED_MIN_CONFIDENCE(기본 0.85) 아래는 버린다.
+
+가정/바람/부정/환불/남이 낸 돈처럼 기록이 아닌 말투("월급 300만원이면 적은 편이야",
+"점심 8천원 쓰지 말걸")는 REJECT_PATTERNS에 걸리면 확신도와 상관없이 모델로 넘긴다.
+
+extract_update()는 수정 컨펌 단계의 답장("1번 금액 1800원으로 수정")에서
+후보 번호와 수정 내용을 뽑아 update_*_by_chat_confirm 인자로 만든다.
+"""
+from __future__ import annotations
+import os
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.amount_parser import find_amounts
+from app.date_utils import DATE_PATTERN, find_date
+
+FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "1") == "1"
+MIN_CONFIDENCE = float(os.getenv("FAST_PATH_MIN_CONFIDENCE", "0.9"))
+RELAXED_MIN_CONFIDENCE = float(os.getenv("FAST_PATH_RELAXED_MIN_CONFIDENCE", "0.85"))
+
+# 카테고리 키워드 → app/tools.py의 create_expense / create_income enum 값
+EXPENSE_KEYWORDS: Dict[str, List[str]] = {
+    "외식": ["점심", "저녁", "아침", "야식", "식사", "밥", "외식", "커피", "카페", "회식", "술값", "술집", "간식", "빵"],
+    "배달": ["배달", "배민", "요기요", "쿠팡이츠"],
+    "교통": ["택시", "버스", "지하철", "교통", "기차", "KTX", "ktx", "주유", "기름값", "톨비", "주차"],
+    "쇼핑": ["쇼핑", "옷", "신발", "화장품", "선물"],
+    "생활": ["마트", "편의점", "생활", "관리비", "통신비", "전기", "가스", "세탁", "병원", "약국", "장보기"],
+}
+INCOME_KEYWORDS: Dict[str, List[str]] = {
+    "월급": ["월급", "급여", "봉급"],
+    "용돈": ["용돈"],
+    "부수입": ["부수입", "알바", "아르바이트", "이자", "배당"],
+}
+
+# 주는 쪽 동사: 수입 키워드("용돈" 등)와 같이 나오면 받은 돈인지 준 돈인지 알 수 없으므로 모델에 맡긴다
+# 예: "사장님한테 용돈 5만원 드렸어", "동생 용돈 5만원 줌"
+GIVING_WORDS = [
+    "드렸", "드림", "드려", "드릴", "줬", "주었", "줌", "준", "줘", "줄", "주기로", "주려", "보냈", "송금",
+]
+
+# 기록 의도와 무관하게 붙는 말 (남는 단어 계산에서 제외)
+FILLER_WORDS = [
+    "썼어", "썼음", "씀", "지출", "결제", "사용", "했어", "먹었어", "샀어", "탔어",
+    "추가", "기록", "등록", "해줘", "들어왔어", "들어옴", "받았어", "받음", "입금",
+]
+
+# 이런 말이 있으면 조회/수정/삭제 등 다른 의도일 수 있으므로 모델에 맡긴다
+BLOCK_WORDS = [
+    "수정", "바꿔", "변경", "고쳐", "삭제", "지워", "취소",
+    "얼마", "보여", "조회", "내역", "합계", "총", "평균", "몇",
+    "알려", "예산", "게시", "댓글", "공지", "?",
+]
+
+# 기록이 아닌 말투: 하나라도 걸리면 모델에 맡긴다 (확신도 감점이 아니라 바로 거절)
+_END = r"(?=[\s.,!~?]|$)"
+REJECT_PATTERNS = [re.compile(p) for p in (
+    rf"(?<![라냉쫄장])면{_END}",                # 가정: "8천원이면", "쓰면" (라면/냉면/쫄면/짜장면은 음식)
+    rf"까(?:요)?{_END}",                       # 추측/제안: "나올까", "살까요"
+    r"겠", r"예정", r"(?:할|쓸)(?:\s|$|거|게|래|까)",  # 앞으로의 일: "쓰겠어", "쓸 예정", "할 거야"
+    r"싶", r"말걸", r"말 걸",                  # 바람/후회: "받고싶다", "쓰지 말걸"
+    r"아니", r"않", r"(?:^|\s)안(?:\s|썼|샀|먹|탔|냈|했|받|들어)",  # 부정: "아니야", "안 썼어" (안주/안경은 통과)
+    r"환불", r"취소",                          # 돌려받은 돈
+    r"(?:^|\s)(?!내가|제가|나가)\S+(?:가|께서)\s.*(?:샀|쐈|냈|사줬|사 줬|계산)",  # 남이 낸 돈: "친구가 점심 8천원 샀어"
+    r"아끼|아껴", r"기로",                      # 절약/계획: "5천원 아끼자", "쓰기로 했어"
+)]
+
+# 수정 컨펌 단계: "1번 금액 1800원, 메모 과자로 수정"
+_UPDATE_INDEX = re.compile(r"(\d+)\s*번")
+_UPDATE_FIELD = re.compile(r"금액|날짜|메모|내용|설명")
+_UPDATE_MEMO = re.compile(
+    r"(?:메모|내용|설명)\s*(?:을|를|은|는)?\s*[\"'“”‘’]?(.+?)[\"'“”‘’]?\s*(?:으로|로)?\s*(?:수정|변경|바꿔|고쳐|$)"
+)
+# 메모 자리에 새 값 없이 수정 동사/조사만 온 경우: "1번 메모 수정", "1번 메모를 바꾸고 싶어"
+_UPDATE_NO_VALUE = re.compile(r"(?:으로|로|을|를|은|는)?\s*(?:수정|변경|바꾸|바꿔|바뀌|고쳐|고치|교체)|(?:으로|로|을|를|은|는)$")
+_QUOTES = "\"'“”‘’"
+
+# 조회 의도 (degraded 모드 전용)
+_SUMMARY_WORDS = ["얼마", "합계", "총", "총액"]
+_LIST_WORDS = ["내역", "보여", "목록", "조회"]
+_SUMMARY_PERIODS = [
+    (("오늘", "어제", "그저께", "그제"), "day"),
+    (("이번 주", "이번주", "지난주", "지난 주", "주간"), "week"),
+    (("올해", "연간", "1년"), "year"),
+]
+_LIST_LIMIT = re.compile(r"(\d+)\s*(?:개|건)")
+
+_STATS: Dict[str, int] = {"hit": 0, "miss": 0, "low_confidence": 0}
+_UPDATE_STATS: Dict[str, int] = {"local": 0, "fallback": 0}
+
+
+@dataclass
+class FastPathMatch:
+    tool_name: str
+    arguments: Dict[str, Any]
+    confidence: float
+
+
+def _find_category(text: str, keywords: Dict[str, List[str]]) -> Tuple[Optional[str], List[str]]:
+    """메시지에 등장한 키워드로 카테고리를 고른다. 서로 다른 카테고리가 섞이면 None."""
+    categories = set()
+    matched: List[str] = []
+    for category, words in keywords.items():
+        for word in words:
+            if word in text:
+                categories.add(category)
+                matched.append(word)
+    if len(categories) != 1:
+        return None, matched
+    return categories.pop(), matched
+
+
+def match(message: str, today: Optional[date] = None) -> Optional[FastPathMatch]:
+    """
+    단순 지출/수입 기록 메시지면 FastPathMatch를, 아니면 None을 반환한다.
+    호출할 때마다 hit/miss 통계를 갱신한다.
+    """
+    if not FAST_PATH_ENABLED:
+        return None
+
+    result = _match(message.strip(), today)
+    if result is None:
+        _STATS["miss"] += 1
+        return None
+    if result.confidence < MIN_CONFIDENCE:
+        _STATS["low_confidence"] += 1
+        return None
+    _STATS["hit"] += 1
+    return result
+
+
+def _match(text: str, today: Optional[date]) -> Optional[FastPathMatch]:
+    if not text or any(word in text for word in BLOCK_WORDS):
+        return None
+    if any(pattern.search(text) for pattern in REJECT_PATTERNS):
+        return None
+
+    # 수입 키워드가 있으면 수입, 아니면 지출
+    income_category, income_words = _find_category(text, INCOME_KEYWORDS)
+    expense_category, expense_words = _find_category(text, EXPENSE_KEYWORDS)
+    if income_words and expense_words:
+        return None
+    if income_category:
+        if any(word in text for word in GIVING_WORDS):
+            return None
+        tool_name, category = "create_income", income_category
+    elif expense_category:
+        tool_name, category = "create_expense", expense_category
+    else:
+        return None
+
+    confidence = 1.0
+
+    # 날짜: 없으면 오늘로 보되 확신도를 조금 낮춘다
+    found_date = find_date(text, today=today)
+    if found_date:
+        date_str, date_span = found_date
+    else:
+        date_str, date_span = (today or date.today()).isoformat(), (0, 0)
+        confidence -= 0.05
+
+    # 금액: 정확히 1개 (여러 개면 batch 등록일 수 있으므로 모델에 맡김)
+    # 날짜 표현 안의 숫자('3일 전')가 금액으로 잡히지 않도록 날짜 부분은 가리고 찾는다
+    masked = text[:date_span[0]] + " " * (date_span[1] - date_span[0]) + text[date_span[1]:]
+    amounts = find_amounts(masked)
+    if len(amounts) != 1:
+        return None
+    amount, amount_span = amounts[0]
+
+    # 날짜/금액을 뺀 나머지 단어 → 메모
+    pieces, pos = [], 0
+    for start, end in sorted((date_span, amount_span)):
+        pieces.append(text[pos:start])
+        pos = max(pos, end)
+    pieces.append(text[pos:])
+    rest = " ".join(pieces)
+    memo_words = [w for w in rest.split() if w not in FILLER_WORDS]
+    memo = " ".join(memo_words)[:100]
+
+    return FastPathMatch(
+        tool_name=tool_name,
+        arguments={"date": date_str, "amount": amount, "category": category, "memo": memo},
+        confidence=round(confidence, 2),
+    )
+
+
+def match_relaxed(message: str, today: Optional[date] = None) -> Optional[FastPathMatch]:
+    """낮춘 확신도 기준(RELAXED_MIN_CONFIDENCE)으로, 통계 없이 지출/수입 기록을 해석한다. (degraded 모드 전용)"""
+    result = _match(message.strip(), today)
+    if result is None or result.confidence < RELAXED_MIN_CONFIDENCE:
+        return None
+    return result
+
+
+def match_read(message: str, today: Optional[date] = None) -> Optional[FastPathMatch]:
+    """
+    지출/수입 목록 조회와 합계 조회를 규칙으로 해석한다. (degraded 모드 전용)
+    "이번 달 지출 얼마야" → get_expense_summary(period=month)
+    "최근 수입 5개 보여줘" → list_incomes(limit=5)
+    """
+    text = message.strip()
+    is_income = "수입" in text and "지출" not in text
+    if not is_income and "지출" not in text and not any(w in text for w in ("썼", "쓴")):
+        return None
+
+    if any(w in text for w in _SUMMARY_WORDS):
+        period = "month"
+        for words, name in _SUMMARY_PERIODS:
+            if any(w in text for w in words):
+                period = name
+                break
+        arguments: Dict[str, Any] = {"period": period}
+        found_date = find_date(text, today=today)
+        if found_date:
+            arguments["date"] = found_date[0]
+        tool_name = "get_income_summary" if is_income else "get_expense_summary"
+        return FastPathMatch(tool_name=tool_name, arguments=arguments, confidence=1.0)
+
+    if any(w in text for w in _LIST_WORDS):
+        arguments = {}
+        m_limit = _LIST_LIMIT.search(text)
+        if m_limit:
+            arguments["limit"] = max(1, min(50, int(m_limit.group(1))))
+        found_date = find_date(text, today=today)
+        if found_date:
+            arguments["start"] = arguments["end"] = found_date[0]
+        tool_name = "list_incomes" if is_income else "list_expenses"
+        return FastPathMatch(tool_name=tool_name, arguments=arguments, confidence=1.0)
+
+    return None
+
+
+def extract_update(message: str, today: Optional[date] = None) -> Optional[Dict[str, Any]]:
+    """
+    수정 컨펌 메시지에서 {"candidateIndex": int, "newData": {...}}를 뽑는다.
+    번호가 없거나, 언급된 필드(금액/날짜/메모) 중 하나라도 해석하지 못하면 None을 반환한다.
+    (None이면 호출하는 쪽에서 모델로 넘긴다)
+    """
+    result = _extract_update(message.strip(), today)
+    _UPDATE_STATS["local" if result is not None else "fallback"] += 1
+    return result
+
+
+def _extract_update(text: str, today: Optional[date]) -> Optional[Dict[str, Any]]:
+    m_num = _UPDATE_INDEX.search(text)
+    if not m_num:
+        return None
+    candidate_index = int(m_num.group(1))
+    rest = text[:m_num.start()] + " " + text[m_num.end():]
+
+    # 필드 키워드 위치로 문장을 나눠, 각 구간에서 해당 필드 값만 찾는다
+    fields = list(_UPDATE_FIELD.finditer(rest))
+    if not fields:
+        return None
+
+    new_data: Dict[str, Any] = {}
+    for i, field in enumerate(fields):
+        end = fields[i + 1].start() if i + 1 < len(fields) else len(rest)
+        segment = rest[field.start():end]
+        keyword = field.group(0)
+
+        if keyword == "금액":
+            amounts = find_amounts(DATE_PATTERN.sub(" ", segment))
+            if len(amounts) != 1:
+                return None
+            new_data["amount"] = amounts[0][0]
+        elif keyword == "날짜":
+            found_date = find_date(segment, today=today)
+            if not found_date:
+                return None
+            new_data["date"] = found_date[0]
+        else:
+            m_memo = _UPDATE_MEMO.search(segment.strip(" ,."))
+            memo = m_memo.group(1).strip(" ,.") if m_memo else ""
+            # 따옴표로 감싼 값("수정")은 그대로 쓰고, 그 밖에 동사/조사만 잡혔으면 모델에 맡긴다
+            quoted = m_memo is not None and any(q in m_memo.group(0) for q in _QUOTES)
+            if not memo or (not quoted and _UPDATE_NO_VALUE.match(memo)):
+                return None
+            new_data["memo"] = memo[:100]
+
+    return {"candidateIndex": candidate_index, "newData": new_data}
+
+
+def stats() -> Dict[str, Any]:
+    total = _STATS["hit"] + _STATS["miss"] + _STATS["low_confidence"]
+    return {
+        **_STATS,
+        "total": total,
+        "hit_rate": round(_STATS["hit"] / total, 4) if total else 0.0,
+        "update_extract": dict(_UPDATE_STATS),
+    }
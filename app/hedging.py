@@ -0,0 +1,110 @@
+# app/hedging.py
+"""
+모델 호출 hedging (꼬리 지연 줄이기)
+
+첫 호출이 최근 지연 시간의 LLM_HEDGE_PERCENTILE 백분위를 넘도록 끝나지 않으면
+같은 요청을 한 번 더 보내고, 먼저 끝난 쪽을 쓰고 나머지는 취소한다.
+모델 호출은 부작용이 없으므로 두 번 보내도 안전하다. (tool 실행은 hedging 대상이 아님)
+
+추가 호출 비용은 전역 예산으로 제한한다.
+    보낸 hedge 수 <= LLM_HEDGE_BUDGET × 전체 호출 수 + LLM_HEDGE_BURST
+
+설정(환경변수)
+- LLM_HEDGE_ENABLED          : 0(기본) | 1
+- LLM_HEDGE_PERCENTILE       : 기본 95
+- LLM_HEDGE_DEFAULT_DELAY_MS : 표본이 모이기 전 쓰는 대기 시간 (기본 3000ms)
+- LLM_HEDGE_MIN_DELAY_MS     : 대기 시간 하한 (기본 300ms)
+- LLM_HEDGE_BUDGET           : 전체 호출 대비 hedge 비율 상한 (기본 0.05)
+- LLM_HEDGE_BURST            : 예산과 별도로 허용하는 hedge 수 (기본 5)
+"""
+from __future__ import annotations
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict
+
+HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "0") == "1"
+HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+DEFAULT_DELAY = int(os.getenv("LLM_HEDGE_DEFAULT_DELAY_MS", "3000")) / 1000
+MIN_DELAY = int(os.getenv("LLM_HEDGE_MIN_DELAY_MS", "300")) / 1000
+HEDGE_BUDGET = float(os.getenv("LLM_HEDGE_BUDGET", "0.05"))
+HEDGE_BURST = int(os.getenv("LLM_HEDGE_BURST", "5"))
+
+MIN_SAMPLES = 20
+
+# 최근 성공한 호출의 소요 시간(초)
+_LATENCIES: Deque[float] = deque(maxlen=500)
+
+_STATS: Dict[str, int] = {
+    "calls": 0,
+    "hedged": 0,
+    "hedge_won": 0,
+    "primary_won": 0,
+    "budget_denied": 0,
+}
+
+
+def hedge_delay() -> float:
+    """최근 지연 시간의 백분위 값(초). 표본이 적으면 기본값을 쓴다."""
+    if len(_LATENCIES) < MIN_SAMPLES:
+        return DEFAULT_DELAY
+    ordered = sorted(_LATENCIES)
+    index = min(len(ordered) - 1, int(len(ordered) * HEDGE_PERCENTILE / 100))
+    return max(MIN_DELAY, ordered[index])
+
+
+def _budget_allows() -> bool:
+    return _STATS["hedged"] < HEDGE_BUDGET * _STATS["calls"] + HEDGE_BURST
+
+
+async def _timed(func: Callable[[], Awaitable[Any]]) -> Any:
+    started = time.perf_counter()
+    result = await func()
+    _LATENCIES.append(time.perf_counter() - started)
+    return result
+
+
+async def run(func: Callable[[], Awaitable[Any]]) -> Any:
+    """func()를 실행하고, 늦어지면 한 번 더 실행해서 먼저 끝난 결과를 돌려준다."""
+    if not HEDGE_ENABLED:
+        return await func()
+
+    _STATS["calls"] += 1
+    primary = asyncio.ensure_future(_timed(func))
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay())
+        if done:
+            return primary.result()
+
+        if not _budget_allows():
+            _STATS["budget_denied"] += 1
+            return await primary
+
+        _STATS["hedged"] += 1
+        hedge = asyncio.ensure_future(_timed(func))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = [task for task in done if task.exception() is None]
+                # 한쪽이 실패하면 남은 쪽 결과를 기다린다
+                if succeeded or not pending:
+                    task = succeeded[0] if succeeded else next(iter(done))
+                    _STATS["hedge_won" if task is hedge else "primary_won"] += 1
+                    return task.result()
+        finally:
+            hedge.cancel()
+    finally:
+        primary.cancel()
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "enabled": HEDGE_ENABLED,
+        **_STATS,
+        "hedge_rate": round(_STATS["hedged"] / _STATS["calls"], 4) if _STATS["calls"] else 0.0,
+        "hedge_win_rate": round(_STATS["hedge_won"] / _STATS["hedged"], 4) if _STATS["hedged"] else 0.0,
+        "delay_ms": round(hedge_delay() * 1000, 1),
+        "samples": len(_LATENCIES),
+    }
@@ -0,0 +1,165 @@
+# app/log.py
+"""
+구조화 로그 (JSON 한 줄) + 백그라운드 출력
+
+    from app import log
+    log.event("chat_turn", status=200, seconds=0.42)
+    log.event("model_output", level=logging.DEBUG, items=[...])
+
+- 요청 처리 코드는 로그 레코드를 큐에 넣기만 하고, 직렬화/출력은 QueueListener 스레드가 한다.
+  큐가 가득 차면 기다리지 않고 버린다 (dropped 카운트).
+- 이벤트별 샘플링: LOG_SAMPLE_RATES="model_output=0.01,backend_request=0.1" (기본 1.0)
+- Authorization/토큰/비밀번호 값과 사용자 메시지 본문은 남기지 않는다.
+  메시지 본문은 길이만 남긴다.
+
+설정(환경변수)
+- LOG_LEVEL        : DEBUG | INFO(기본) | WARNING ...
+- LOG_SAMPLE_RATES : 이벤트별 샘플링 비율
+- LOG_QUEUE_SIZE   : 큐 크기 (기본 10000)
+"""
+from __future__ import annotations
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import sys
+from typing import Any, Dict
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+
+def _parse_rates(raw: str) -> Dict[str, float]:
+    rates = {}
+    for part in raw.split(","):
+        name, _, value = part.partition("=")
+        try:
+            rates[name.strip()] = max(0.0, min(1.0, float(value)))
+        except ValueError:
+            continue
+    return rates
+
+
+SAMPLE_RATES = _parse_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+
+# 값을 통째로 가리는 키
+SECRET_KEYS = {"authorization", "auth_header", "token", "access_token", "password", "api_key"}
+# 사용자 입력 본문 - 길이만 남긴다
+BODY_KEYS = {"message", "user_message", "memo", "content", "text", "reply"}
+_BEARER = re.compile(r"Bearer\s+[A-Za-z0-9\-_.=+/]+")
+
+_STATS: Dict[str, int] = {"emitted": 0, "sampled_out": 0, "dropped": 0}
+
+
+def redact(value: Any, key: str = "") -> Any:
+    lowered = key.lower()
+    if lowered in SECRET_KEYS:
+        return "[REDACTED]"
+    if lowered in BODY_KEYS and isinstance(value, str):
+        return f"[len={len(value)}]"
+    if isinstance(value, dict):
+        return {k: redact(v, str(k)) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(v, key) for v in value]
+    if isinstance(value, str):
+        return _BEARER.sub("Bearer [REDACTED]", value)
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "event": getattr(record, "event", record.getMessage()),
+        }
+        data.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 기다리지 않고 버린다. 포맷은 리스너 스레드에서 한다."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _STATS["dropped"] += 1
+
+
+logger = logging.getLogger("chatrouter")
+logger.setLevel(LOG_LEVEL)
+logger.propagate = False
+
+_QUEUE: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=QUEUE_SIZE)
+_output = logging.StreamHandler(sys.stdout)
+_output.setFormatter(JsonFormatter())
+_listener = logging.handlers.QueueListener(_QUEUE, _output, respect_handler_level=False)
+
+if not logger.handlers:
+    logger.addHandler(_DroppingQueueHandler(_QUEUE))
+
+_started = False
+
+
+def start() -> None:
+    global _started
+    if not _started:
+        _listener.start()
+        _started = True
+
+
+def stop() -> None:
+    """남은 로그를 모두 출력하고 리스너를 멈춘다."""
+    global _started
+    if _started:
+        _listener.stop()
+        _started = False
+
+
+start()
+atexit.register(stop)
+
+
+def enabled(level: int = logging.INFO) -> bool:
+    return logger.isEnabledFor(level)
+
+
+def event(name: str, level: int = logging.INFO, exc_info: bool = False, **fields: Any) -> None:
+    """
+    이벤트 하나를 남긴다. 레벨이 꺼져 있거나 샘플링에서 빠지면 아무것도 하지 않는다.
+    (비싼 값을 만들어야 하는 로그는 호출 전에 enabled(level)로 먼저 확인한다)
+    """
+    if not logger.isEnabledFor(level):
+        return
+    rate = SAMPLE_RATES.get(name, 1.0)
+    if rate < 1.0 and random.random() >= rate:
+        _STATS["sampled_out"] += 1
+        return
+    _STATS["emitted"] += 1
+    if rate < 1.0:
+        fields["sample_rate"] = rate
+    logger.log(
+        level,
+        name,
+        exc_info=exc_info,
+        extra={"event": name, "fields": redact(fields)},
+    )
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "level": logging.getLevelName(logger.level),
+        **_STATS,
+        "queued": _QUEUE.qsize(),
+        "sample_rates": dict(SAMPLE_RATES),
+    }
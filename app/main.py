@@ -1,25 +1,72 @@
 import os
+import hmac
 import json
+import logging
+import re
+import time
+import asyncio
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
 from fastapi import FastAPI, Header
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
-from openai import OpenAI
-
-from app.tools import TOOLS
-from app.tool_executor import execute_tool_call
-from app.tool_executor import auth_sessions
+from app.tool_executor import execute_tool_call, READ_ONLY_TOOLS
+from app import backend_api_async
+from app import fast_path
+from app import amount_parser
+from app import auth
+from app import hedging
+from app import log
+from app import model_router
+from app import offtopic
+from app import openai_client
+from app import prompts
+from app import result_cache
+from app import session_store
+from app import single_flight
+from app import tool_registry
+from app import tool_router
+from app import tool_schema
+from app import usage_ledger
+from app.openai_client import ModelUnavailable
 
 load_dotenv()
-client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if offtopic.OFFTOPIC_ENABLED:
+        loaded = offtopic.load_model()
+        log.event("offtopic_model", loaded=loaded, path=offtopic.MODEL_PATH)
+    session_store.restore_snapshot()
+    snapshot_task = asyncio.create_task(session_store.snapshot_loop())
+    yield
+    snapshot_task.cancel()
+    await session_store.save_snapshot()
+    await backend_api_async.aclose()
+    await session_store.aclose()
+    log.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
 WARNING_COUNT = 3
 BLOCK_COUNT = 5
 
+# 가드레일 응답(첫 자연어 입력에만 사용)을 1차 호출과 동시에 미리 요청할지 여부
+# - 기본값(0): 필요한 분기에서만 지연 호출
+# - 1: natural_count == 0 일 때 병렬로 미리 요청하고, tool call이 나오면 취소
+SPECULATIVE_GUARD = os.getenv("CHAT_SPECULATIVE_GUARD", "0") == "1"
+
+# 관리자 API(/admin/*) 토큰. 비어 있으면 관리자 API는 꺼진다.
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN", "")
+
+# 한 턴에서 동시에 실행할 조회 tool 수 (백엔드 동시 요청 상한)
+TOOL_CONCURRENCY = int(os.getenv("TOOL_CONCURRENCY", "4"))
+_TOOL_SEMAPHORE = asyncio.Semaphore(TOOL_CONCURRENCY)
+
 
 class ChatRequest(BaseModel):
     message: str
@@ -43,29 +90,60 @@ def extract_call_fields(call_item):
     raise ValueError(f"Unsupported call type: {call_item.type}")
 
 
-@app.post("/chat")
-def chat(req: ChatRequest, authorization: str | None = Header(default=None)):
-    
-    session = auth_sessions.setdefault(authorization, {})
+JSON_MEDIA_TYPE = "application/json; charset=utf-8"
 
-    natural_count = session.get("natural_count", 0)
-    blocked = session.get("blocked", False)
-    block_notified = session.get("block_notified", False)
-
-    if session.get("blocked"):
-        if session.get("block_notified"):
-            return JSONResponse(
-                content={"reply": "현재 이용이 제한되어 있습니다."},
-                status_code=403,
-                media_type="application/json; charset=utf-8",
-            )
-        else:
-            session["block_notified"] = True
-            return JSONResponse(
-                content={"reply": "자연어 입력이 반복되어 이용이 제한되었습니다."},
-                media_type="application/json; charset=utf-8",
-            )
-    
+# 자연어(가계부 외) 입력 횟수별 안내 문구 (1번째는 가드레일 모델 답변을 사용)
+NATURAL_REPLIES = {
+    # 2️⃣ 2번째: 가계부 유도
+    2: "혹시 지출이나 수입을 기록해볼까요? 예: 오늘 점심 8천원",
+    # 3️⃣ 3번째: 1차 경고 (약)
+    3: "이 채팅은 가계부 기록을 돕기 위한 용도예요 🙂",
+    # 4️⃣ 4번째: 2차 경고 (강)
+    4: "가계부와 무관한 대화가 계속되면 이용이 제한됩니다.",
+}
+BLOCKED_REPLY = "자연어 입력이 반복되어 이용이 제한되었습니다."
+DEGRADED_REPLY = "지금은 요청을 처리할 수 없습니다. 잠시 후 다시 시도해주세요."
+# 로컬 분류기가 잡담으로 판단한 첫 번째 입력에 대한 고정 답변 (가드레일 모델 호출 대신)
+OFFTOPIC_REPLY = "저는 가계부 도우미예요. 지출이나 수입을 기록하거나 조회하는 일을 도와드릴 수 있어요."
+
+# amount가 기록할/바꿀 새 금액인 tool: 모델이 빠뜨리거나 메시지와 다르게 읽으면 로컬 파서 값으로 채운다
+AMOUNT_TOOLS = {
+    "create_expense",
+    "create_income",
+    "update_latest_transaction",
+}
+# amount가 수정 후보를 찾는 검색 조건인 tool: 메시지 금액을 넣지 않고, 모델 값이 맞는지만 확인한다
+SEARCH_AMOUNT_TOOLS = {
+    "update_expense_by_chat",
+    "update_income_by_chat",
+}
+# 금액 바로 뒤에 '으로/로'가 오면 검색 조건이 아니라 새 값이다 ("금액 9천원으로 수정해줘")
+_NEW_AMOUNT_SUFFIX = re.compile(r"\s*(?:으로|로)")
+
+
+def _json(content: dict, status_code: int = 200) -> JSONResponse:
+    return JSONResponse(content=content, status_code=status_code, media_type=JSON_MEDIA_TYPE)
+
+
+def _sse(event: str, data: dict) -> str:
+    """Server-Sent Events 한 건을 직렬화한다."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _blocked_reply(session: dict) -> tuple[dict, int] | None:
+    """차단된 세션이면 (응답, status_code)를, 아니면 None을 반환한다."""
+    if not session.get("blocked"):
+        return None
+
+    if session.get("block_notified"):
+        return {"reply": "현재 이용이 제한되어 있습니다."}, 403
+
+    session["block_notified"] = True
+    return {"reply": BLOCKED_REPLY}, 200
+
+
+async def _pending_reply(session: dict, message: str, authorization: str | None) -> dict | None:
+    """삭제/수정 컨펌 단계라면 처리 결과를, 아니면 None을 반환한다."""
     if session.get("pending_action") == "delete":
         tx_type = session.get("pending_tx_type","EXPENSE")
         tool_name =(
@@ -73,109 +151,53 @@ def chat(req: ChatRequest, authorization: str | None = Header(default=None)):
             if tx_type == "INCOME"
             else "confirm_delete_by_chat"
         )
-        result = execute_tool_call(
+        result = await execute_tool_call(
             tool_name=tool_name,
-            arguments={"message":req.message},
+            arguments={"message":message},
             auth_header=authorization
         )
-        return JSONResponse(
-            content={"reply": result.get("message","")},
-            media_type="application/json; charset=utf-8",
-        )
-
-    # if session.get("pending_action") == "update" and session.get("pending_update_candidates"):
-    #     user_message = req.message.strip()
-    #     candidates = session["pending_update_candidates"]
-
-    #     # 1) 사용자 입력에서 번호 추출 (ex: "1번 금액 1800원으로 수정")
-    #     import re
-    #     m_num = re.search(r"(\d+)번", user_message)
-    #     if not m_num:
-    #         return JSONResponse(
-    #             content={"reply": "수정할 항목 번호를 입력해주세요. 예: 1번 금액 1800원"},
-    #             media_type="application/json; charset=utf-8",
-    #         )
-    #     candidate_index = int(m_num.group(1))
-
-    #     # 2) 수정 내용 추출 (날짜, 금액, 메모)
-    #     new_data: dict[str, any] = {}
-
-    #     # 금액
-    #     m_amount = re.search(r"(\d+)\s*원", user_message)
-    #     if m_amount:
-    #         new_data["amount"] = int(m_amount.group(1))
-
-    #     # 날짜
-    #     m_date_str = re.search(r"(오늘|어제|내일|\d+일\s*[전후]|\d{4}-\d{2}-\d{2})", user_message)
-    #     if m_date_str:
-    #         try:
-    #             new_data["date"] = parse_human_date(m_date_str.group(1))
-    #         except ValueError as e:
-    #             return JSONResponse(
-    #                 content={"reply": str(e)},
-    #                 media_type="application/json; charset=utf-8",
-    #             )
-
-    #     # 메모
-    #     m_memo = re.search(r"(?:메모|내용|설명)\s*(?:을|를|은|는)?\s*(.+?)(?:으로|로)?\s*수정", user_message)
-    #     if m_memo:
-    #         new_data["memo"] = m_memo.group(1)
-
-    #     if not new_data:
-    #         return JSONResponse(
-    #             content={"reply": "수정할 내용을 입력해주세요. (금액/날짜/메모)"},
-    #             media_type="application/json; charset=utf-8",
-    #         )
-
-    #     # 3) confirm 호출
-    #     result = execute_tool_call(
-    #         tool_name="update_expense_by_chat_confirm",
-    #         arguments={
-    #             "candidateIndex": candidate_index,
-    #             "newData": new_data
-    #         },
-    #         auth_header=authorization
-    #     )
-
-
-    #     return JSONResponse(
-    #         content={"reply": result.get("message", "")},
-    #         media_type="application/json; charset=utf-8",
-    #     )
+        return {"reply": result.get("message","")}
 
     if session.get("pending_action") == "update" and session.get("pending_update_candidates"):
-        import re
+        return await _pending_update_reply(session, message, authorization)
 
-        user_message = req.message.strip()
+    return None
 
-        has_index = bool(re.search(r"\d+\s*번", user_message))
-        has_field = bool(re.search(r"(금액|날짜|메모)", user_message))
 
-        # 🚨 수정 의도 아님 → 즉시 종료
-        if not (has_index and has_field):
-            session.pop("pending_action", None)
-            session.pop("pending_update_candidates", None)
-            session.pop("pending_tx_type", None)
-            return JSONResponse(
-                content={"reply": "수정에 실패했습니다. 처음부터 다시 시도해주세요."},
-                media_type="application/json; charset=utf-8",
-            )
-        candidates = session["pending_update_candidates"]
+async def _pending_update_reply(session: dict, message: str, authorization: str | None) -> dict:
+    """수정 컨펌 단계: 사용자가 고른 후보 번호와 수정 내용을 반영한다."""
+    import re
+
+    user_message = message.strip()
+
+    has_index = bool(re.search(r"\d+\s*번", user_message))
+    has_field = bool(re.search(r"(금액|날짜|메모)", user_message))
 
+    # 🚨 수정 의도 아님 → 즉시 종료
+    if not (has_index and has_field):
+        session.pop("pending_action", None)
+        session.pop("pending_update_candidates", None)
+        session.pop("pending_tx_type", None)
+        return {"reply": "수정에 실패했습니다. 처음부터 다시 시도해주세요."}
+
+    # 번호/금액/날짜/메모를 규칙으로 먼저 추출하고, 실패한 경우에만 모델에 맡긴다
+    extracted = fast_path.extract_update(user_message)
+    if extracted is not None:
+        candidate_index = extracted["candidateIndex"]
+        new_data = extracted["newData"]
+    else:
         # 사용자 입력 전체를 LLM에게 맡겨서 JSON(date, amount, memo) 추출
-        prompt_messages = [
-            {"role": "system", "content": (
-                "사용자의 메시지에서 '번호', '날짜', '금액', '메모' 정보를 JSON으로 추출하세요. "
-                "날짜는 반드시 YYYY-MM-DD 형식으로, 금액은 숫자로, 메모는 문자열로. "
-                "예: {'candidateIndex': 1, 'newData': {'date':'2026-01-25','amount':1800,'memo':'과자'}}"
-            )},
-            {"role": "user", "content": user_message},
-        ]
-
-        llm_response = client.responses.create(
-            model="gpt-5-mini",
-            input=prompt_messages,
-        )
+        # 캐시된 prefix(tools + system)를 그대로 쓰기 위해 tools는 보내되 호출은 막는다
+        try:
+            llm_response = await prompts.create_response(
+                user_message,
+                tools=tool_router.select_tools(user_message, auth.role(authorization)),
+                instruction=prompts.UPDATE_EXTRACT_INSTRUCTION,
+                tool_choice="none",
+            )
+        except ModelUnavailable:
+            # 수정 대기 상태는 그대로 두고 다시 입력받는다
+            return {"reply": DEGRADED_REPLY}
 
         try:
             llm_args_text = llm_response.output_text.strip()
@@ -183,190 +205,245 @@ def chat(req: ChatRequest, authorization: str | None = Header(default=None)):
             candidate_index = llm_args.get("candidateIndex")
             new_data = llm_args.get("newData", {})
         except Exception:
-            session = auth_sessions.get(authorization)
-            if session:
-                session.pop("pending_action", None)
-                session.pop("pending_update_candidates", None)
-                session.pop("pending_tx_type", None)
-
-            return JSONResponse(
-                content={"reply": "수정에 실패했습니다. 처음부터 다시 시도해주세요."},
-                media_type="application/json; charset=utf-8",
-            )
-
-        tx_type = session.get("pending_tx_type","EXPENSE")
-
-        tool_name = (
-            "update_income_by_chat_confirm"
-            if tx_type == "INCOME"
-            else "update_expense_by_chat_confirm"
-        )
+            session.pop("pending_action", None)
+            session.pop("pending_update_candidates", None)
+            session.pop("pending_tx_type", None)
+            return {"reply": "수정에 실패했습니다. 처음부터 다시 시도해주세요."}
 
-        # confirm 호출
-        result = execute_tool_call(
-            tool_name=tool_name,
-            arguments={"candidateIndex": candidate_index, "newData": new_data, "message":req.message},
-            auth_header=authorization
-        )
+    tx_type = session.get("pending_tx_type","EXPENSE")
 
-        return JSONResponse(
-            content={"reply": result.get("message", "")},
-            media_type="application/json; charset=utf-8",
-        )
+    tool_name = (
+        "update_income_by_chat_confirm"
+        if tx_type == "INCOME"
+        else "update_expense_by_chat_confirm"
+    )
 
-    # Step 1) 모델 호출(툴 포함)
-    response = client.responses.create(
-        model="gpt-5-mini",
-        input=[
-            {"role": "system", "content": "항상 한국어로만 답변해. 필요하면 함수(tool)를 호출해서 작업을 수행해."},
-            {"role": "user", "content": req.message},
-        ],
-        tools=TOOLS,
+    # confirm 호출
+    result = await execute_tool_call(
+        tool_name=tool_name,
+        arguments={"candidateIndex": candidate_index, "newData": new_data, "message":message},
+        auth_header=authorization
     )
+    return {"reply": result.get("message", "")}
 
-    # 디버그용
-    # print("OUTPUT_TYPES_1:", [item.type for item in response.output])
-    # print("OUTPUT_TEXT_1:", repr(response.output_text))
 
+async def _fast_path_reply(session: dict, message: str, authorization: str | None) -> dict | None:
+    """규칙으로 확실히 해석되는 지출/수입 기록이면 모델 호출 없이 바로 실행한다."""
+    matched = fast_path.match(message)
+    if matched is None:
+        return None
 
-    # Step 2) tool call이 있는지 확인
-    tool_calls = []
-    for item in response.output:
-        print("RAW_ITEM:", item.type, item)
-        if item.type in ("tool_call", "function_call"):
-            tool_calls.append(item)
-            print(f'tool_calls:{tool_calls}')
-    
-
-    response2 = client.responses.create(
-        model="gpt-5-mini",
-        input=[
-            {"role": "system", "content": "항상 한국어로만 답변해. 필요하면 함수(tool)를 호출해서 작업을 수행해. 가계부와 관련된 이야기만 해."},
-            {"role": "user", "content": req.message},
-        ],
-        tools=TOOLS,
+    session["natural_count"] = 0
+    result = await execute_tool_call(
+        matched.tool_name,
+        {**matched.arguments, "message": message},
+        authorization,
     )
+    return tool_result_content(result)
 
-    # tool call이 없으면 Step 5로 종료(최종 답변)
-    if not tool_calls:
-        # 자연어 입력 카운트 증가
-        session["natural_count"] = session.get("natural_count", 0) + 1
-        count = session["natural_count"]
-
-        # 1️⃣ 1번째: 일반 대화
-        if count == 1:
-            return JSONResponse(
-                content={"reply": response2.output_text},
-                media_type="application/json; charset=utf-8",
-            )
 
-        # 2️⃣ 2번째: 가계부 유도
-        if count == 2:
-            return JSONResponse(
-                content={"reply": "혹시 지출이나 수입을 기록해볼까요? 예: 오늘 점심 8천원"},
-                media_type="application/json; charset=utf-8",
-            )
+def _offtopic_reply(session: dict, message: str) -> dict | None:
+    """로컬 분류기가 확실한 잡담으로 보면 모델 호출 없이 자연어 카운트만 올리고 답한다."""
+    if not offtopic.is_offtopic(message):
+        return None
+    count = count_natural_turn(session)
+    return {"reply": natural_reply_text(count) or OFFTOPIC_REPLY}
 
-        # 3️⃣ 3번째: 1차 경고 (약)
-        if count == 3:
-            return JSONResponse(
-                content={"reply": "이 채팅은 가계부 기록을 돕기 위한 용도예요 🙂"},
-                media_type="application/json; charset=utf-8",
-            )
 
-        # 4️⃣ 4번째: 2차 경고 (강)
-        if count == 4:
-            return JSONResponse(
-                content={"reply": "가계부와 무관한 대화가 계속되면 이용이 제한됩니다."},
-                media_type="application/json; charset=utf-8",
-            )
+async def _degraded_reply(session: dict, message: str, authorization: str | None) -> dict:
+    """
+    모델을 쓸 수 없을 때(키 없음/브레이커 열림)의 규칙 기반 처리.
+    지출/수입 기록, 목록 조회, 합계 조회만 처리하고 나머지는 바로 재시도 안내를 돌려준다.
+    """
+    matched = fast_path.match_relaxed(message) or fast_path.match_read(message)
+    if matched is None:
+        return {"reply": DEGRADED_REPLY}
+
+    session["natural_count"] = 0
+    result = await execute_tool_call(
+        matched.tool_name,
+        {**matched.arguments, "message": message},
+        authorization,
+    )
+    return tool_result_content(result)
 
-        # 5️⃣ 5번째: 차단 알림 (❗ 403 아님)
-        if count >= 5:
-            session["blocked"] = True
-            session["block_notified"] = False
-            return JSONResponse(
-                content={"reply": "자연어 입력이 반복되어 이용이 제한되었습니다."},
-                media_type="application/json; charset=utf-8",
-            )
 
+async def create_guard_response(message: str, role: str | None = None):
+    """첫 번째 자연어(가계부 외) 입력에 보여줄 가드레일 답변을 생성한다. (role: tool 선택용, 본 호출과 같은 prefix)"""
+    return await prompts.create_response(
+        message,
+        tools=tool_router.select_tools(message, role),
+        instruction=prompts.GUARD_INSTRUCTION,
+    )
 
-    base_messages = [
-        {"role": "system", "content": (
-          "항상 한국어로만 답변해. 필요하면 함수(tool)를 호출해서 작업을 수행해."
-        #   "삭제/수정처럼 돌이킬 수 없는 작업은 식별자(ID)가 없으면 먼저 확인 질문을 해."
-        )},
-        {"role": "user", "content": req.message},
-    ]
 
-    # 1차 호출의 output(function_call 포함)을 그대로 이어붙임
-    followup_input = base_messages + response.output
+def _loggable_arguments(call_item):
+    """arguments 문자열을 dict로 바꿔 로그 redaction(memo 등)이 적용되게 한다."""
+    raw = getattr(call_item, "arguments", None)
+    try:
+        return json.loads(raw) if isinstance(raw, str) else raw
+    except ValueError:
+        return f"[unparsed len={len(raw)}]"
+
+
+def collect_tool_calls(output) -> list:
+    """모델 output item 중 tool call만 모은다."""
+    tool_calls = [item for item in output if item.type in ("tool_call", "function_call")]
+    # 모델 출력 덤프는 DEBUG에서만 (운영에서는 만들지도 않는다)
+    if log.enabled(logging.DEBUG):
+        log.event(
+            "model_output",
+            level=logging.DEBUG,
+            items=[item.type for item in output],
+            tool_calls=[
+                {"name": getattr(tc, "name", None), "arguments": _loggable_arguments(tc)}
+                for tc in tool_calls
+            ],
+        )
+    return tool_calls
+
+
+def count_natural_turn(session: dict) -> int:
+    """자연어 입력 카운트를 올리고, 차단 기준에 도달하면 세션을 차단 상태로 바꾼다."""
+    session["natural_count"] = session.get("natural_count", 0) + 1
+    count = session["natural_count"]
+
+    # 5️⃣ 5번째: 차단 알림 (❗ 403 아님)
+    if count >= BLOCK_COUNT:
+        session["blocked"] = True
+        session["block_notified"] = False
+    return count
+
+
+def natural_reply_text(count: int) -> str | None:
+    """횟수별 고정 안내 문구. 1번째(일반 대화)는 가드레일 답변을 써야 하므로 None."""
+    if count == 1:
+        return None
+    if count >= BLOCK_COUNT:
+        return BLOCKED_REPLY
+    return NATURAL_REPLIES[count]
+
+
+def tool_result_content(result: dict) -> dict:
+    """execute_tool_call 결과를 /chat 응답 본문으로 변환한다."""
+    if "candidates" in result:
+        return {
+            "reply": result.get("message", ""),
+            "candidates": result.get("candidates", [])
+        }
+
+    if "items" in result:
+        reply = result.get("reply")
+        if not reply:
+            reply = "\n".join([f'{e["date"]} {e["amount"]}원 "{e.get("memo","")}" [{e.get("category","")}]' for e in result["items"]])
+        return {"reply": reply or "내역이 없습니다."}
+
+    if result.get("message"):
+        return {"reply": result["message"]}
+
+    # 🔹 fallback 처리 (무조건 reply 반환)
+    return {"reply": "작업이 완료되었습니다."}
+
+
+def prepare_tool_args(tool_name: str, args, message: str) -> dict:
+    """모델이 만든 arguments를 파싱하고 라우터 쪽 보정을 적용한다."""
+    # arguments가 문자열이면 JSON 파싱
+    if isinstance(args, str):
+        args = json.loads(args)
+
+    if not isinstance(args, dict):
+        args = {}
+
+    # 금액 보정: 메시지에 금액 표현이 하나뿐이고 모델 값이 없거나(자리표시 값 1 포함) 그와 다르면
+    # 로컬 파서 값을 쓴다 ('8.5천' 같은 표현을 모델이 잘못 읽는 경우 방지)
+    if tool_name in AMOUNT_TOOLS:
+        amount = amount_parser.find_amount(message)
+        if amount is not None and args.get("amount") != amount:
+            args["amount"] = amount
+
+    # 검색 조건 금액: 메시지에 검색 조건으로 적힌 금액이 아니면(자리표시 값 1, 새 값 '9천원으로') 뺀다
+    if tool_name in SEARCH_AMOUNT_TOOLS and "amount" in args:
+        search_amounts = {
+            value for value, (_, end) in amount_parser.find_amounts(message)
+            if not _NEW_AMOUNT_SUFFIX.match(message, end)
+        }
+        if args["amount"] not in search_amounts:
+            args.pop("amount")
+
+    # update용 보정
+    if tool_name == "update_expense_by_chat":
+        # memo가 빈 문자열이면 제거
+        if "memo" in args and (args["memo"] is None or args["memo"].strip() == ""):
+            args.pop("memo")
+
+    # 기존 로직 유지
+    if tool_name not in ("create_expense_batch", "create_income_batch"):
+        args["message"] = message
+    return args
+
+
+async def _run_read_tool(tool_name: str, args: dict, authorization: str | None) -> dict:
+    async with _TOOL_SEMAPHORE:
+        return await execute_tool_call(tool_name, args, authorization)
+
+
+def merge_tool_results(results: list) -> dict:
+    """여러 tool 결과를 응답 본문 하나로 합친다. 후보 목록(삭제/수정 컨펌)이 있으면 함께 내려준다."""
+    contents = [tool_result_content(r) for r in results]
+    if len(contents) == 1:
+        return contents[0]
+
+    merged = {"reply": "\n\n".join(c["reply"] for c in contents if c.get("reply"))}
+    # 세션의 pending 상태는 마지막으로 실행된 후보 목록 기준이다
+    for c in reversed(contents):
+        if "candidates" in c:
+            merged["candidates"] = c["candidates"]
+            break
+    return merged
+
+
+async def run_tool_calls(tool_calls: list, message: str, authorization: str | None, session: dict) -> dict:
+    """
+    모델이 요청한 tool call을 모두 실행하고 응답 본문을 만든다.
+    - 쓰기/상태 변경 tool은 모델이 낸 순서대로 하나씩 실행한다.
+    - 조회 tool은 쓰기가 끝난 뒤 TOOL_CONCURRENCY 개까지 동시에 실행한다.
+    - 결과는 모델이 낸 순서대로 이어 붙인다.
+    """
+    session["natural_count"] = 0
 
     # tool 실행 시 auth 전달
-    tool_results = []
+    calls = []
+    seen = set()
     for tc in tool_calls:
-        session["natural_count"] = 0
         call_id, tool_name, args = extract_call_fields(tc)
+        args = prepare_tool_args(tool_name, args, message)
+
+        # 같은 tool을 같은 인자로 두 번 낸 경우 한 번만 실행
+        signature = (tool_name, json.dumps(args, ensure_ascii=False, sort_keys=True))
+        if signature in seen:
+            continue
+        seen.add(signature)
+        calls.append((tool_name, args))
+
+    results: list = [None] * len(calls)
+    for i, (tool_name, args) in enumerate(calls):
+        if tool_name not in READ_ONLY_TOOLS:
+            results[i] = await execute_tool_call(tool_name, args, authorization)
+
+    reads = [i for i, (tool_name, _) in enumerate(calls) if tool_name in READ_ONLY_TOOLS]
+    read_results = await asyncio.gather(
+        *(_run_read_tool(calls[i][0], calls[i][1], authorization) for i in reads)
+    )
+    for i, result in zip(reads, read_results):
+        results[i] = result
 
-        # arguments가 문자열이면 JSON 파싱
-        if isinstance(args, str):
-            args = json.loads(args)
-
-        if not isinstance(args, dict):
-            args = {}
-
-        # update용 보정
-        if tool_name == "update_expense_by_chat":
-            # amount가 1이면 (LLM 기본 쓰레기값) 제거
-            if args.get("amount") == 1:
-                args.pop("amount")
-
-            # memo가 빈 문자열이면 제거
-            if "memo" in args and (args["memo"] is None or args["memo"].strip() == ""):
-                args.pop("memo")
-
-        # 기존 로직 유지
-        if tool_name not in ("create_expense_batch", "create_income_batch"):
-            args["message"] = req.message
-
-        result = execute_tool_call(tool_name, args, authorization)
-
-        if "candidates" in result:
-            return JSONResponse(
-                content={
-                    "reply": result.get("message", ""),
-                    "candidates": result.get("candidates", [])
-                },
-                media_type="application/json; charset=utf-8"
-            )
-
-        if "items" in result:
-            reply = result.get("reply")
-            if not reply:
-                reply = "\n".join([f'{e["date"]} {e["amount"]}원 "{e.get("memo","")}" [{e.get("category","")}]' for e in result["items"]])
-            return JSONResponse(
-                content={"reply": reply or "내역이 없습니다."},
-                media_type="application/json; charset=utf-8",
-            )
-
-
-        if result.get("message"):
-            return JSONResponse(
-                content={"reply": result["message"]},
-                media_type="application/json; charset=utf-8",
-            )
-        
-        # 🔹 fallback 처리 (무조건 reply 반환)
-        return JSONResponse(
-            content={"reply": "작업이 완료되었습니다."},
-            media_type="application/json; charset=utf-8"
-        )
+    return merge_tool_results(results)
 
-        # tool_results.append({
-        #     "type": "function_call_output",
-        #     "call_id": call_id,
-        #     "output": json.dumps(result, ensure_ascii=False),
-        # })
+    # tool_results.append({
+    #     "type": "function_call_output",
+    #     "call_id": call_id,
+    #     "output": json.dumps(result, ensure_ascii=False),
+    # })
 
     # # Step 4) tool_result를 붙여서 재호출
     # response2 = client.responses.create(
@@ -387,28 +464,289 @@ def chat(req: ChatRequest, authorization: str | None = Header(default=None)):
     #     media_type="application/json; charset=utf-8",
     # )
 
-from datetime import datetime, timedelta
-import re
 
-def parse_human_date(date_str: str) -> str:
-    """ '오늘', '어제', '내일', '2일 전', '3일 후' → YYYY-MM-DD """
-    today = datetime.today().date()
-    date_str = date_str.strip()
-
-    if date_str == "오늘":
-        return today.isoformat()
-    elif date_str == "어제":
-        return (today - timedelta(days=1)).isoformat()
-    elif date_str == "내일":
-        return (today + timedelta(days=1)).isoformat()
-    else:
-        m = re.match(r"(\d+)일\s*(전|후)", date_str)
-        if m:
-            n = int(m.group(1))
-            return (today - timedelta(days=n) if m.group(2) == "전" else today + timedelta(days=n)).isoformat()
-    # 그냥 YYYY-MM-DD 형식이면 그대로 반환
+@app.post("/chat")
+async def chat(req: ChatRequest, authorization: str | None = Header(default=None)):
+    # 만료된 토큰은 모델/백엔드 호출 없이 바로 돌려보낸다
+    if auth.reject_expired(authorization):
+        return _json({"reply": auth.EXPIRED_MESSAGE}, 401)
+    # 같은 사용자의 같은 메시지가 겹쳐 들어오면 한 번만 처리하고 결과를 나눠 쓴다
+    content, status_code = await single_flight.run(
+        single_flight.make_key(authorization, req.message),
+        lambda: _chat_turn(req.message, authorization),
+    )
+    return _json(content, status_code)
+
+
+async def _chat_turn(message: str, authorization: str | None) -> tuple[dict, int]:
+    """
+    /chat 한 턴을 처리하고 (응답 본문, status_code)를 반환한다.
+    세션은 턴 시작에 한 번 읽고 끝에 한 번 저장하며, 같은 세션의 턴은 한 번에 하나씩 처리된다.
+    모델 사용량은 턴 단위로 장부에 남긴다.
+    """
+    session, session_token = await session_store.begin_turn(authorization)
+    token = usage_ledger.begin_turn()
+    status_code = 500
     try:
-        datetime.strptime(date_str, "%Y-%m-%d")
-        return date_str
-    except ValueError:
-        raise ValueError(f"날짜 형식이 올바르지 않습니다: {date_str}")
+        content, status_code = await _handle_turn(session, message, authorization)
+        return content, status_code
+    finally:
+        try:
+            turn = usage_ledger.end_turn(token, session, authorization)
+        finally:
+            await session_store.end_turn(session_token)
+        log.event(
+            "chat_turn",
+            user=usage_ledger.user_key(authorization),
+            status=status_code,
+            seconds=round(turn["wall_seconds"], 4),
+            model_calls=turn["calls"],
+            input_tokens=turn["input_tokens"],
+            cached_tokens=turn["cached_tokens"],
+            output_tokens=turn["output_tokens"],
+        )
+
+
+async def _handle_turn(session: dict, message: str, authorization: str | None) -> tuple[dict, int]:
+
+    blocked = _blocked_reply(session)
+    if blocked is not None:
+        return blocked
+
+    pending = await _pending_reply(session, message, authorization)
+    if pending is not None:
+        return pending, 200
+
+    fast = await _fast_path_reply(session, message, authorization)
+    if fast is not None:
+        return fast, 200
+
+    offtopic_reply = _offtopic_reply(session, message)
+    if offtopic_reply is not None:
+        return offtopic_reply, 200
+
+    try:
+        return await _model_turn(session, message, authorization), 200
+    except ModelUnavailable:
+        return await _degraded_reply(session, message, authorization), 200
+
+
+async def _model_turn(session: dict, message: str, authorization: str | None) -> dict:
+    """모델 호출이 필요한 턴. 모델을 쓸 수 없으면 ModelUnavailable이 그대로 올라간다."""
+    natural_count = session.get("natural_count", 0)
+    role = auth.role(authorization)
+
+    # 가드레일 답변은 natural_count == 0 (이번이 첫 자연어 입력이 될 수 있는 경우)에만 쓰인다.
+    guard_task = None
+    if SPECULATIVE_GUARD and natural_count == 0:
+        guard_task = asyncio.create_task(create_guard_response(message, role))
+
+    # Step 1) 모델 호출(툴 포함) - 메시지와 관련된 tool 묶음만 보낸다
+    tools = tool_router.select_tools(message, role)
+    started = time.perf_counter()
+    try:
+        response = await model_router.respond(message, tools)
+    except BaseException:
+        if guard_task is not None:
+            guard_task.cancel()
+        raise
+    tool_router.record_latency(tools, time.perf_counter() - started)
+
+    # 디버그용
+    # print("OUTPUT_TYPES_1:", [item.type for item in response.output])
+    # print("OUTPUT_TEXT_1:", repr(response.output_text))
+
+
+    # Step 2) tool call이 있는지 확인
+    tool_calls = collect_tool_calls(response.output)
+
+    # tool call이 나왔으면 미리 띄운 가드레일 호출은 필요 없다.
+    if tool_calls and guard_task is not None:
+        guard_task.cancel()
+
+    # tool call이 없으면 Step 5로 종료(최종 답변)
+    if not tool_calls:
+        count = count_natural_turn(session)
+        reply = natural_reply_text(count)
+
+        # 1️⃣ 1번째: 일반 대화 (가드레일 답변은 이 분기에서만 필요)
+        if reply is None:
+            response2 = (
+                await guard_task
+                if guard_task is not None
+                else await create_guard_response(message, role)
+            )
+            reply = response2.output_text
+        elif guard_task is not None:
+            guard_task.cancel()
+
+        return {"reply": reply}
+
+    return await run_tool_calls(tool_calls, message, authorization, session)
+
+
+@app.post("/chat/stream")
+async def chat_stream(req: ChatRequest, authorization: str | None = Header(default=None)):
+    """
+    /chat과 같은 흐름을 SSE(text/event-stream)로 내려준다.
+    - status : tool call이 감지되는 즉시 "처리 중" 안내
+    - delta  : 모델 답변 토큰 조각
+    - message: 한 번에 완성되는 답변(tool 결과, 안내 문구 등). /chat 응답 본문과 같은 형태
+    - error  : 처리 중 오류
+    - done   : 스트림 종료
+    만료된 토큰이면 스트림을 열지 않고 /chat과 같은 401 JSON을 돌려준다.
+    """
+    if auth.reject_expired(authorization):
+        return _json({"reply": auth.EXPIRED_MESSAGE}, 401)
+    return StreamingResponse(
+        _chat_events(req.message, authorization),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _chat_events(message: str, authorization: str | None):
+    session, session_token = await session_store.begin_turn(authorization)
+    token = usage_ledger.begin_turn()
+    try:
+        async for chunk in _chat_event_body(session, message, authorization):
+            yield chunk
+    except Exception:
+        yield _sse("error", {"reply": "응답 생성에 실패했습니다. 잠시 후 다시 시도해주세요."})
+    finally:
+        try:
+            turn = usage_ledger.end_turn(token, session, authorization)
+        finally:
+            await session_store.end_turn(session_token)
+        log.event(
+            "chat_turn",
+            user=usage_ledger.user_key(authorization),
+            stream=True,
+            seconds=round(turn["wall_seconds"], 4),
+            model_calls=turn["calls"],
+            input_tokens=turn["input_tokens"],
+            cached_tokens=turn["cached_tokens"],
+            output_tokens=turn["output_tokens"],
+        )
+    yield _sse("done", {})
+
+
+async def _chat_event_body(session: dict, message: str, authorization: str | None):
+    blocked = _blocked_reply(session)
+    if blocked is not None:
+        content, status_code = blocked
+        yield _sse("message", {**content, "status": status_code})
+        return
+
+    pending = await _pending_reply(session, message, authorization)
+    if pending is not None:
+        yield _sse("message", pending)
+        return
+
+    fast = await _fast_path_reply(session, message, authorization)
+    if fast is not None:
+        yield _sse("message", fast)
+        return
+
+    offtopic_reply = _offtopic_reply(session, message)
+    if offtopic_reply is not None:
+        yield _sse("message", offtopic_reply)
+        return
+
+    # Step 1) 모델 호출(툴 포함) - tool call 여부를 최대한 빨리 알기 위해 스트리밍
+    try:
+        stream = await prompts.create_response(
+            message,
+            tools=tool_router.select_tools(message, auth.role(authorization)),
+            stream=True,
+        )
+    except ModelUnavailable:
+        yield _sse("message", await _degraded_reply(session, message, authorization))
+        return
+    response = None
+    notified = False
+    async for event in stream:
+        if event.type == "response.output_item.added":
+            if event.item.type in ("tool_call", "function_call") and not notified:
+                notified = True
+                yield _sse("status", {"message": "처리 중"})
+        elif event.type == "response.completed":
+            response = event.response
+        elif event.type in ("response.failed", "error"):
+            yield _sse("error", {"reply": "응답 생성에 실패했습니다. 잠시 후 다시 시도해주세요."})
+            return
+
+    tool_calls = collect_tool_calls(response.output) if response is not None else []
+
+    if tool_calls:
+        yield _sse("message", await run_tool_calls(tool_calls, message, authorization, session))
+        return
+
+    count = count_natural_turn(session)
+    reply = natural_reply_text(count)
+    if reply is not None:
+        yield _sse("message", {"reply": reply})
+        return
+
+    # 1️⃣ 1번째: 일반 대화 → 가드레일 답변을 토큰 단위로 스트리밍
+    try:
+        guard_stream = await prompts.create_response(
+            message,
+            tools=tool_router.select_tools(message, auth.role(authorization)),
+            instruction=prompts.GUARD_INSTRUCTION,
+            stream=True,
+        )
+    except ModelUnavailable:
+        yield _sse("message", {"reply": DEGRADED_REPLY})
+        return
+    async for event in guard_stream:
+        if event.type == "response.output_text.delta":
+            yield _sse("delta", {"text": event.delta})
+
+
+@app.get("/metrics")
+async def metrics():
+    """라우터 내부 최적화 경로의 동작 지표"""
+    return {
+        "fast_path": fast_path.stats(),
+        "openai": openai_client.stats(),
+        "tool_router": tool_router.stats(),
+        "tools": tool_registry.stats(),
+        "tool_schema": tool_schema.stats(),
+        "prompt_cache": prompts.stats(),
+        "model_router": model_router.stats(),
+        "hedging": hedging.stats(),
+        "sessions": session_store.stats(),
+        "auth": auth.stats(),
+        "usage": usage_ledger.totals(),
+        "offtopic": offtopic.stats(),
+        "log": log.stats(),
+        "result_cache": result_cache.stats(),
+        "single_flight": single_flight.stats(),
+    }
+
+
+@app.get("/admin/usage")
+async def admin_usage(
+    user: str | None = None,
+    top: int = 20,
+    x_admin_token: str | None = Header(default=None),
+):
+    """
+    모델 사용량 장부 조회 (X-Admin-Token 헤더 필요)
+    - user 없음: 전체 합계 + 토큰 사용량 상위 사용자
+    - user=<사용자 키>: 해당 사용자 누적값
+    """
+    if not ADMIN_API_TOKEN or not hmac.compare_digest(x_admin_token or "", ADMIN_API_TOKEN):
+        return _json({"error": "forbidden"}, 403)
+
+    if user is not None:
+        usage = usage_ledger.user_usage(user)
+        if usage is None:
+            return _json({"error": "not found"}, 404)
+        return _json({"user": user, "usage": usage})
+
+    return _json({
+        "total": usage_ledger.totals(),
+        "top_users": usage_ledger.top_users(max(1, min(top, 200))),
+    })
@@ -0,0 +1,186 @@
+# app/model_router.py
+"""
+모델 단계 라우팅 (작은 모델 먼저, 필요할 때만 큰 모델)
+
+    0단계: fast_path (규칙, 모델 호출 없음) - main.py에서 먼저 처리
+    1단계: SMALL_MODEL - 인텐트 판단 + 인자 채우기
+    2단계: LARGE_MODEL - 아래 경우에만 올린다(escalation)
+        - 메시지가 길거나 여러 작업이 섞여 보이면 1단계를 건너뛰고 바로 2단계
+        - 1단계가 tool call을 2개 이상 냈거나, SIMPLE_TOOLS 밖의 tool을 골랐거나,
+          인자가 JSON이 아니거나 필수 인자가 빠졌을 때
+        - 1단계가 tool call 없이 답했는데 메시지에 금액/가계부 키워드가 있을 때
+
+설정(환경변수)
+- MODEL_ROUTER_MODE           : single(기본, 항상 LARGE_MODEL) | tiered
+- MODEL_ROUTER_SMALL_MODEL    : 기본 gpt-5-nano
+- MODEL_ROUTER_LARGE_MODEL    : 기본 gpt-5-mini
+- MODEL_ROUTER_MAX_SIMPLE_LEN : 이보다 긴 메시지는 바로 2단계 (기본 60자)
+- MODEL_PRICE_<모델명>        : "입력,캐시입력,출력" 1M 토큰당 USD (예: MODEL_PRICE_GPT_5_NANO=0.05,0.005,0.4)
+"""
+from __future__ import annotations
+import json
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app import prompts
+from app.amount_parser import find_amounts
+from app.fast_path import EXPENSE_KEYWORDS, INCOME_KEYWORDS
+from app.tool_schema import ACTIVE_TOOLS
+
+ROUTER_MODE = os.getenv("MODEL_ROUTER_MODE", "single")
+SMALL_MODEL = os.getenv("MODEL_ROUTER_SMALL_MODEL", "gpt-5-nano")
+LARGE_MODEL = os.getenv("MODEL_ROUTER_LARGE_MODEL", prompts.MODEL)
+MAX_SIMPLE_LEN = int(os.getenv("MODEL_ROUTER_MAX_SIMPLE_LEN", "60"))
+
+# 작은 모델에게 맡겨도 되는 단일 단계 tool
+SIMPLE_TOOLS = {
+    "create_expense", "create_income",
+    "list_expenses", "list_incomes",
+    "get_expense_summary", "get_income_summary", "get_top_expense_category",
+    "delete_latest_transaction",
+}
+
+# 여러 작업을 한 번에 요청하는 표현 ("지출이랑 수입", "기록하고 알려줘")
+_MULTI_STEP = re.compile(r"그리고|하고|이랑|랑\s|및|,|\n|다음에|그다음")
+
+_LEDGER_WORDS = [w for words in (*EXPENSE_KEYWORDS.values(), *INCOME_KEYWORDS.values()) for w in words] + [
+    "지출", "수입", "내역", "기록", "가계부", "삭제", "수정",
+]
+
+# 1M 토큰당 USD (입력, 캐시된 입력, 출력)
+_DEFAULT_PRICES: Dict[str, Tuple[float, float, float]] = {
+    "gpt-5-nano": (0.05, 0.005, 0.40),
+    "gpt-5-mini": (0.25, 0.025, 2.00),
+    "gpt-5": (1.25, 0.125, 10.00),
+}
+
+_REQUIRED: Dict[str, List[str]] = {
+    t["name"]: t.get("parameters", {}).get("required", []) for t in ACTIVE_TOOLS
+}
+
+_STATS: Dict[str, Any] = {
+    "turns": 0,
+    "escalated": 0,
+    "direct_large": 0,
+    "escalation_reasons": {},
+    "tiers": {},
+}
+
+
+def _price(model: str) -> Tuple[float, float, float]:
+    raw = os.getenv("MODEL_PRICE_" + re.sub(r"[^A-Za-z0-9]", "_", model).upper())
+    if raw:
+        try:
+            values = tuple(float(v) for v in raw.split(","))
+            if len(values) == 3:
+                return values  # type: ignore[return-value]
+        except ValueError:
+            pass
+    return _DEFAULT_PRICES.get(model, (0.0, 0.0, 0.0))
+
+
+def estimate_cost(model: str, usage) -> float:
+    """usage로 호출 비용(USD)을 추정한다. 캐시된 입력 토큰은 할인 가격으로 계산한다."""
+    if usage is None:
+        return 0.0
+    input_tokens = getattr(usage, "input_tokens", 0) or 0
+    output_tokens = getattr(usage, "output_tokens", 0) or 0
+    cached = getattr(getattr(usage, "input_tokens_details", None), "cached_tokens", 0) or 0
+    price_in, price_cached, price_out = _price(model)
+    return ((input_tokens - cached) * price_in + cached * price_cached + output_tokens * price_out) / 1_000_000
+
+
+def record_call(tier: str, model: str, seconds: float, response) -> None:
+    bucket = _STATS["tiers"].setdefault(tier, {
+        "model": model, "calls": 0, "seconds": 0.0,
+        "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0,
+    })
+    usage = getattr(response, "usage", None)
+    bucket["calls"] += 1
+    bucket["seconds"] += seconds
+    bucket["input_tokens"] += getattr(usage, "input_tokens", 0) or 0
+    bucket["output_tokens"] += getattr(usage, "output_tokens", 0) or 0
+    bucket["cost_usd"] += estimate_cost(model, usage)
+
+
+def _looks_multi_step(message: str) -> bool:
+    return len(message) > MAX_SIMPLE_LEN or bool(_MULTI_STEP.search(message))
+
+
+def escalation_reason(message: str, response) -> Optional[str]:
+    """작은 모델 결과를 그대로 써도 되면 None, 아니면 큰 모델로 올리는 이유를 반환한다."""
+    calls = [item for item in response.output if getattr(item, "type", None) in ("tool_call", "function_call")]
+
+    if not calls:
+        if find_amounts(message) or any(w in message for w in _LEDGER_WORDS):
+            return "missed_tool"
+        return None
+
+    if len(calls) > 1:
+        return "multi_call"
+
+    name = getattr(calls[0], "name", None)
+    if name not in SIMPLE_TOOLS:
+        return "complex_tool"
+
+    try:
+        args = json.loads(getattr(calls[0], "arguments", None) or "{}")
+    except (TypeError, ValueError):
+        return "bad_arguments"
+    if not isinstance(args, dict) or any(args.get(k) in (None, "") for k in _REQUIRED.get(name, [])):
+        return "missing_arguments"
+    return None
+
+
+async def _call(tier: str, model: str, message: str, tools: List[Dict[str, Any]]):
+    started = time.perf_counter()
+    response = await prompts.create_response(message, tools=tools, model=model)
+    record_call(tier, model, time.perf_counter() - started, response)
+    return response
+
+
+async def respond(message: str, tools: List[Dict[str, Any]]):
+    """/chat Step 1 모델 호출. MODEL_ROUTER_MODE에 따라 단계별로 호출한다."""
+    if ROUTER_MODE != "tiered":
+        return await _call("large", LARGE_MODEL, message, tools)
+
+    _STATS["turns"] += 1
+    if _looks_multi_step(message):
+        _STATS["direct_large"] += 1
+        return await _call("large", LARGE_MODEL, message, tools)
+
+    response = await _call("small", SMALL_MODEL, message, tools)
+    reason = escalation_reason(message, response)
+    if reason is None:
+        return response
+
+    _STATS["escalated"] += 1
+    reasons = _STATS["escalation_reasons"]
+    reasons[reason] = reasons.get(reason, 0) + 1
+    return await _call("large", LARGE_MODEL, message, tools)
+
+
+def stats() -> Dict[str, Any]:
+    tiers = {}
+    for tier, b in _STATS["tiers"].items():
+        calls = b["calls"]
+        tiers[tier] = {
+            "model": b["model"],
+            "calls": calls,
+            "avg_ms": round(b["seconds"] / calls * 1000, 1) if calls else None,
+            "input_tokens": b["input_tokens"],
+            "output_tokens": b["output_tokens"],
+            "cost_usd": round(b["cost_usd"], 6),
+        }
+    small_turns = _STATS["turns"] - _STATS["direct_large"]
+    return {
+        "mode": ROUTER_MODE,
+        "turns": _STATS["turns"],
+        "direct_large": _STATS["direct_large"],
+        "escalated": _STATS["escalated"],
+        "escalation_rate": round(_STATS["escalated"] / small_turns, 4) if small_turns else 0.0,
+        "escalation_reasons": dict(_STATS["escalation_reasons"]),
+        "tiers": tiers,
+    }
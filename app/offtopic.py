@@ -0,0 +1,186 @@
+# app/offtopic.py
+"""
+가계부와 무관한 메시지(잡담) 로컬 분류기 - 글자 n-gram 나이브 베이즈
+
+모델 호출 없이 "가계부와 무관" 여부를 확률로 판단한다.
+확신도가 OFFTOPIC_THRESHOLD 이상이면 main.py가 모델을 부르지 않고 자연어 카운트만 올린다.
+
+- 학습 데이터: {"text": "...", "label": "ledger" | "offtopic"} 한 줄씩 (jsonl)
+  data/offtopic_seed.jsonl을 시작점으로, 운영 트래픽에서 라벨링한 문장을 덧붙여 다시 학습한다.
+- 모델 파일은 시작 시 한 번 읽는다. 파일이 없으면 분류기는 꺼진 상태로 동작한다.
+
+    python -m app.offtopic train data/offtopic_seed.jsonl [-o data/offtopic_model.json]
+    python -m app.offtopic predict "오늘 날씨 어때"
+
+설정(환경변수)
+- OFFTOPIC_ENABLED    : 1(기본) | 0
+- OFFTOPIC_MODEL_PATH : 모델 파일 경로 (기본 data/offtopic_model.json)
+- OFFTOPIC_THRESHOLD  : 이 확률 이상일 때만 잡담으로 처리 (기본 0.99, 나이브 베이즈는 확률이 극단적으로 나오는 편)
+"""
+from __future__ import annotations
+import argparse
+import json
+import math
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.amount_parser import find_amounts
+from app.fast_path import EXPENSE_KEYWORDS, INCOME_KEYWORDS
+
+OFFTOPIC_ENABLED = os.getenv("OFFTOPIC_ENABLED", "1") == "1"
+MODEL_PATH = os.getenv("OFFTOPIC_MODEL_PATH", "data/offtopic_model.json")
+THRESHOLD = float(os.getenv("OFFTOPIC_THRESHOLD", "0.99"))
+
+LEDGER = "ledger"
+OFFTOPIC = "offtopic"
+NGRAM_RANGE = (1, 3)
+
+# 이런 말이 있으면 분류기 결과와 상관없이 모델에 맡긴다 (잘못 막는 것을 막기 위한 안전장치)
+_LEDGER_HINTS = [w for words in (*EXPENSE_KEYWORDS.values(), *INCOME_KEYWORDS.values()) for w in words] + [
+    "지출", "수입", "내역", "가계부", "예산", "삭제", "수정", "게시", "댓글", "공지", "로그인", "회원",
+]
+
+_MODEL: Optional[Dict[str, Any]] = None
+_STATS: Dict[str, Any] = {"predictions": 0, "gated": 0, "skipped_hint": 0, "seconds": 0.0}
+
+
+def ngrams(text: str) -> List[str]:
+    s = " " + " ".join(text.lower().split()) + " "
+    grams = []
+    for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1):
+        grams.extend(s[i:i + n] for i in range(len(s) - n + 1))
+    return grams
+
+
+def train(samples: Iterable[Tuple[str, str]]) -> Dict[str, Any]:
+    """(문장, 라벨) 목록으로 다항 나이브 베이즈 모델(dict)을 만든다."""
+    counts: Dict[str, Counter] = {LEDGER: Counter(), OFFTOPIC: Counter()}
+    docs: Counter = Counter()
+    for text, label in samples:
+        if label not in counts:
+            continue
+        counts[label].update(ngrams(text))
+        docs[label] += 1
+
+    vocab = set(counts[LEDGER]) | set(counts[OFFTOPIC])
+    total_docs = sum(docs.values()) or 1
+    return {
+        "ngram_range": list(NGRAM_RANGE),
+        "vocab_size": len(vocab),
+        "priors": {label: math.log((docs[label] + 1) / (total_docs + 2)) for label in counts},
+        "totals": {label: sum(c.values()) for label, c in counts.items()},
+        "counts": {label: dict(c) for label, c in counts.items()},
+        "docs": dict(docs),
+    }
+
+
+def predict(text: str, model: Optional[Dict[str, Any]] = None) -> Tuple[str, float]:
+    """(라벨, 확률)을 반환한다. 모델이 없으면 (ledger, 0.0)"""
+    model = model or _MODEL
+    if model is None:
+        return LEDGER, 0.0
+
+    vocab = model["vocab_size"] + 1
+    scores = {}
+    grams = ngrams(text)
+    for label, counts in model["counts"].items():
+        denom = model["totals"][label] + vocab
+        score = model["priors"][label]
+        for g in grams:
+            score += math.log((counts.get(g, 0) + 1) / denom)
+        scores[label] = score
+
+    best = max(scores, key=scores.get)
+    # log-sum-exp로 확률 정규화
+    top = scores[best]
+    total = sum(math.exp(s - top) for s in scores.values())
+    return best, 1.0 / total
+
+
+def load_model(path: str = MODEL_PATH) -> bool:
+    """모델 파일을 읽는다. 없거나 깨졌으면 분류기를 끈 상태로 둔다."""
+    global _MODEL
+    try:
+        with open(path, encoding="utf-8") as f:
+            _MODEL = json.load(f)
+    except (OSError, ValueError):
+        _MODEL = None
+    return _MODEL is not None
+
+
+def is_offtopic(message: str) -> bool:
+    """확신도가 THRESHOLD 이상인 잡담이면 True"""
+    if not OFFTOPIC_ENABLED or _MODEL is None:
+        return False
+    if find_amounts(message) or any(w in message for w in _LEDGER_HINTS):
+        _STATS["skipped_hint"] += 1
+        return False
+
+    started = time.perf_counter()
+    label, confidence = predict(message)
+    _STATS["seconds"] += time.perf_counter() - started
+    _STATS["predictions"] += 1
+
+    if label == OFFTOPIC and confidence >= THRESHOLD:
+        _STATS["gated"] += 1
+        return True
+    return False
+
+
+def stats() -> Dict[str, Any]:
+    predictions = _STATS["predictions"]
+    return {
+        "enabled": OFFTOPIC_ENABLED and _MODEL is not None,
+        "threshold": THRESHOLD,
+        "predictions": predictions,
+        "gated": _STATS["gated"],
+        "skipped_hint": _STATS["skipped_hint"],
+        "gate_rate": round(_STATS["gated"] / predictions, 4) if predictions else 0.0,
+        "avg_predict_us": round(_STATS["seconds"] / predictions * 1e6, 1) if predictions else None,
+    }
+
+
+def _read_samples(path: str) -> List[Tuple[str, str]]:
+    samples = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+            samples.append((row["text"], row["label"]))
+    return samples
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.offtopic")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_train = sub.add_parser("train", help="jsonl 학습 데이터로 모델 파일을 만든다")
+    p_train.add_argument("data", nargs="+")
+    p_train.add_argument("-o", "--output", default=MODEL_PATH)
+
+    p_predict = sub.add_parser("predict", help="문장을 분류한다")
+    p_predict.add_argument("text")
+    p_predict.add_argument("-m", "--model", default=MODEL_PATH)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "train":
+        samples = [s for path in args.data for s in _read_samples(path)]
+        model = train(samples)
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(model, f, ensure_ascii=False)
+        print(f"trained on {len(samples)} samples {model['docs']} → {args.output}")
+    else:
+        if not load_model(args.model):
+            raise SystemExit(f"model not found: {args.model}")
+        label, confidence = predict(args.text)
+        print(f"{label}\t{confidence:.4f}")
+
+
+if __name__ == "__main__":
+    main()
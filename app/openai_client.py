@@ -0,0 +1,112 @@
+# app/openai_client.py
+"""
+OpenAI 클라이언트 + 서킷 브레이커
+
+- OPENAI_API_KEY가 없으면 client는 None이고 브레이커는 항상 열린 상태다.
+  서버는 그대로 뜨고, /chat은 규칙 기반(degraded) 모드로만 동작한다.
+- 모델 호출이 연속으로 OPENAI_BREAKER_FAILURES번 실패(타임아웃/연결 오류/429/5xx)하면
+  브레이커를 열고 OPENAI_BREAKER_COOLDOWN초 동안 모델을 호출하지 않는다.
+  그 뒤 시험 호출 1건이 성공하면 다시 닫는다.
+
+설정(환경변수)
+- OPENAI_TIMEOUT          : 호출 1건 제한 시간(초, 기본 20)
+- OPENAI_MAX_RETRIES      : SDK 재시도 횟수 (기본 1)
+- OPENAI_BREAKER_FAILURES : 브레이커를 여는 연속 실패 수 (기본 5)
+- OPENAI_BREAKER_COOLDOWN : 열린 뒤 다시 시도하기까지 대기(초, 기본 30)
+"""
+import os
+import time
+from typing import Any, Dict
+
+from dotenv import load_dotenv
+
+import openai
+from openai import AsyncOpenAI
+
+load_dotenv()
+
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "20"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "1"))
+BREAKER_FAILURES = int(os.getenv("OPENAI_BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN = float(os.getenv("OPENAI_BREAKER_COOLDOWN", "30"))
+
+# /chat는 async 핸들러이므로 이벤트 루프를 막지 않는 AsyncOpenAI를 사용한다.
+client = (
+    AsyncOpenAI(api_key=OPENAI_API_KEY, timeout=OPENAI_TIMEOUT, max_retries=OPENAI_MAX_RETRIES)
+    if OPENAI_API_KEY
+    else None
+)
+
+
+class ModelUnavailable(Exception):
+    """키가 없거나 브레이커가 열려 있어서 모델을 호출할 수 없을 때"""
+
+
+_BREAKER: Dict[str, Any] = {
+    "state": "closed",       # closed | open | half_open
+    "failures": 0,           # 연속 실패 수
+    "opened_at": 0.0,
+    "trial_running": False,  # half_open 상태에서 시험 호출이 진행 중인지
+}
+
+_STATS: Dict[str, int] = {"success": 0, "failure": 0, "rejected": 0, "opened": 0}
+
+
+def is_available() -> bool:
+    """지금 모델을 호출해도 되는지 (브레이커가 닫혔거나 시험 호출 차례면 True)"""
+    if client is None:
+        return False
+    if _BREAKER["state"] == "closed":
+        return True
+    if _BREAKER["state"] == "open" and time.monotonic() - _BREAKER["opened_at"] >= BREAKER_COOLDOWN:
+        _BREAKER["state"] = "half_open"
+    return _BREAKER["state"] == "half_open" and not _BREAKER["trial_running"]
+
+
+def before_call() -> None:
+    """모델 호출 직전에 부른다. 호출할 수 없으면 ModelUnavailable."""
+    if not is_available():
+        _STATS["rejected"] += 1
+        raise ModelUnavailable("no api key" if client is None else "circuit open")
+    if _BREAKER["state"] == "half_open":
+        _BREAKER["trial_running"] = True
+
+
+def record_success() -> None:
+    _STATS["success"] += 1
+    _BREAKER.update(state="closed", failures=0, trial_running=False)
+
+
+def record_failure() -> None:
+    _STATS["failure"] += 1
+    _BREAKER["failures"] += 1
+    _BREAKER["trial_running"] = False
+    if _BREAKER["state"] == "half_open" or _BREAKER["failures"] >= BREAKER_FAILURES:
+        if _BREAKER["state"] != "open":
+            _STATS["opened"] += 1
+        _BREAKER.update(state="open", opened_at=time.monotonic())
+
+
+def release_trial() -> None:
+    """브레이커와 무관한 오류(400 등)로 끝난 시험 호출의 자리를 돌려준다."""
+    _BREAKER["trial_running"] = False
+
+
+def is_breaker_error(e: BaseException) -> bool:
+    """서비스 상태 문제로 보는 오류 (요청 자체가 잘못된 400류는 제외)"""
+    if isinstance(e, (openai.APITimeoutError, openai.APIConnectionError, TimeoutError)):
+        return True
+    if isinstance(e, openai.APIStatusError):
+        return e.status_code == 429 or e.status_code >= 500
+    return False
+
+
+def stats() -> Dict[str, Any]:
+    is_available()  # 쿨다운이 지났으면 half_open으로 바꿔서 보여준다
+    return {
+        "configured": client is not None,
+        "state": "no_api_key" if client is None else _BREAKER["state"],
+        "consecutive_failures": _BREAKER["failures"],
+        **_STATS,
+    }
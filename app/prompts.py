@@ -0,0 +1,142 @@
+# app/prompts.py
+"""
+모델 입력 조립 + 프롬프트 캐시 적중률 기록
+
+OpenAI는 요청 앞부분(tools + system 프롬프트)이 이전 요청과 바이트 단위로 같을 때
+그 구간을 캐시해서 다시 쓴다. 그래서 모든 라우터 호출은 여기서 입력을 만든다.
+
+    [tools] [system: SYSTEM_PROMPT] [system: 호출별 지시문(선택)] [user: 메시지]
+
+- SYSTEM_PROMPT는 모든 호출에서 같은 문자열이다. 호출마다 다른 지시(가드레일, 수정 JSON 추출)는
+  그 뒤에 별도 메시지로 붙인다.
+- 사용자 메시지는 항상 마지막에 둔다.
+- prompt_cache_key는 tool 묶음마다 고정된 값이라, 같은 묶음을 쓰는 요청이 같은 캐시로 모인다.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from app import hedging
+from app import openai_client
+from app import usage_ledger
+from app.openai_client import ModelUnavailable, client
+
+MODEL = "gpt-5-mini"
+
+SYSTEM_PROMPT = "항상 한국어로만 답변해. 필요하면 함수(tool)를 호출해서 작업을 수행해."
+
+# 첫 번째 자연어(가계부 외) 입력에 대한 가드레일 답변
+GUARD_INSTRUCTION = "가계부와 관련된 이야기만 해."
+
+# 수정 컨펌 단계에서 규칙 추출이 실패했을 때 모델로 JSON을 뽑는 지시문
+UPDATE_EXTRACT_INSTRUCTION = (
+    "사용자의 메시지에서 '번호', '날짜', '금액', '메모' 정보를 JSON으로 추출하세요. "
+    "날짜는 반드시 YYYY-MM-DD 형식으로, 금액은 숫자로, 메모는 문자열로. "
+    "예: {'candidateIndex': 1, 'newData': {'date':'2026-01-25','amount':1800,'memo':'과자'}}"
+)
+
+_CACHE_KEYS: Dict[int, str] = {}
+
+_USAGE: Dict[str, int] = {
+    "calls": 0,
+    "input_tokens": 0,
+    "cached_tokens": 0,
+    "cache_hit_calls": 0,
+}
+
+
+def build_input(message: str, instruction: Optional[str] = None) -> List[Dict[str, str]]:
+    """고정 prefix → (호출별 지시문) → 사용자 메시지 순서로 input을 만든다."""
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+    if instruction:
+        messages.append({"role": "system", "content": instruction})
+    messages.append({"role": "user", "content": message})
+    return messages
+
+
+def cache_key(tools: List[Dict[str, Any]]) -> str:
+    """tool 묶음(+system 프롬프트)마다 고정된 prompt_cache_key"""
+    key = id(tools)  # tool_router는 같은 조합에 항상 같은 list 객체를 돌려준다
+    if key not in _CACHE_KEYS:
+        raw = json.dumps([SYSTEM_PROMPT, tools], ensure_ascii=False, sort_keys=True)
+        _CACHE_KEYS[key] = "chatrouter-" + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+    return _CACHE_KEYS[key]
+
+
+def record_usage(response, model: str = MODEL, seconds: float = 0.0) -> None:
+    """응답의 usage에서 입력 토큰 / 캐시된 입력 토큰 수를 누적하고 사용량 장부에 남긴다."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    usage_ledger.record_call(model, usage, seconds)
+    details = getattr(usage, "input_tokens_details", None)
+    cached = getattr(details, "cached_tokens", 0) or 0
+
+    _USAGE["calls"] += 1
+    _USAGE["input_tokens"] += getattr(usage, "input_tokens", 0) or 0
+    _USAGE["cached_tokens"] += cached
+    if cached:
+        _USAGE["cache_hit_calls"] += 1
+
+
+async def create_response(
+    message: str,
+    tools: List[Dict[str, Any]],
+    instruction: Optional[str] = None,
+    model: str = MODEL,
+    **kwargs: Any,
+):
+    """
+    라우터의 모든 모델 호출 진입점. 모델을 쓸 수 없으면 ModelUnavailable을 던진다.
+    stream=True면 이벤트를 그대로 넘겨주는 async iterator를 돌려주고,
+    response.completed 이벤트가 지나갈 때 사용량을 기록한다.
+    """
+    def call():
+        return client.responses.create(
+            model=model,
+            input=build_input(message, instruction),
+            tools=tools,
+            prompt_cache_key=cache_key(tools),
+            **kwargs,
+        )
+
+    # 키가 없거나 브레이커가 열려 있으면 ModelUnavailable
+    openai_client.before_call()
+    started = time.perf_counter()
+    try:
+        if kwargs.get("stream"):
+            response = await call()
+        else:
+            # 스트림이 아닌 호출은 늦어지면 한 번 더 보낸다 (LLM_HEDGE_ENABLED)
+            response = await hedging.run(call)
+    except BaseException as e:
+        if openai_client.is_breaker_error(e):
+            openai_client.record_failure()
+            raise ModelUnavailable(str(e)) from e
+        openai_client.release_trial()
+        raise
+    openai_client.record_success()
+
+    if kwargs.get("stream"):
+        return _recorded_stream(response, model, started)
+    record_usage(response, model, time.perf_counter() - started)
+    return response
+
+
+async def _recorded_stream(stream, model: str, started: float):
+    async for event in stream:
+        if event.type == "response.completed":
+            record_usage(event.response, model, time.perf_counter() - started)
+        yield event
+
+
+def stats() -> Dict[str, Any]:
+    input_tokens = _USAGE["input_tokens"]
+    calls = _USAGE["calls"]
+    return {
+        **_USAGE,
+        "cached_token_ratio": round(_USAGE["cached_tokens"] / input_tokens, 4) if input_tokens else 0.0,
+        "cache_hit_rate": round(_USAGE["cache_hit_calls"] / calls, 4) if calls else 0.0,
+    }
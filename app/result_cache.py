@@ -0,0 +1,125 @@
+# app/result_cache.py
+"""
+조회 tool 결과 캐시 (사용자별, TTL + LRU)
+
+"이번 달 지출 얼마야", "최근 지출 보여줘"처럼 같은 조회가 반복되면 백엔드 왕복 없이
+직전 결과를 돌려준다.
+
+- 키: (사용자, tool 이름, 정규화한 인자, 오늘 날짜). 사용자는 auth.user_key (같은 사용자의 다른 토큰도 같은 사용자)
+  '이번 달', '오늘' 같은 기준이 날짜에 따라 바뀌므로 오늘 날짜를 키에 넣는다.
+- 같은 사용자가 쓰기 tool(등록/삭제/수정)을 실행하면 그 사용자의 캐시를 모두 지운다.
+- 전체 항목 수는 RESULT_CACHE_MAX_ENTRIES를 넘지 않는다 (오래 안 쓴 것부터 제거).
+- 어떤 tool을 캐시하고(cacheable) 어떤 tool이 캐시를 비우는지(writes)는 tool_registry 메타데이터를 따른다.
+
+설정(환경변수)
+- RESULT_CACHE_ENABLED     : 1(기본) | 0
+- RESULT_CACHE_TTL         : 초 단위 유효 시간 (기본 60)
+- RESULT_CACHE_MAX_ENTRIES : 최대 항목 수 (기본 2048)
+"""
+from __future__ import annotations
+import itertools
+import json
+import os
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Optional, Set, Tuple
+
+CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "1") == "1"
+TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL", "60"))
+MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "2048"))
+
+CacheKey = Tuple[str, str, str, str]
+
+# key -> (만료 시각, 결과)
+_ENTRIES: "OrderedDict[CacheKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+# 사용자 -> 그 사용자의 key 목록 (무효화용)
+_USER_KEYS: Dict[str, Set[CacheKey]] = {}
+# 사용자별 마지막 쓰기 번호. 조회 도중 쓰기가 끼어들면 그 조회 결과는 저장하지 않는다.
+# 번호는 전체에서 하나씩 늘어나므로, 오래된 사용자를 지웠다가(0) 다시 쓰기가 와도 예전 번호와 겹치지 않는다.
+# (지워진 뒤 끝난 조회는 번호가 달라 저장하지 않을 뿐이다) 최대 MAX_ENTRIES명만 LRU로 유지한다.
+_GENERATIONS: "OrderedDict[str, int]" = OrderedDict()
+_NEXT_GENERATION = itertools.count(1)
+
+_STATS: Dict[str, int] = {"hit": 0, "miss": 0, "expired": 0, "evicted": 0, "invalidated": 0}
+
+
+def make_key(user: str, tool_name: str, arguments: Dict[str, Any]) -> CacheKey:
+    """'message'와 빈 값은 결과에 영향이 없으므로 빼고 인자를 정규화한다."""
+    args = {
+        k: v for k, v in arguments.items()
+        if k != "message" and v not in (None, "")
+    }
+    normalized = json.dumps(args, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return user, tool_name, normalized, date.today().isoformat()
+
+
+def generation(user: str) -> int:
+    return _GENERATIONS.get(user, 0)
+
+
+def get(key: CacheKey) -> Optional[Dict[str, Any]]:
+    entry = _ENTRIES.get(key)
+    if entry is None:
+        _STATS["miss"] += 1
+        return None
+
+    expires_at, result = entry
+    if expires_at < time.monotonic():
+        _remove(key)
+        _STATS["expired"] += 1
+        _STATS["miss"] += 1
+        return None
+
+    _ENTRIES.move_to_end(key)
+    _STATS["hit"] += 1
+    return dict(result)
+
+
+def put(key: CacheKey, result: Dict[str, Any], read_generation: int) -> None:
+    """성공한 결과만, 조회 시작 이후 같은 사용자의 쓰기가 없었을 때만 저장한다."""
+    user = key[0]
+    if not result.get("ok") or generation(user) != read_generation:
+        return
+
+    _ENTRIES[key] = (time.monotonic() + TTL_SECONDS, dict(result))
+    _ENTRIES.move_to_end(key)
+    _USER_KEYS.setdefault(user, set()).add(key)
+
+    while len(_ENTRIES) > MAX_ENTRIES:
+        oldest = next(iter(_ENTRIES))
+        _remove(oldest)
+        _STATS["evicted"] += 1
+
+
+def invalidate_user(user: str) -> None:
+    _GENERATIONS[user] = next(_NEXT_GENERATION)
+    _GENERATIONS.move_to_end(user)
+    while len(_GENERATIONS) > MAX_ENTRIES:
+        _GENERATIONS.popitem(last=False)
+    for key in _USER_KEYS.pop(user, set()):
+        if _ENTRIES.pop(key, None) is not None:
+            _STATS["invalidated"] += 1
+
+
+def _remove(key: CacheKey) -> None:
+    _ENTRIES.pop(key, None)
+    keys = _USER_KEYS.get(key[0])
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del _USER_KEYS[key[0]]
+
+
+def stats() -> Dict[str, Any]:
+    lookups = _STATS["hit"] + _STATS["miss"]
+    return {
+        "enabled": CACHE_ENABLED,
+        **_STATS,
+        "hit_rate": round(_STATS["hit"] / lookups, 4) if lookups else 0.0,
+        "entries": len(_ENTRIES),
+        "users": len(_USER_KEYS),
+        "tracked_writers": len(_GENERATIONS),
+        "max_entries": MAX_ENTRIES,
+        "ttl_seconds": TTL_SECONDS,
+    }
@@ -0,0 +1,277 @@
+# app/session_record.py
+"""
+대화 세션 레코드 (메모리를 적게 쓰는 세션 dict 대체)
+
+세션이 수십만 개 쌓이면 dict 자체와, 백엔드 409 응답의 후보(candidate) dict가
+(number/date/amount/memo/category 키를 항목마다 반복) RSS의 대부분을 차지한다.
+
+- SessionRecord: 알려진 세션 필드를 __slots__로 갖는 레코드. dict처럼 쓴다
+  (get / [] / pop / setdefault / in / update / clear). 모르는 키는 _extra dict에 둔다.
+- Candidate: 후보 1건 = 튜플 (번호, 날짜 ordinal, 금액 int, 메모, 카테고리).
+  c["date"]처럼 키로 읽으면 원래 값("2026-01-25" 등)을 돌려준다.
+- UsageRecord: 세션별 모델 사용량 (usage_ledger) 누적값
+
+JSON으로 내보낼 때(to_dict)는 후보를 [번호, ordinal, 금액, 메모, 카테고리] 리스트로 쓴다.
+재시작용 스냅숏(to_snapshot / from_snapshot)은 필드 순서대로의 튜플이다.
+"""
+from __future__ import annotations
+import sys
+from collections.abc import MutableMapping
+from operator import attrgetter
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from app.usage_ledger import USAGE_FIELDS
+
+CANDIDATE_KEYS = ("pending_delete_candidates", "pending_update_candidates")
+
+SESSION_FIELDS = (
+    "natural_count",
+    "blocked",
+    "block_notified",
+    "pending_action",
+    "pending_tx_type",
+    "pending_delete_candidates",
+    "pending_update_candidates",
+    "pending_at",
+    "usage",
+)
+_FIELD_SET = frozenset(SESSION_FIELDS)
+
+_MISSING: Any = object()
+
+
+def _intern(value: Any) -> Any:
+    # 카테고리/메모는 같은 문자열이 세션마다 반복된다
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Candidate(tuple):
+    """삭제/수정 후보 1건 (번호, 날짜 ordinal, 금액, 메모, 카테고리)"""
+
+    __slots__ = ()
+
+    FIELDS = ("number", "date", "amount", "memo", "category")
+    _INDEX = {name: i for i, name in enumerate(FIELDS)}
+
+    @classmethod
+    def from_value(cls, value: Any) -> "Candidate":
+        """백엔드 응답의 후보 dict 또는 to_dict()가 만든 리스트로부터"""
+        if isinstance(value, Candidate):
+            return value
+        if isinstance(value, dict):
+            value = [value.get(name) for name in cls.FIELDS]
+        number, day, amount, memo, category = value
+        if isinstance(day, str):
+            try:
+                day = date.fromisoformat(day).toordinal()
+            except ValueError:
+                pass  # 형식이 다르면 문자열 그대로 둔다
+        if isinstance(amount, str):
+            try:
+                amount = int(amount)
+            except ValueError:
+                pass
+        return tuple.__new__(cls, (number, day, amount, _intern(memo), _intern(category)))
+
+    def __getitem__(self, key: Any) -> Any:
+        if not isinstance(key, str):
+            return tuple.__getitem__(self, key)
+        try:
+            value = tuple.__getitem__(self, self._INDEX[key])
+        except KeyError:
+            raise KeyError(key) from None
+        if key == "date" and isinstance(value, int):
+            return date.fromordinal(value).isoformat()
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: self[name] for name in self.FIELDS}
+
+
+def compact_candidates(candidates: Optional[Iterable[Any]]) -> Tuple[Candidate, ...]:
+    return tuple(Candidate.from_value(c) for c in candidates or ())
+
+
+class UsageRecord:
+    """세션별 모델 사용량 누적값. usage_ledger가 ledger["turns"] += 1 처럼 쓴다."""
+
+    __slots__ = ("turns",) + USAGE_FIELDS
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None) -> None:
+        for name in self.__slots__:
+            setattr(self, name, 0)
+        self.model_seconds = 0.0
+        if data:
+            for name, value in data.items():
+                self[name] = value
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, UsageRecord):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def to_tuple(self) -> Tuple[Any, ...]:
+        return _USAGE_GETTER(self)
+
+    @classmethod
+    def from_tuple(cls, values: Tuple[Any, ...]) -> "UsageRecord":
+        usage = object.__new__(cls)
+        for name, value in zip(cls.__slots__, values):
+            setattr(usage, name, value)
+        return usage
+
+    def __repr__(self) -> str:
+        return f"UsageRecord({self.to_dict()})"
+
+
+class SessionRecord(MutableMapping):
+    """세션 1개. dict와 같은 방식으로 읽고 쓴다."""
+
+    __slots__ = SESSION_FIELDS + ("_extra",)
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None) -> None:
+        for name in self.__slots__:
+            object.__setattr__(self, name, _MISSING)
+        if data:
+            for key, value in data.items():
+                self[key] = value
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SessionRecord":
+        return cls(data)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+        else:
+            extra = self._extra
+            value = _MISSING if extra is _MISSING else extra.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _FIELD_SET:
+            if key in CANDIDATE_KEYS:
+                value = compact_candidates(value)
+            elif key == "usage" and not isinstance(value, UsageRecord):
+                value = UsageRecord(value)
+            setattr(self, key, value)
+            return
+        if self._extra is _MISSING:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _FIELD_SET:
+            if getattr(self, key) is _MISSING:
+                raise KeyError(key)
+            setattr(self, key, _MISSING)
+            return
+        if self._extra is _MISSING or key not in self._extra:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for name in SESSION_FIELDS:
+            if getattr(self, name) is not _MISSING:
+                yield name
+        if self._extra is not _MISSING:
+            yield from list(self._extra)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]  # type: ignore[index]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            self[key] = default
+            return self[key]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON으로 저장할 수 있는 dict (후보는 리스트, 날짜는 ordinal)"""
+        data: Dict[str, Any] = {}
+        for key in self:
+            value = self[key]
+            if key in CANDIDATE_KEYS:
+                value = [list(c) for c in value]
+            elif isinstance(value, UsageRecord):
+                value = value.to_dict()
+            data[key] = value
+        return data
+
+    def to_snapshot(self) -> Tuple[Any, ...]:
+        """
+        스냅숏(marshal)용 튜플: SESSION_FIELDS 순서의 값 + _extra. 없는 필드는 None.
+        marshal은 기본 타입만 다루므로 Candidate/UsageRecord도 튜플로 바꾼다.
+        """
+        values = [None if v is _MISSING else v for v in _SNAPSHOT_GETTER(self)]
+        for i in _CANDIDATE_INDEXES:
+            if values[i] is not None:
+                values[i] = tuple(map(tuple, values[i]))
+        if values[_USAGE_INDEX] is not None:
+            values[_USAGE_INDEX] = values[_USAGE_INDEX].to_tuple()
+        if values[-1] is not None:
+            values[-1] = dict(values[-1])  # _extra는 세션과 공유하지 않도록 복사
+        return tuple(values)
+
+    @classmethod
+    def from_snapshot(cls, values: Tuple[Any, ...]) -> "SessionRecord":
+        record = object.__new__(cls)
+        setattr_ = object.__setattr__
+        for name, value in zip(cls.__slots__, values):
+            if value is None:
+                value = _MISSING
+            elif name in CANDIDATE_KEYS:
+                value = tuple(tuple.__new__(Candidate, c) for c in value)
+            elif name == "usage":
+                value = UsageRecord.from_tuple(value)
+            setattr_(record, name, value)
+        return record
+
+    def __repr__(self) -> str:
+        return f"SessionRecord({self.to_dict()})"
+
+
+_USAGE_GETTER = attrgetter(*UsageRecord.__slots__)
+_SNAPSHOT_GETTER = attrgetter(*SessionRecord.__slots__)
+_CANDIDATE_INDEXES = tuple(SESSION_FIELDS.index(k) for k in CANDIDATE_KEYS)
+_USAGE_INDEX = SESSION_FIELDS.index("usage")
@@ -0,0 +1,837 @@
+# app/session_store.py
+"""
+대화 세션 저장소
+
+세션은 /chat 한 턴 단위로 읽고 쓴다.
+
+    session, token = await session_store.begin_turn(authorization)   # 1회 읽기
+    ... session(dict)을 그대로 수정, tool_executor는 session_store.current()로 같은 dict를 본다
+    await session_store.end_turn(token)                                # 바뀌었으면 1회 쓰기
+
+- 키는 auth.user_key: 서명을 확인한 JWT면 "sub:<subject>"(토큰이 갱신돼도 같은 세션),
+  아니면 "tok:<토큰 해시>", 없으면 "anonymous" (main.py와 tool_executor.py가 같은 세션을 보도록)
+- 세션 값은 dict처럼 쓰는 SessionRecord (session_record 참고)
+- 삭제/수정 컨펌 대기 상태(pending_*)는 SESSION_PENDING_TTL초가 지나면 그 상태만 지운다
+- SESSION_IDLE_TTL초 동안 요청이 없던 세션은 지운다
+
+저장소(SESSION_BACKEND)
+- memory(기본): 프로세스 메모리 (SessionStore). SESSION_MAX_ENTRIES를 넘으면 가장 오래 안 쓴 세션부터
+  지운다 (LRU). 만료 처리는 접근할 때 조금씩(앞에서부터) 하므로 별도 스레드가 필요 없다.
+- redis: Redis 프로토콜(RESP) 서버. 워커/파드가 여러 개여도 같은 세션을 본다.
+  세션 하나를 JSON 문자열 하나로 저장하고, 턴 시작에 GET 1번, 턴 끝에 (바뀐 경우만) SET 1번 한다.
+  키는 세션 키(auth.user_key)의 해시라 저장소에 토큰도 subject도 그대로 남지 않는다. 유휴 만료는 키 TTL로 처리한다.
+
+같은 세션의 턴은 begin_turn()~end_turn() 사이를 키별 잠금으로 감싸 한 번에 하나씩 처리한다.
+(삭제 후보 "1번"이 동시에 두 번 들어와 두 번 삭제되는 것 등을 막는다. 다른 사용자끼리는 기다리지 않는다.)
+잠금은 프로세스 안에서만 유효하다.
+
+설정(환경변수)
+- SESSION_BACKEND       : memory(기본) | redis
+- SESSION_MAX_ENTRIES   : memory 저장소 최대 세션 수 (기본 100000)
+- SESSION_IDLE_TTL      : 유휴 세션 만료(초, 기본 86400)
+- SESSION_PENDING_TTL   : 컨펌 대기 상태 만료(초, 기본 600)
+- SESSION_REDIS_URL     : redis://[:password@]host:port/db (기본 redis://localhost:6379/0)
+- SESSION_REDIS_PREFIX  : 키 접두사 (기본 chatrouter:session:)
+- SESSION_REDIS_TIMEOUT : 명령 1회 제한 시간(초, 기본 0.5)
+- SESSION_REDIS_POOL    : 유지할 연결 수 (기본 16)
+- SESSION_SNAPSHOT_PATH : memory 저장소 스냅숏 파일 (기본 data/session_snapshot.bin, 비우면 끈다)
+- SESSION_SNAPSHOT_INTERVAL : 스냅숏 주기(초, 기본 300, 0이면 종료할 때만)
+
+재시작 스냅숏 (memory 저장소만, redis는 서버가 유지한다)
+- 시작할 때 스냅숏을 읽어 세션(컨펌 대기 상태, natural_count/blocked 등)을 되살린다.
+- SESSION_SNAPSHOT_INTERVAL마다, 그리고 종료할 때(uvicorn은 SIGTERM을 받으면 lifespan 종료를 실행한다)
+  전체 세션을 marshal로 한 파일에 쓴다. 임시 파일에 쓰고 rename하므로 쓰다가 죽어도 이전 스냅숏이 남는다.
+- 워커가 여러 개면 같은 파일을 덮어쓰므로 redis 저장소를 쓴다.
+"""
+from __future__ import annotations
+import asyncio
+import gc
+import hashlib
+import json
+import logging
+import marshal
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from app import auth
+from app import log
+from app.session_record import SessionRecord
+
+BACKEND_NAME = os.getenv("SESSION_BACKEND", "memory").lower()
+MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "100000"))
+IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", str(24 * 3600)))
+PENDING_TTL = float(os.getenv("SESSION_PENDING_TTL", "600"))
+REDIS_URL = os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0")
+REDIS_PREFIX = os.getenv("SESSION_REDIS_PREFIX", "chatrouter:session:")
+REDIS_TIMEOUT = float(os.getenv("SESSION_REDIS_TIMEOUT", "0.5"))
+REDIS_POOL = int(os.getenv("SESSION_REDIS_POOL", "16"))
+SNAPSHOT_PATH = os.getenv("SESSION_SNAPSHOT_PATH", "data/session_snapshot.bin")
+SNAPSHOT_INTERVAL = float(os.getenv("SESSION_SNAPSHOT_INTERVAL", "300"))
+
+PENDING_KEYS = (
+    "pending_action",
+    "pending_delete_candidates",
+    "pending_update_candidates",
+    "pending_tx_type",
+    "pending_at",
+)
+
+# 한 번 접근할 때 정리하는 만료 세션 최대 수 (요청 하나가 오래 걸리지 않도록)
+_SWEEP_LIMIT = 64
+
+
+def session_key(auth_header: Optional[str]) -> str:
+    """Authorization 값 → 세션 키 (auth.user_key)"""
+    return auth.user_key(auth_header)
+
+
+def _store_key(key: Optional[str]) -> str:
+    return key or "anonymous"
+
+
+def expire_pending(session: Dict[str, Any], last_seen: float, now: float, pending_ttl: float = PENDING_TTL) -> bool:
+    """컨펌 대기 상태가 pending_ttl보다 오래됐으면 그 상태만 지우고 True"""
+    if not session.get("pending_action"):
+        session.pop("pending_at", None)
+        return False
+    # 컨펌 대기 상태는 직전 턴에서 만들어진다 → 직전 접근 시각을 시작 시각으로 본다
+    started = session.setdefault("pending_at", last_seen)
+    if now - started <= pending_ttl:
+        return False
+    for k in PENDING_KEYS:
+        session.pop(k, None)
+    return True
+
+
+# 스냅숏의 세션 1개 = 마지막 접근 시각(8바이트) + marshal(SessionRecord.to_snapshot())
+_LAST_SEEN = struct.Struct("<d")
+
+
+def _session_blob(last_seen: float, session: Any) -> bytes:
+    if not isinstance(session, tuple):
+        if not isinstance(session, SessionRecord):
+            session = SessionRecord(session)
+        session = session.to_snapshot()
+    try:
+        payload = marshal.dumps(session)
+    except ValueError:
+        # marshal로 쓸 수 없는 값이 _extra에 있으면 _extra만 버린다
+        payload = marshal.dumps(session[:-1] + (None,))
+    return _LAST_SEEN.pack(last_seen) + payload
+
+
+class _RestoredSessions:
+    """
+    스냅숏에서 읽은 뒤 아직 접근하지 않은 세션.
+    시작할 때 세션 100만 개짜리 dict를 만들지 않도록, 키 정렬 배열을 이진 탐색해서 찾는다.
+    - keys  : 정렬된 키
+    - blobs : keys와 같은 순서의 세션 blob (꺼내 간 자리는 None)
+    - order : 오래된 순서의 인덱스 (유휴 만료/LRU 제거용)
+    """
+
+    __slots__ = ("keys", "blobs", "order", "pos", "count")
+
+    def __init__(self, keys: Optional[List[str]] = None, blobs: Optional[List[Optional[bytes]]] = None,
+                 order: Optional[array] = None) -> None:
+        self.keys = keys or []
+        self.blobs = blobs or []
+        self.order = order if order is not None else array("I")
+        self.pos = 0
+        self.count = len(self.keys)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _index(self, key: str) -> int:
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key and self.blobs[i] is not None:
+            return i
+        return -1
+
+    def _drop(self, i: int) -> bytes:
+        blob = self.blobs[i]
+        self.blobs[i] = None
+        self.count -= 1
+        if not self.count:
+            self.keys, self.blobs, self.order, self.pos = [], [], array("I"), 0
+        return blob
+
+    def pop(self, key: str) -> Optional[list]:
+        """[마지막 접근 시각, 세션 튜플]을 꺼낸다"""
+        i = self._index(key)
+        if i < 0:
+            return None
+        blob = self._drop(i)
+        return [_LAST_SEEN.unpack_from(blob)[0], marshal.loads(memoryview(blob)[_LAST_SEEN.size:])]
+
+    def discard(self, key: str) -> bool:
+        i = self._index(key)
+        if i < 0:
+            return False
+        self._drop(i)
+        return True
+
+    def _front(self) -> int:
+        while self.blobs[self.order[self.pos]] is None:
+            self.pos += 1
+        return self.order[self.pos]
+
+    def oldest_last_seen(self) -> float:
+        return _LAST_SEEN.unpack_from(self.blobs[self._front()])[0]
+
+    def pop_oldest(self) -> None:
+        self._drop(self._front())
+
+    def items(self) -> List[Tuple[str, bytes]]:
+        """(key, blob) 목록, 오래된 것이 앞"""
+        keys, blobs = self.keys, self.blobs
+        return [(keys[i], blobs[i]) for i in self.order[self.pos:] if blobs[i] is not None]
+
+
+class SessionStore(MutableMapping):
+    def __init__(
+        self,
+        max_entries: int = MAX_ENTRIES,
+        idle_ttl: float = IDLE_TTL,
+        pending_ttl: float = PENDING_TTL,
+    ) -> None:
+        self.max_entries = max_entries
+        self.idle_ttl = idle_ttl
+        self.pending_ttl = pending_ttl
+        # key -> [마지막 접근 시각, 세션 dict]  (오래된 것이 앞)
+        self._entries: "OrderedDict[str, list]" = OrderedDict()
+        # 스냅숏에서 복원된 뒤 아직 접근하지 않은 세션 (모두 _entries보다 오래됐다). 접근하면 _entries로 옮긴다.
+        self._restored = _RestoredSessions()
+        self._stats: Dict[str, int] = {
+            "created": 0,
+            "evicted_lru": 0,
+            "expired_idle": 0,
+            "expired_pending": 0,
+        }
+
+    def _entry(self, key: str) -> Optional[list]:
+        entry = self._entries.get(key)
+        if entry is None and self._restored:
+            entry = self._restored.pop(key)
+            if entry is not None:
+                self._entries[key] = entry
+        return entry
+
+    def _oldest_last_seen(self) -> float:
+        if self._restored:
+            return self._restored.oldest_last_seen()
+        return next(iter(self._entries.values()))[0]
+
+    def _pop_oldest(self) -> None:
+        if self._restored:
+            self._restored.pop_oldest()
+        else:
+            self._entries.popitem(last=False)
+
+    def _touch(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entry(key)
+        if entry is None:
+            return None
+        now = time.time()
+        last_seen, session = entry
+        if now - last_seen > self.idle_ttl:
+            del self._entries[key]
+            self._stats["expired_idle"] += 1
+            return None
+        if type(session) is tuple:
+            # 스냅숏에서 복원된 뒤 처음 접근하는 세션
+            session = entry[1] = SessionRecord.from_snapshot(session)
+        if expire_pending(session, last_seen, now, self.pending_ttl):
+            self._stats["expired_pending"] += 1
+        entry[0] = now
+        self._entries.move_to_end(key)
+        return session
+
+    def _sweep(self) -> None:
+        now = time.time()
+        swept = 0
+        while len(self) and swept < _SWEEP_LIMIT:
+            if now - self._oldest_last_seen() <= self.idle_ttl:
+                break
+            self._pop_oldest()
+            self._stats["expired_idle"] += 1
+            swept += 1
+        while len(self) > self.max_entries:
+            self._pop_oldest()
+            self._stats["evicted_lru"] += 1
+
+    # --- 스냅숏 ---
+    def snapshot_items(self) -> List[Tuple[str, Any]]:
+        """
+        스냅숏에 쓸 (key, 값) 목록 (오래된 것이 앞).
+        값은 [마지막 접근 시각, 세션] 또는 아직 접근하지 않은 복원 세션의 blob(bytes, 그대로 다시 쓴다)
+        """
+        return self._restored.items() + list(self._entries.items())
+
+    def restore(self, restored: "_RestoredSessions") -> None:
+        """스냅숏에서 읽은 세션을 넣는다. 이미 있는 세션이 우선한다."""
+        for key in self._entries:
+            restored.discard(key)
+        self._restored = restored
+        self._sweep()
+
+    # --- dict 인터페이스 ---
+    def __getitem__(self, auth_header: Optional[str]) -> Dict[str, Any]:
+        session = self._touch(_store_key(auth_header))
+        if session is None:
+            raise KeyError(auth_header)
+        return session
+
+    def __setitem__(self, auth_header: Optional[str], session: Dict[str, Any]) -> None:
+        key = _store_key(auth_header)
+        entry = self._entry(key)
+        if entry is None:
+            self._stats["created"] += 1
+            self._entries[key] = [time.time(), session]
+        else:
+            entry[0], entry[1] = time.time(), session
+            self._entries.move_to_end(key)
+        self._sweep()
+
+    def __delitem__(self, auth_header: Optional[str]) -> None:
+        key = _store_key(auth_header)
+        if self._entries.pop(key, None) is None and not self._restored.discard(key):
+            raise KeyError(auth_header)
+
+    def __contains__(self, auth_header: object) -> bool:
+        return self._touch(_store_key(auth_header)) is not None  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([k for k, _ in self._restored.items()] + list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._restored)
+
+    def get(self, auth_header: Optional[str], default: Any = None) -> Any:
+        session = self._touch(_store_key(auth_header))
+        return default if session is None else session
+
+    def setdefault(self, auth_header: Optional[str], default: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        session = self._touch(_store_key(auth_header))
+        if session is None:
+            session = SessionRecord() if default is None else default
+            self[auth_header] = session
+        return session
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self),
+            "restored_untouched": len(self._restored),
+            "max_entries": self.max_entries,
+            "idle_ttl": self.idle_ttl,
+            "pending_ttl": self.pending_ttl,
+            **self._stats,
+        }
+
+
+class MemoryBackend:
+    """프로세스 메모리 저장소. load가 돌려준 dict가 곧 저장된 세션이라 save는 접근 시각만 갱신한다."""
+
+    name = "memory"
+
+    def __init__(self, store: Optional[SessionStore] = None) -> None:
+        self.store = store if store is not None else SessionStore()
+
+    async def load(self, key: str) -> Tuple[Dict[str, Any], Any]:
+        return self.store.setdefault(key), None
+
+    async def save(self, key: str, session: Dict[str, Any], state: Any) -> None:
+        self.store[key] = session
+
+    async def aclose(self) -> None:
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return self.store.stats()
+
+
+class RespError(Exception):
+    """Redis 서버가 돌려준 오류 응답 (-ERR ...)"""
+
+
+def _encode_command(args: Tuple[Any, ...]) -> bytes:
+    out = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode("utf-8")
+        elif not isinstance(arg, bytes):
+            arg = str(arg).encode("ascii")
+        out.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(out)
+
+
+async def _read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("connection closed")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest.decode("utf-8")
+    if kind == b"-":
+        return RespError(rest.decode("utf-8"))
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        size = int(rest)
+        if size < 0:
+            return None
+        return (await reader.readexactly(size + 2))[:-2]
+    if kind == b"*":
+        size = int(rest)
+        if size < 0:
+            return None
+        return [await _read_reply(reader) for _ in range(size)]
+    raise RespError(f"unexpected reply: {line[:32]!r}")
+
+
+class RespClient:
+    """
+    최소 RESP2 클라이언트 (redis 패키지 없이 세션 저장에 필요한 만큼만)
+    pipeline()은 명령 여러 개를 한 번에 보내고 응답을 한 번에 읽는다 (왕복 1회).
+    """
+
+    def __init__(self, url: str = REDIS_URL, pool_size: int = REDIS_POOL, timeout: float = REDIS_TIMEOUT) -> None:
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int((parsed.path or "/0").lstrip("/") or 0)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self.round_trips = 0
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        setup: List[Tuple[Any, ...]] = []
+        if self.password:
+            setup.append(("AUTH", self.username, self.password) if self.username else ("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            for reply in await self._round_trip(reader, writer, setup):
+                if isinstance(reply, RespError):
+                    writer.close()
+                    raise reply
+        return reader, writer
+
+    async def _round_trip(self, reader, writer, commands) -> List[Any]:
+        writer.write(b"".join(_encode_command(c) for c in commands))
+        await writer.drain()
+        self.round_trips += 1
+        return [await _read_reply(reader) for _ in commands]
+
+    async def _pipeline(self, commands: List[Tuple[Any, ...]]) -> List[Any]:
+        conn = self._idle.pop() if self._idle else await self._connect()
+        try:
+            replies = await self._round_trip(*conn, commands)
+        except BaseException:
+            # 응답을 다 못 읽은 연결은 재사용할 수 없다
+            conn[1].close()
+            raise
+        if len(self._idle) < self.pool_size:
+            self._idle.append(conn)
+        else:
+            conn[1].close()
+        return replies
+
+    async def pipeline(self, *commands: Tuple[Any, ...]) -> List[Any]:
+        replies = await asyncio.wait_for(self._pipeline(list(commands)), self.timeout)
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    async def execute(self, *args: Any) -> Any:
+        return (await self.pipeline(args))[0]
+
+    async def aclose(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+_LOAD_FAILED = object()
+
+
+class RedisBackend:
+    """
+    Redis 프로토콜 저장소. 세션 = JSON 문자열 1개 (+ 마지막 접근 시각 "_seen").
+    load: GET + EXPIRE(유휴 TTL 연장)를 한 번에 보낸다.
+    save: 읽었을 때와 내용이 같으면 보내지 않는다. 읽기에 실패한 턴은 덮어쓰지 않는다.
+    """
+
+    name = "redis"
+
+    def __init__(self, client: Optional[RespClient] = None, prefix: str = REDIS_PREFIX,
+                 idle_ttl: float = IDLE_TTL, pending_ttl: float = PENDING_TTL) -> None:
+        self.client = client if client is not None else RespClient()
+        self.prefix = prefix
+        self.idle_ttl = max(1, int(idle_ttl))
+        self.pending_ttl = pending_ttl
+        self._stats: Dict[str, Any] = {
+            "loads": 0, "saves": 0, "skipped_saves": 0, "errors": 0,
+            "expired_pending": 0, "seconds": 0.0,
+        }
+
+    def _key(self, key: str) -> str:
+        return self.prefix + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+    def _error(self, op: str, e: BaseException) -> None:
+        self._stats["errors"] += 1
+        log.event("session_store_error", level=logging.WARNING, op=op, error=type(e).__name__, detail=str(e))
+
+    async def load(self, key: str) -> Tuple[Dict[str, Any], Any]:
+        started = time.perf_counter()
+        try:
+            raw, _ = await self.client.pipeline(("GET", self._key(key)), ("EXPIRE", self._key(key), self.idle_ttl))
+        except (OSError, RespError, asyncio.TimeoutError) as e:
+            self._error("load", e)
+            return SessionRecord(), _LOAD_FAILED
+        finally:
+            self._stats["seconds"] += time.perf_counter() - started
+        self._stats["loads"] += 1
+        try:
+            session = json.loads(raw) if raw is not None else None
+        except ValueError as e:
+            # 깨진 값은 새 세션으로 덮어쓴다
+            self._error("decode", e)
+            session = None
+        if not isinstance(session, dict):
+            return SessionRecord(), None
+        last_seen = session.pop("_seen", time.time())
+        session = SessionRecord.from_dict(session)
+        if expire_pending(session, last_seen, time.time(), self.pending_ttl):
+            self._stats["expired_pending"] += 1
+        return session, raw
+
+    async def save(self, key: str, session: Dict[str, Any], state: Any) -> None:
+        if state is _LOAD_FAILED:
+            return
+        if state is not None and _same_session(state, session):
+            self._stats["skipped_saves"] += 1
+            return
+        raw = json.dumps({**session.to_dict(), "_seen": time.time()}, ensure_ascii=False, separators=(",", ":"))
+        started = time.perf_counter()
+        try:
+            await self.client.execute("SET", self._key(key), raw, "EX", self.idle_ttl)
+            self._stats["saves"] += 1
+        except (OSError, RespError, asyncio.TimeoutError) as e:
+            self._error("save", e)
+        finally:
+            self._stats["seconds"] += time.perf_counter() - started
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self._stats["loads"] + self._stats["saves"]
+        return {
+            **{k: v for k, v in self._stats.items() if k != "seconds"},
+            "round_trips": self.client.round_trips,
+            "avg_ms": round(self._stats["seconds"] / calls * 1000, 3) if calls else None,
+        }
+
+
+def _same_session(raw: bytes, session: SessionRecord) -> bool:
+    stored = json.loads(raw)
+    stored.pop("_seen", None)
+    return stored == session.to_dict()
+
+
+def make_backend(name: str = BACKEND_NAME):
+    if name == "redis":
+        return RedisBackend()
+    if name != "memory":
+        raise ValueError(f"unknown SESSION_BACKEND: {name}")
+    return MemoryBackend()
+
+
+backend = make_backend()
+
+class KeyedLock:
+    """
+    키별 asyncio.Lock. 기다리거나 잡고 있는 코루틴이 없어지면 그 키의 Lock도 지운다 (참조 수 관리).
+    사용자끼리는 서로 기다리지 않는다.
+    """
+
+    def __init__(self) -> None:
+        # key -> [Lock, 참조 수]
+        self._locks: Dict[str, list] = {}
+        self._stats: Dict[str, Any] = {"acquired": 0, "contended": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+
+    async def acquire(self, key: str) -> None:
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        lock = entry[0]
+        if not lock.locked():
+            await lock.acquire()
+            self._stats["acquired"] += 1
+            return
+        started = time.perf_counter()
+        try:
+            await lock.acquire()
+        except BaseException:
+            self._unref(key, entry)
+            raise
+        waited = time.perf_counter() - started
+        self._stats["acquired"] += 1
+        self._stats["contended"] += 1
+        self._stats["wait_seconds"] += waited
+        self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], waited)
+
+    def release(self, key: str) -> None:
+        entry = self._locks[key]
+        entry[0].release()
+        self._unref(key, entry)
+
+    def _unref(self, key: str, entry: list) -> None:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._locks[key]
+
+    def stats(self) -> Dict[str, Any]:
+        contended = self._stats["contended"]
+        return {
+            "active_keys": len(self._locks),
+            "acquired": self._stats["acquired"],
+            "contended": contended,
+            "avg_wait_ms": round(self._stats["wait_seconds"] / contended * 1000, 3) if contended else None,
+            "max_wait_ms": round(self._stats["max_wait_seconds"] * 1000, 3),
+        }
+
+
+# 같은 세션의 턴은 한 번에 하나씩 (읽기 → 수정 → 저장이 겹치지 않도록). 프로세스 안에서만 유효하다.
+_LOCKS = KeyedLock()
+
+# 지금 처리 중인 턴의 [key, session, backend 상태]
+_CURRENT: ContextVar[Optional[list]] = ContextVar("session_turn", default=None)
+
+
+async def begin_turn(auth_header: Optional[str]):
+    """
+    턴 시작: 세션 잠금을 잡고 세션을 한 번 읽어서 현재 턴에 묶는다. (session, token)을 반환한다.
+    token은 반드시 end_turn()에 넘겨야 잠금이 풀린다.
+    """
+    key = session_key(auth_header)
+    await _LOCKS.acquire(key)
+    try:
+        session, state = await backend.load(key)
+    except BaseException:
+        _LOCKS.release(key)
+        raise
+    turn = [key, session, state]
+    return session, (_CURRENT.set(turn), turn)
+
+
+async def end_turn(token) -> None:
+    """턴 끝: 세션을 한 번 저장하고 잠금과 현재 턴을 푼다."""
+    context_token, turn = token
+    try:
+        _CURRENT.reset(context_token)
+    except ValueError:
+        # 스트림 generator가 다른 컨텍스트에서 정리되는 경우
+        _CURRENT.set(None)
+    try:
+        await backend.save(*turn)
+    finally:
+        _LOCKS.release(turn[0])
+
+
+def in_turn(auth_header: Optional[str]) -> bool:
+    """지금 컨텍스트가 이 세션의 턴 안인지 (잠금을 이미 잡고 있는지)"""
+    turn = _CURRENT.get()
+    return turn is not None and turn[0] == session_key(auth_header)
+
+
+def current(auth_header: Optional[str]) -> Dict[str, Any]:
+    """
+    이번 턴의 세션 dict. tool_executor처럼 턴 안에서 세션을 쓰는 코드는 이것을 그대로 수정하면
+    end_turn()에서 함께 저장된다. 턴 밖에서 불리면 memory 저장소의 세션을 쓴다.
+    """
+    key = session_key(auth_header)
+    turn = _CURRENT.get()
+    if turn is not None and turn[0] == key:
+        return turn[1]
+    if isinstance(backend, MemoryBackend):
+        return backend.store.setdefault(key)
+    return SessionRecord()
+
+
+_SNAPSHOT_MAGIC = b"CRSESS1\n"
+_SNAPSHOT_STATS: Dict[str, Any] = {
+    "saved": 0, "errors": 0, "last_sessions": 0, "last_bytes": 0, "last_seconds": 0.0,
+    "restored": 0, "restore_seconds": 0.0,
+}
+
+
+def _encode_snapshot(items: List[Tuple[str, Any]]) -> bytes:
+    """
+    (saved_at, 정렬된 키, 키 순서의 blob, 오래된 순서의 인덱스(uint32 배열)) 를 marshal로 쓴다.
+    복원은 marshal.loads 한 번으로 끝나고, 세션은 처음 접근할 때 풀린다.
+    """
+    keys = [key for key, _ in items]
+    blobs = [value if isinstance(value, bytes) else _session_blob(*value) for _, value in items]
+    by_key = sorted(range(len(keys)), key=keys.__getitem__)
+    order = array("I", bytes(4 * len(keys)))
+    for sorted_index, age_index in enumerate(by_key):
+        order[age_index] = sorted_index
+    payload = marshal.dumps((
+        time.time(),
+        [keys[i] for i in by_key],
+        [blobs[i] for i in by_key],
+        order.tobytes(),
+    ))
+    return _SNAPSHOT_MAGIC + payload
+
+
+# 주기 스냅숏이 쓰는 중에 종료 스냅숏이 시작돼도 순서대로 쓰도록 (나중 것이 남는다)
+_SNAPSHOT_WRITE_LOCK = threading.Lock()
+
+
+def write_snapshot(items: List[Tuple[str, Any]], path: str) -> int:
+    """스냅숏 파일을 원자적으로 쓴다 (임시 파일 → fsync → rename). 쓴 바이트 수를 반환한다."""
+    with _SNAPSHOT_WRITE_LOCK:
+        data = _encode_snapshot(items)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return len(data)
+
+
+def read_snapshot(path: str) -> _RestoredSessions:
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(_SNAPSHOT_MAGIC):
+        raise ValueError("not a session snapshot")
+    _, keys, blobs, order_bytes = marshal.loads(memoryview(data)[len(_SNAPSHOT_MAGIC):])
+    order = array("I")
+    order.frombytes(order_bytes)
+    if not (len(keys) == len(blobs) == len(order)):
+        raise ValueError("corrupt session snapshot")
+    return _RestoredSessions(keys, blobs, order)
+
+
+def _snapshot_enabled() -> bool:
+    return bool(SNAPSHOT_PATH) and isinstance(backend, MemoryBackend)
+
+
+# 세션을 튜플로 뜨는 동안 이 개수마다 이벤트 루프에 양보한다
+_FREEZE_CHUNK = 5000
+
+
+async def _frozen_items() -> List[Tuple[str, Any]]:
+    """
+    이벤트 루프에서 세션마다 to_snapshot() 튜플을 떠 둔다.
+    스레드에서 직렬화하는 동안 요청 처리가 세션을 바꿔도 반쯤 바뀐 세션이 파일에 들어가지 않는다.
+    (세션 단위로 일관되며, 큰 저장소에서 루프를 오래 막지 않도록 _FREEZE_CHUNK마다 양보한다)
+    """
+    frozen: List[Tuple[str, Any]] = []
+    for i, (key, value) in enumerate(backend.store.snapshot_items(), 1):
+        if not isinstance(value, bytes):
+            last_seen, session = value
+            if not isinstance(session, tuple):
+                if not isinstance(session, SessionRecord):
+                    session = SessionRecord(session)
+                session = session.to_snapshot()
+            value = (last_seen, session)
+        frozen.append((key, value))
+        if i % _FREEZE_CHUNK == 0:
+            await asyncio.sleep(0)
+    return frozen
+
+
+async def save_snapshot(path: str = SNAPSHOT_PATH) -> None:
+    """memory 저장소 전체를 스냅숏으로 쓴다. 세션 튜플은 루프에서 뜨고, marshal/파일 쓰기는 스레드에서 한다."""
+    if not _snapshot_enabled():
+        return
+    started = time.perf_counter()
+    try:
+        items = await _frozen_items()
+        size = await asyncio.to_thread(write_snapshot, items, path)
+    except Exception as e:
+        _SNAPSHOT_STATS["errors"] += 1
+        log.event("session_snapshot_error", level=logging.WARNING, path=path, error=type(e).__name__, detail=str(e))
+        return
+    elapsed = time.perf_counter() - started
+    _SNAPSHOT_STATS.update(last_sessions=len(items), last_bytes=size, last_seconds=elapsed)
+    _SNAPSHOT_STATS["saved"] += 1
+    log.event("session_snapshot", sessions=len(items), bytes=size, seconds=round(elapsed, 4))
+
+
+def restore_snapshot(path: str = SNAPSHOT_PATH) -> int:
+    """시작할 때 부른다. 되살린 세션 수를 반환한다 (파일이 없거나 깨졌으면 0)."""
+    if not _snapshot_enabled():
+        return 0
+    started = time.perf_counter()
+    # 수백만 개의 튜플/리스트를 한 번에 만드는 동안 순환 GC가 반복해서 도는 것을 막는다
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        restored = read_snapshot(path)
+        backend.store.restore(restored)
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError, EOFError, TypeError) as e:
+        _SNAPSHOT_STATS["errors"] += 1
+        log.event("session_snapshot_error", level=logging.WARNING, path=path, error=type(e).__name__, detail=str(e))
+        return 0
+    finally:
+        if gc_enabled:
+            gc.enable()
+    elapsed = time.perf_counter() - started
+    _SNAPSHOT_STATS.update(restored=len(restored), restore_seconds=elapsed)
+    log.event("session_restore", sessions=len(restored), seconds=round(elapsed, 4))
+    return len(restored)
+
+
+async def snapshot_loop(interval: float = SNAPSHOT_INTERVAL) -> None:
+    """SESSION_SNAPSHOT_INTERVAL마다 스냅숏을 쓴다 (lifespan에서 task로 띄운다)."""
+    if interval <= 0 or not _snapshot_enabled():
+        return
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await save_snapshot()
+        except Exception as e:
+            # 한 번 실패해도 다음 주기에 다시 쓴다
+            _SNAPSHOT_STATS["errors"] += 1
+            log.event("session_snapshot_error", level=logging.ERROR, error=type(e).__name__, detail=str(e))
+
+
+async def aclose() -> None:
+    await backend.aclose()
+
+
+def stats() -> Dict[str, Any]:
+    data = {"backend": backend.name, **backend.stats(), "locks": _LOCKS.stats()}
+    if _snapshot_enabled():
+        data["snapshot"] = {
+            k: round(v, 4) if isinstance(v, float) else v for k, v in _SNAPSHOT_STATS.items()
+        }
+    return data
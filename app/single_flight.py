@@ -0,0 +1,130 @@
+# app/single_flight.py
+"""
+같은 요청 합치기 (single-flight)
+
+더블탭/클라이언트 재시도로 같은 사용자의 같은 메시지가 짧은 간격으로 여러 번 들어오면
+- 처리 중인 요청이 있으면 새로 처리하지 않고 그 결과를 같이 기다린다.
+- 방금 끝난 요청이면 SINGLE_FLIGHT_REPLAY_MS 동안은 그 결과를 그대로 돌려준다.
+그래서 모델 호출과 쓰기 tool(등록/삭제 등)이 두 번 실행되지 않는다.
+
+설정(환경변수)
+- SINGLE_FLIGHT_ENABLED   : 1(기본) | 0
+- SINGLE_FLIGHT_REPLAY_MS : 끝난 결과를 재사용하는 시간 (기본 2000ms, 0이면 처리 중인 요청만 합친다)
+"""
+from __future__ import annotations
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app import auth
+
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "1") == "1"
+REPLAY_SECONDS = int(os.getenv("SINGLE_FLIGHT_REPLAY_MS", "2000")) / 1000
+MAX_REPLAY_ENTRIES = 4096
+
+FlightKey = Tuple[str, str]
+
+_INFLIGHT: Dict[FlightKey, asyncio.Future] = {}
+# key -> (만료 시각, 결과)
+_RECENT: "OrderedDict[FlightKey, Tuple[float, Any]]" = OrderedDict()
+
+_STATS: Dict[str, int] = {"leader": 0, "coalesced": 0, "replayed": 0, "takeover": 0}
+
+# leader가 취소됐을 때 기다리던 호출에 넘기는 값
+_LEADER_GONE: Any = object()
+
+
+def make_key(auth_header: Optional[str], message: str) -> FlightKey:
+    """사용자는 auth.user_key로 구분하고, 공백 차이만 있는 메시지는 같은 요청으로 본다."""
+    return auth.user_key(auth_header), " ".join(message.split())
+
+
+def _recent_result(key: FlightKey) -> Tuple[bool, Any]:
+    entry = _RECENT.get(key)
+    if entry is None:
+        return False, None
+    expires_at, result = entry
+    if expires_at < time.monotonic():
+        del _RECENT[key]
+        return False, None
+    return True, result
+
+
+def _remember(key: FlightKey, result: Any) -> None:
+    if REPLAY_SECONDS <= 0:
+        return
+    _RECENT[key] = (time.monotonic() + REPLAY_SECONDS, result)
+    _RECENT.move_to_end(key)
+    now = time.monotonic()
+    # 만료된 것과 한도를 넘는 것은 오래된 순서로 정리한다
+    while _RECENT:
+        oldest_key, (expires_at, _) = next(iter(_RECENT.items()))
+        if expires_at >= now and len(_RECENT) <= MAX_REPLAY_ENTRIES:
+            break
+        del _RECENT[oldest_key]
+
+
+async def run(key: FlightKey, func: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    key가 같은 호출은 func를 한 번만 실행하고 결과를 나눠 갖는다.
+    func가 예외를 내면 기다리던 호출도 같은 예외를 받고, 그 결과는 재사용하지 않는다.
+    처리하던 쪽(leader)이 취소되면(연결 끊김 등) 기다리던 호출 중 하나가 이어서 func를 실행한다.
+    """
+    if not SINGLE_FLIGHT_ENABLED:
+        return await func()
+
+    while True:
+        found, result = _recent_result(key)
+        if found:
+            _STATS["replayed"] += 1
+            return result
+
+        inflight = _INFLIGHT.get(key)
+        if inflight is None:
+            return await _lead(key, func)
+
+        _STATS["coalesced"] += 1
+        # 기다리던 쪽 연결이 끊겨도 처리 중인 요청은 취소되지 않도록 shield
+        result = await asyncio.shield(inflight)
+        if result is not _LEADER_GONE:
+            return result
+        # leader가 취소됐다 → 처음부터 다시 (먼저 깨어난 쪽이 leader가 되고 나머지는 그 결과를 기다린다)
+        _STATS["coalesced"] -= 1
+        _STATS["takeover"] += 1
+
+
+async def _lead(key: FlightKey, func: Callable[[], Awaitable[Any]]) -> Any:
+    _STATS["leader"] += 1
+    future = asyncio.get_running_loop().create_future()
+    _INFLIGHT[key] = future
+    try:
+        result = await func()
+    except asyncio.CancelledError:
+        # 공유 future를 취소하면 기다리던 호출까지 모두 실패하므로, 다시 실행하라고만 알린다
+        future.set_result(_LEADER_GONE)
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        # 기다리는 쪽이 없을 때 'exception was never retrieved' 경고가 나지 않게 한다
+        future.exception()
+        raise
+    else:
+        future.set_result(result)
+        _remember(key, result)
+        return result
+    finally:
+        _INFLIGHT.pop(key, None)
+
+
+def stats() -> Dict[str, Any]:
+    total = _STATS["leader"] + _STATS["coalesced"] + _STATS["replayed"]
+    return {
+        "enabled": SINGLE_FLIGHT_ENABLED,
+        **_STATS,
+        "dedup_rate": round((total - _STATS["leader"]) / total, 4) if total else 0.0,
+        "inflight": len(_INFLIGHT),
+        "replay_entries": len(_RECENT),
+        "replay_ms": int(REPLAY_SECONDS * 1000),
+    }
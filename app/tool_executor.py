@@ -1,804 +1,912 @@
 # app/tool_executor.py
 from __future__ import annotations
+import asyncio
 from typing import Any, Dict, Optional
 
-from app import backend_api
+from app import auth
+from app import backend_api_async as backend_api
+from app import result_cache
+from app import session_store
+from app import tool_registry
+from app.tool_registry import tool
 
-auth_sessions: Dict[str, Dict[str, Any]] = {}
-
-def execute_tool_call(tool_name: str, arguments: Dict[str, Any], auth_header: Optional[str]) -> Dict[str, Any]:
+async def execute_tool_call(tool_name: str, arguments: Dict[str, Any], auth_header: Optional[str]) -> Dict[str, Any]:
     """
     모델이 요청한 tool call을 실제 '백엔드 REST API'로 실행하고 결과를 dict로 반환한다.
+    백엔드 호출은 backend_api_async(httpx.AsyncClient)로 수행하므로 await 해서 사용한다.
     auth_header: Backend가 Router로 전달한 "Authorization: Bearer <JWT>" 값
+
+    tool은 tool_registry에서 이름으로 찾는다. 조회 tool(cacheable)은 사용자별 결과 캐시(result_cache)를 먼저 보고,
+    쓰기 tool(writes)을 실행하면 그 사용자의 캐시를 비운다.
+
+    /chat 턴 밖에서 불리면 이 호출 하나를 세션 턴(잠금 + 읽기/저장)으로 감싼다.
     """
+    if not session_store.in_turn(auth_header):
+        _, token = await session_store.begin_turn(auth_header)
+        try:
+            return await execute_tool_call(tool_name, arguments, auth_header)
+        finally:
+            await session_store.end_turn(token)
+
+    if not result_cache.CACHE_ENABLED or not auth_header:
+        return await _execute_tool_call(tool_name, arguments, auth_header)
+
+    user = auth.user_key(auth_header)
+    spec = tool_registry.get(tool_name)
+    if spec is not None and spec.cacheable:
+        key = result_cache.make_key(user, tool_name, arguments)
+        cached = result_cache.get(key)
+        if cached is not None:
+            return cached
+        read_generation = result_cache.generation(user)
+        result = await _execute_tool_call(tool_name, arguments, auth_header)
+        result_cache.put(key, result, read_generation)
+        return result
+
+    try:
+        return await _execute_tool_call(tool_name, arguments, auth_header)
+    finally:
+        if spec is not None and spec.writes:
+            result_cache.invalidate_user(user)
+
+
+async def _execute_tool_call(tool_name: str, arguments: Dict[str, Any], auth_header: Optional[str]) -> Dict[str, Any]:
+    spec = tool_registry.get(tool_name)
+    if spec is None:
+        return {"ok": False, "error": f"Unknown tool: {tool_name}"}
+
+    if spec.login_required:
+        login_error = require_login(auth_header)
+        if login_error:
+            return login_error
+
+    # 이번 턴의 세션 (수정하면 턴이 끝날 때 session_store가 한 번에 저장한다)
+    session = session_store.current(auth_header)
+    if spec.timeout is None:
+        return await spec.handler(arguments, auth_header, session)
+    return await asyncio.wait_for(spec.handler(arguments, auth_header, session), spec.timeout)
+
 
-    session_key = auth_header or "anonymous"
-    session = auth_sessions.get(session_key, {})
+# 삭제/수정 컨펌 (세션의 후보 목록으로 확정) - fast path/pending 흐름에서만 부르는 내부 tool
+@tool("confirm_delete_by_chat", writes=True)
+async def _confirm_delete_by_chat(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    candidates = session.get("pending_delete_candidates", [])
 
-    if tool_name == "confirm_delete_by_chat":
-        candidates = session.get("pending_delete_candidates", [])
+    user_message = arguments.get("message", "").strip()
+    selected_numbers = parse_user_selection(user_message)
 
-        user_message = arguments.get("message", "").strip()
+    # ✅ 취소/아니요 처리
+    if any(keyword in user_message for keyword in ["취소", "아니요"]):
+        session.pop("pending_action", None)
+        session.pop("pending_delete_candidates", None)
+        session.pop("pending_tx_type", None)
+        return {"ok": True, "message": "삭제가 취소되었습니다."}
+
+    # ✅ "모두" 선택 처리
+    if "모두" in user_message or "전부" in user_message:
+        selected_numbers = [c["number"] for c in candidates]
+    else:
+        # 숫자로 선택
         selected_numbers = parse_user_selection(user_message)
-        
-        # ✅ 취소/아니요 처리
-        if any(keyword in user_message for keyword in ["취소", "아니요"]):
-            session.pop("pending_action", None)
-            session.pop("pending_delete_candidates", None)
-            session.pop("pending_tx_type", None)
-            auth_sessions[session_key] = session
-            return {"ok": True, "message": "삭제가 취소되었습니다."}
-
-        # ✅ "모두" 선택 처리
-        if "모두" in user_message or "전부" in user_message:
-            selected_numbers = [c["number"] for c in candidates]
-        else:
-            # 숫자로 선택
-            selected_numbers = parse_user_selection(user_message)
-
-        if not selected_numbers:
-            session.pop("pending_action", None)
-            session.pop("pending_delete_candidates", None)
-            session.pop("pending_tx_type", None)
-            auth_sessions[session_key] = session
-            return {
-                "ok": False,
-                "message": "삭제에 실패했습니다. 처음부터 다시 시도해주세요."
-            }
-
-        selected_indexes = [
-            c["number"] for c in candidates
-            if c.get("number") in selected_numbers
-        ]
-
-        if not selected_indexes:
-            return {
-                "ok": False,
-                "message": "선택한 번호가 후보 목록에 없습니다. 다시 골라주세요. (예: 1번)"
-            }
-
-        res = backend_api.confirm_delete_by_chat(
-            auth_header=auth_header,
-            selected_indexes=selected_indexes
-        )
 
-        # 상태 정리
+    if not selected_numbers:
         session.pop("pending_action", None)
         session.pop("pending_delete_candidates", None)
         session.pop("pending_tx_type", None)
-        auth_sessions[session_key] = session
+        return {
+            "ok": False,
+            "message": "삭제에 실패했습니다. 처음부터 다시 시도해주세요."
+        }
 
-        return {"ok": True, "message": "삭제 완료"}
-    
-    if tool_name == "confirm_delete_income_by_chat":
-        candidates = session.get("pending_delete_candidates", [])
+    selected_indexes = [
+        c["number"] for c in candidates
+        if c.get("number") in selected_numbers
+    ]
 
-        user_message = arguments.get("message", "").strip()
-        selected_numbers = parse_user_selection(user_message)
+    if not selected_indexes:
+        return {
+            "ok": False,
+            "message": "선택한 번호가 후보 목록에 없습니다. 다시 골라주세요. (예: 1번)"
+        }
+
+    await backend_api.confirm_delete_by_chat(
+        auth_header=auth_header,
+        selected_indexes=selected_indexes
+    )
+
+    # 상태 정리
+    session.pop("pending_action", None)
+    session.pop("pending_delete_candidates", None)
+    session.pop("pending_tx_type", None)
+
+    return {"ok": True, "message": "삭제 완료"}
 
-        # 취소 처리
-        if any(keyword in user_message for keyword in ["취소", "아니요"]):
-            session.pop("pending_action", None)
-            session.pop("pending_delete_candidates", None)
-            session.pop("pending_tx_type", None)
-            auth_sessions[session_key] = session
-            return {"ok": True, "message": "수입 삭제가 취소되었습니다."}
-
-        # 모두 선택
-        if "모두" in user_message or "전부" in user_message:
-            selected_numbers = [c["number"] for c in candidates]
-        else:
-            selected_numbers = parse_user_selection(user_message)
-
-        if not selected_numbers:
-            session.pop("pending_action", None)
-            session.pop("pending_delete_candidates", None)
-            session.pop("pending_tx_type", None)
-            auth_sessions[session_key] = session
-            return {
-                "ok": False,
-                "message": "삭제에 실패했습니다. 처음부터 다시 시도해주세요."
-            }
-
-        selected_indexes = [
-            c["number"] for c in candidates
-            if c.get("number") in selected_numbers
-        ]
-
-        if not selected_indexes:
-            return {
-                "ok": False,
-                "message": "선택한 번호가 후보 목록에 없습니다. 다시 골라주세요. (예: 1번)"
-            }
-
-        res = backend_api.confirm_delete_income_by_chat(
-            auth_header=auth_header,
-            selected_indexes=selected_indexes
-        )
 
+@tool("confirm_delete_income_by_chat", writes=True)
+async def _confirm_delete_income_by_chat(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    candidates = session.get("pending_delete_candidates", [])
+
+    user_message = arguments.get("message", "").strip()
+    selected_numbers = parse_user_selection(user_message)
+
+    # 취소 처리
+    if any(keyword in user_message for keyword in ["취소", "아니요"]):
         session.pop("pending_action", None)
         session.pop("pending_delete_candidates", None)
         session.pop("pending_tx_type", None)
-        auth_sessions[session_key] = session
+        return {"ok": True, "message": "수입 삭제가 취소되었습니다."}
 
-        return {"ok": True, "message": "수입 삭제 완료"}
+    # 모두 선택
+    if "모두" in user_message or "전부" in user_message:
+        selected_numbers = [c["number"] for c in candidates]
+    else:
+        selected_numbers = parse_user_selection(user_message)
 
+    if not selected_numbers:
+        session.pop("pending_action", None)
+        session.pop("pending_delete_candidates", None)
+        session.pop("pending_tx_type", None)
+        return {
+            "ok": False,
+            "message": "삭제에 실패했습니다. 처음부터 다시 시도해주세요."
+        }
 
-    if tool_name == "update_expense_by_chat_confirm":
-        # 세션에서 후보 목록 가져오기
-        candidates = session.get("pending_update_candidates", [])
+    selected_indexes = [
+        c["number"] for c in candidates
+        if c.get("number") in selected_numbers
+    ]
+
+    if not selected_indexes:
+        return {
+            "ok": False,
+            "message": "선택한 번호가 후보 목록에 없습니다. 다시 골라주세요. (예: 1번)"
+        }
 
-        # 사용자 입력
-        candidate_index = arguments.get("candidateIndex")
-        new_data = arguments.get("newData", {})
+    await backend_api.confirm_delete_income_by_chat(
+        auth_header=auth_header,
+        selected_indexes=selected_indexes
+    )
 
-        user_message = arguments.get("message", "").strip()
+    session.pop("pending_action", None)
+    session.pop("pending_delete_candidates", None)
+    session.pop("pending_tx_type", None)
 
-        # ✅ 취소/아니요 처리
-        if any(keyword in user_message for keyword in ["취소", "아니요"]):
-            session.pop("pending_action", None)
-            session.pop("pending_delete_candidates", None)
-            session.pop("pending_tx_type", None)
-            auth_sessions[session_key] = session
-            return {"ok": True, "message": "수정이 취소되었습니다."}
+    return {"ok": True, "message": "수입 삭제 완료"}
 
-        # 후보 번호 없으면 바로 에러
-        if candidate_index is None:
-            return {"ok": False, "message": "수정할 후보 번호가 없습니다."}
 
-        # 후보 목록에서 선택된 후보 찾기
-        candidate = next(
-            (c for c in candidates if c["number"] == candidate_index),
-            None
-        )
+@tool("update_expense_by_chat_confirm", group="transaction", writes=True)
+async def _update_expense_by_chat_confirm(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    # 세션에서 후보 목록 가져오기
+    candidates = session.get("pending_update_candidates", [])
 
-        if not candidate:
-            return {"ok": False, "message": "선택한 번호가 후보 목록에 없습니다."}
+    # 사용자 입력
+    candidate_index = arguments.get("candidateIndex")
+    new_data = arguments.get("newData", {})
 
-        # 부분 수정: date / amount / memo만 허용
-        payload_date = new_data.get("date") or candidate["date"]
-        payload_amount = (
-            int(new_data["amount"])
-            if new_data.get("amount") is not None
-            else candidate["amount"]
-        )
-        payload_memo = new_data.get("memo") or candidate["memo"]
-
-        # ✅ confirm 호출 (Spring Boot DTO 구조에 맞게)
-        res = backend_api.confirm_update_by_chat(
-            auth_header=auth_header,
-            selected_index=candidate_index,
-            new_date=payload_date,
-            new_amount=payload_amount,
-            new_memo=payload_memo
-        )
+    user_message = arguments.get("message", "").strip()
 
-        # 세션 정리
+    # ✅ 취소/아니요 처리
+    if any(keyword in user_message for keyword in ["취소", "아니요"]):
         session.pop("pending_action", None)
-        session.pop("pending_update_candidates", None)
+        session.pop("pending_delete_candidates", None)
         session.pop("pending_tx_type", None)
-        auth_sessions[session_key] = session
+        return {"ok": True, "message": "수정이 취소되었습니다."}
+
+    # 후보 번호 없으면 바로 에러
+    if candidate_index is None:
+        return {"ok": False, "message": "수정할 후보 번호가 없습니다."}
 
-        return res
-    
-    if tool_name == "update_income_by_chat_confirm":
-        candidates = session.get("pending_update_candidates", [])
+    # 후보 목록에서 선택된 후보 찾기
+    candidate = next(
+        (c for c in candidates if c["number"] == candidate_index),
+        None
+    )
 
-        candidate_index = arguments.get("candidateIndex")
-        new_data = arguments.get("newData", {})
+    if not candidate:
+        return {"ok": False, "message": "선택한 번호가 후보 목록에 없습니다."}
 
-        user_message = arguments.get("message", "").strip()
+    # 부분 수정: date / amount / memo만 허용
+    payload_date = new_data.get("date") or candidate["date"]
+    payload_amount = (
+        int(new_data["amount"])
+        if new_data.get("amount") is not None
+        else candidate["amount"]
+    )
+    payload_memo = new_data.get("memo") or candidate["memo"]
+
+    # ✅ confirm 호출 (Spring Boot DTO 구조에 맞게)
+    res = await backend_api.confirm_update_by_chat(
+        auth_header=auth_header,
+        selected_index=candidate_index,
+        new_date=payload_date,
+        new_amount=payload_amount,
+        new_memo=payload_memo
+    )
 
-        # ✅ 취소/아니요 처리
-        if any(keyword in user_message for keyword in ["취소", "아니요"]):
-            session.pop("pending_action", None)
-            session.pop("pending_delete_candidates", None)
-            session.pop("pending_tx_type", None)
-            auth_sessions[session_key] = session
-            return {"ok": True, "message": "수정이 취소되었습니다."}
+    # 세션 정리
+    session.pop("pending_action", None)
+    session.pop("pending_update_candidates", None)
+    session.pop("pending_tx_type", None)
 
-        if candidate_index is None:
-            return {"ok": False, "message": "수정할 수입 후보 번호가 없습니다."}
+    return res
 
-        candidate = next(
-            (c for c in candidates if c["number"] == candidate_index),
-            None
-        )
 
-        if not candidate:
-            return {"ok": False, "message": "선택한 번호가 후보 목록에 없습니다."}
+@tool("update_income_by_chat_confirm", group="transaction", writes=True)
+async def _update_income_by_chat_confirm(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    candidates = session.get("pending_update_candidates", [])
 
-        payload_date = new_data.get("date") or candidate["date"]
-        payload_amount = (
-            int(new_data["amount"])
-            if new_data.get("amount") is not None
-            else candidate["amount"]
-        )
-        payload_memo = new_data.get("memo") or candidate["memo"]
-
-        res = backend_api.confirm_update_income_by_chat(
-            auth_header=auth_header,
-            selected_index=candidate_index,
-            new_date=payload_date,
-            new_amount=payload_amount,
-            new_memo=payload_memo,
-        )
+    candidate_index = arguments.get("candidateIndex")
+    new_data = arguments.get("newData", {})
 
+    user_message = arguments.get("message", "").strip()
+
+    # ✅ 취소/아니요 처리
+    if any(keyword in user_message for keyword in ["취소", "아니요"]):
         session.pop("pending_action", None)
-        session.pop("pending_update_candidates", None)
+        session.pop("pending_delete_candidates", None)
         session.pop("pending_tx_type", None)
-        auth_sessions[session_key] = session
-
-        return res
-
-
-
-
-    # transaction-controller (CRUD)
-    transaction_tools = {
-        "create_expense",
-        "create_expense_batch",
-        "create_income",
-        "create_income_batch",
-        "list_expenses",
-        "list_incomes",
-        "delete_expense",
-        "update_expense",
-        "delete_expense_by_chat",
-        "delete_income_by_chat",
-        "update_expense_by_chat",
-        "update_income_by_chat",
-        "get_expense_summary",
-        "get_income_summary",
-        "get_top_expense_category",
-        "top_expense_weekday_avg",
-        "delete_latest_transaction",
-        "update_latest_transaction",
+        return {"ok": True, "message": "수정이 취소되었습니다."}
+
+    if candidate_index is None:
+        return {"ok": False, "message": "수정할 수입 후보 번호가 없습니다."}
+
+    candidate = next(
+        (c for c in candidates if c["number"] == candidate_index),
+        None
+    )
+
+    if not candidate:
+        return {"ok": False, "message": "선택한 번호가 후보 목록에 없습니다."}
+
+    payload_date = new_data.get("date") or candidate["date"]
+    payload_amount = (
+        int(new_data["amount"])
+        if new_data.get("amount") is not None
+        else candidate["amount"]
+    )
+    payload_memo = new_data.get("memo") or candidate["memo"]
+
+    res = await backend_api.confirm_update_income_by_chat(
+        auth_header=auth_header,
+        selected_index=candidate_index,
+        new_date=payload_date,
+        new_amount=payload_amount,
+        new_memo=payload_memo,
+    )
+
+    session.pop("pending_action", None)
+    session.pop("pending_update_candidates", None)
+    session.pop("pending_tx_type", None)
+
+    return res
+
+
+# transaction-controller (CRUD)
+@tool("delete_latest_transaction", group="transaction", writes=True)
+async def _delete_latest_transaction(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    result = await backend_api.delete_latest_transaction(
+        auth_header=auth_header
+    )
+
+    if not result.get("ok"):
+        return result
+
+    return {
+        "ok": True,
+        "message": "삭제가 완료되었습니다."
     }
 
-    if tool_name == "delete_latest_transaction":
-        result = backend_api.delete_latest_transaction(
-            auth_header=auth_header
-        )
 
-        if not result.get("ok"):
-            return result
+@tool("update_latest_transaction", group="transaction", writes=True)
+async def _update_latest_transaction(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    # arguments에서 None 값 제거
+    date = arguments.get("date")
+    amount = arguments.get("amount")
+    memo = arguments.get("memo")
 
-        return {
-            "ok": True,
-            "message": "삭제가 완료되었습니다."
-        }
-    if tool_name == "update_latest_transaction":
-        # arguments에서 None 값 제거
-        date = arguments.get("date")
-        amount = arguments.get("amount")
-        memo = arguments.get("memo")
-
-        if not date or date in ["0000-01-01","0000-00-00"]:
-            date = None
-
-        if amount == 1:
-            amount = None
-
-        # 실제 바꾸고 싶은 값만 payload로 보냄
-        result = backend_api.update_latest_transaction(
-            auth_header=auth_header,
-            date=date if date is not None else None,
-            amount=amount if amount is not None else None,
-            memo=memo if memo is not None else None,
+    if not date or date in ["0000-01-01","0000-00-00"]:
+        date = None
+
+    if amount == 1:
+        amount = None
+
+    # 실제 바꾸고 싶은 값만 payload로 보냄
+    result = await backend_api.update_latest_transaction(
+        auth_header=auth_header,
+        date=date if date is not None else None,
+        amount=amount if amount is not None else None,
+        memo=memo if memo is not None else None,
+    )
+
+    if not result.get("ok"):
+        return result
+
+    tx = result["transaction"]
+
+    return {
+        "ok": True,
+        "message": (
+            f'{tx["date"]} {tx["amount"]}원 '
+            f'"{tx.get("memo", "")}" '
+            f'[{tx.get("category", "")}] 수정 완료'
         )
+    }
 
-        if not result.get("ok"):
-            return result
 
-        tx = result["transaction"]
+@tool("create_expense", group="transaction", login_required=True, writes=True)
+async def _create_expense(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.create_expense(
+        auth_header=auth_header,
+        date=arguments["date"],
+        amount=int(arguments["amount"]),
+        category=arguments["category"],
+        memo=arguments.get("memo", "")
+    )
 
-        return {
-            "ok": True,
-            "message": (
-                f'{tx["date"]} {tx["amount"]}원 '
-                f'"{tx.get("memo", "")}" '
-                f'[{tx.get("category", "")}] 수정 완료'
-            )
-        }
 
-    if tool_name in transaction_tools:
-        login_error = require_login(auth_header)
-        if login_error:
-            return login_error
+@tool("create_expense_batch", group="transaction", login_required=True, writes=True)
+async def _create_expense_batch(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    await backend_api.create_expense_batch(
+        auth_header=auth_header,
+        transactions=arguments["transactions"]
+    )
+    messages = [
+        format_transaction_reply(t)
+        for t in arguments["transactions"]
+    ]
+    return {
+        "ok": True,
+        "message": "\n".join(messages)
+    }
 
 
-    if tool_name == "create_expense":
-        return backend_api.create_expense(
-            auth_header=auth_header,
-            date=arguments["date"],
-            amount=int(arguments["amount"]),
-            category=arguments["category"],
-            memo=arguments.get("memo", "")
-        )
-    if tool_name == "create_expense_batch":
-        backend_api.create_expense_batch(
-            auth_header=auth_header,
-            transactions=arguments["transactions"]
-        )
-        messages = [
-            format_transaction_reply(t)
-            for t in arguments["transactions"]
-        ]
-        return {
-            "ok": True,
-            "message": "\n".join(messages)
-        }
-    if tool_name == "create_income":
-        return backend_api.create_income(
-            auth_header=auth_header,
-            date=arguments["date"],
-            amount=int(arguments["amount"]),
-            category=arguments["category"],
-            memo=arguments.get("memo", "")
-        )
-    if tool_name == "create_income_batch":
-        backend_api.create_income_batch(
-            auth_header=auth_header,
-            transactions=arguments["transactions"]
-        )
+@tool("create_income", group="transaction", login_required=True, writes=True)
+async def _create_income(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.create_income(
+        auth_header=auth_header,
+        date=arguments["date"],
+        amount=int(arguments["amount"]),
+        category=arguments["category"],
+        memo=arguments.get("memo", "")
+    )
 
-        messages = [
-            format_transaction_reply(t)
-            for t in arguments["transactions"]
-        ]
 
-        return {
-            "ok": True,
-            "message": "\n".join(messages)
-        }
-    if tool_name == "top_expense_weekday_avg":
-        data = backend_api.top_expense_weekday_avg(
-            auth_header=auth_header,
-            scope=arguments["scope"],
-            month=arguments.get("month"),
-            year=arguments.get("year"),
-        )
-        weekday = data.get("weekday", "")
-        avg = data.get("avgAmount", 0)
-        # scope별 안내 문구
-        if arguments["scope"] == "month":
-            m = arguments.get("month")
-            if m:
-                # YYYY-MM -> YYYY년 M월
-                y, mm = m.split("-")
-                period_label = f"{int(y)}년 {int(mm)}월"
-            else:
-                period_label = "이번 달"
-        elif arguments["scope"] == "year":
-            y = arguments.get("year")
-            period_label = f"{int(y)}년" if y else "올해"
-        else:
-            period_label = "해당 기간"
+@tool("create_income_batch", group="transaction", login_required=True, writes=True)
+async def _create_income_batch(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    await backend_api.create_income_batch(
+        auth_header=auth_header,
+        transactions=arguments["transactions"]
+    )
 
-        # 원 단위 반올림
-        try:
-            avg_int = int(round(float(avg)))
-        except Exception:
-            avg_int = 0
+    messages = [
+        format_transaction_reply(t)
+        for t in arguments["transactions"]
+    ]
 
-        return {
-            "ok": True,
-            "message": f'{period_label} 기준 평균 지출이 가장 큰 요일은 {weekday}이고, 평균 {avg_int:,}원입니다.'
-        }
-    if tool_name == "list_expenses":
-        items = backend_api.list_expenses(
-            auth_header=auth_header,
-            start=arguments.get("start", ""),
-            end=arguments.get("end", ""),
-            limit=int(arguments.get("limit", 10))
-        ).get("items", [])
-
-        # reply 문자열 생성
-        lines = [f'{t["date"]} {t["amount"]}원 "{t.get("memo","")}" [{t.get("category","")}]' for t in items]
-        reply_text = "\n".join(lines)
-        reply_text += f"\n내역 개수를 지정하지 않으면 10건이 보입니다. 최대 50건까지 조회 가능합니다"
+    return {
+        "ok": True,
+        "message": "\n".join(messages)
+    }
 
-        return {
-            "ok": True,
-            "items": items,
-            "reply": reply_text  # 여기서 항상 reply 포함
-        }
 
-    if tool_name == "list_incomes":
-        items = backend_api.list_incomes(
-            auth_header=auth_header,
-            start=arguments.get("start", ""),
-            end=arguments.get("end", ""),
-            limit=int(arguments.get("limit", 10))
-        ).get("items", [])
+@tool("top_expense_weekday_avg", group="transaction", login_required=True, read_only=True, cacheable=True)
+async def _top_expense_weekday_avg(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    data = await backend_api.top_expense_weekday_avg(
+        auth_header=auth_header,
+        scope=arguments["scope"],
+        month=arguments.get("month"),
+        year=arguments.get("year"),
+    )
+    weekday = data.get("weekday", "")
+    avg = data.get("avgAmount", 0)
+    # scope별 안내 문구
+    if arguments["scope"] == "month":
+        m = arguments.get("month")
+        if m:
+            # YYYY-MM -> YYYY년 M월
+            y, mm = m.split("-")
+            period_label = f"{int(y)}년 {int(mm)}월"
+        else:
+            period_label = "이번 달"
+    elif arguments["scope"] == "year":
+        y = arguments.get("year")
+        period_label = f"{int(y)}년" if y else "올해"
+    else:
+        period_label = "해당 기간"
 
-        lines = [f'{t["date"]} {t["amount"]}원 "{t.get("memo","")}" [{t.get("category","")}]' for t in items]
-        reply_text = "\n".join(lines)
-        reply_text += f"\n내역 개수를 지정하지 않으면 10건이 보입니다. 최대 50건까지 조회 가능합니다"
+    # 원 단위 반올림
+    try:
+        avg_int = int(round(float(avg)))
+    except Exception:
+        avg_int = 0
 
-        return {
-            "ok": True,
-            "items": items,
-            "reply": reply_text  # reply 포함
-        }
+    return {
+        "ok": True,
+        "message": f'{period_label} 기준 평균 지출이 가장 큰 요일은 {weekday}이고, 평균 {avg_int:,}원입니다.'
+    }
 
 
+@tool("list_expenses", group="transaction", login_required=True, read_only=True, cacheable=True)
+async def _list_expenses(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    items = (await backend_api.list_expenses(
+        auth_header=auth_header,
+        start=arguments.get("start", ""),
+        end=arguments.get("end", ""),
+        limit=int(arguments.get("limit", 10))
+    )).get("items", [])
+
+    # reply 문자열 생성
+    lines = [f'{t["date"]} {t["amount"]}원 "{t.get("memo","")}" [{t.get("category","")}]' for t in items]
+    reply_text = "\n".join(lines)
+    reply_text += "\n내역 개수를 지정하지 않으면 10건이 보입니다. 최대 50건까지 조회 가능합니다"
+
+    return {
+        "ok": True,
+        "items": items,
+        "reply": reply_text  # 여기서 항상 reply 포함
+    }
 
-    if tool_name == "delete_expense":
-        return backend_api.delete_expense(
-            auth_header=auth_header,
-            expense_id=int(arguments["expense_id"])
-        )
-    if tool_name == "update_expense":
-        return backend_api.update_expense(
-            auth_header=auth_header,
-            expense_id=int(arguments["expense_id"]),
-            date=arguments["date"],
-            amount=int(arguments["amount"]),
-            category=arguments["category"],
-            memo=arguments.get("memo", "")
-        )
-    
-    if tool_name == "delete_expense_by_chat":
-        result = backend_api.delete_expense_by_chat(
-            auth_header=auth_header,
-            date=arguments["date"],
-            amount=int(arguments.get("amount", 0)),
-            memo=arguments.get("memo", "")
-        )
 
-        if result.get("status") == 409:
-            candidates = result["candidates"]
+@tool("list_incomes", group="transaction", login_required=True, read_only=True, cacheable=True)
+async def _list_incomes(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    items = (await backend_api.list_incomes(
+        auth_header=auth_header,
+        start=arguments.get("start", ""),
+        end=arguments.get("end", ""),
+        limit=int(arguments.get("limit", 10))
+    )).get("items", [])
 
-            # ✅ 컨펌 단계 진입 표시
-            session["pending_action"] = "delete"
-            session["pending_delete_candidates"] = candidates
-            session["pending_tx_type"] = "EXPENSE"
-            auth_sessions[session_key] = session
+    lines = [f'{t["date"]} {t["amount"]}원 "{t.get("memo","")}" [{t.get("category","")}]' for t in items]
+    reply_text = "\n".join(lines)
+    reply_text += "\n내역 개수를 지정하지 않으면 10건이 보입니다. 최대 50건까지 조회 가능합니다"
 
-            message = "삭제 가능한 후보가 여러 개 있습니다:\n"
-            for c in candidates:
-                message += f'{c["number"]}번. {c["date"]} {c["amount"]}원 "{c["memo"]}" [{c["category"]}]\n'
-            message += "\n삭제 할 내역의 번호를 말해주세요. 모두 삭제를 원하시면 모두 삭제 또는 전부 삭제라고 입력해 주세요. 삭제할 내역이 없다면 취소 또는 아니요 라고 입력해주세요."
-            return {"ok": False, "message": message, "candidates": candidates}
+    return {
+        "ok": True,
+        "items": items,
+        "reply": reply_text  # reply 포함
+    }
 
-        session.pop("pending_action", None)
-        session.pop("pending_delete_candidates", None)
-        auth_sessions[session_key] = session
-
-        return {"ok": True, "message": "삭제 완료"}
-    if tool_name == "delete_income_by_chat":
-        result = backend_api.delete_income_by_chat(
-            auth_header=auth_header,
-            date=arguments["date"],
-            amount=int(arguments.get("amount", 0)),
-            memo=arguments.get("memo", "")
-        )
 
-        if result.get("status") == 409:
-            candidates = result["candidates"]
+@tool("delete_expense", group="transaction", login_required=True, writes=True)
+async def _delete_expense(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.delete_expense(
+        auth_header=auth_header,
+        expense_id=int(arguments["expense_id"])
+    )
 
-            session["pending_action"] = "delete"
-            session["pending_delete_candidates"] = candidates
-            session["pending_tx_type"] = "INCOME"
-            auth_sessions[session_key] = session
 
-            message = "삭제 가능한 수입 후보가 여러 개 있습니다:\n"
-            for c in candidates:
-                message += f'{c["number"]}번. {c["date"]} {c["amount"]}원 "{c["memo"]}" [{c["category"]}]\n'
-            message += "\n삭제 할 내역의 번호를 말해주세요. 모두 삭제를 원하시면 모두 삭제 또는 전부 삭제라고 입력해 주세요. 삭제할 내역이 없다면 취소 또는 아니요 라고 입력해주세요."
-            return {"ok": False, "message": message, "candidates": candidates}
+@tool("update_expense", group="transaction", login_required=True, writes=True)
+async def _update_expense(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.update_expense(
+        auth_header=auth_header,
+        expense_id=int(arguments["expense_id"]),
+        date=arguments["date"],
+        amount=int(arguments["amount"]),
+        category=arguments["category"],
+        memo=arguments.get("memo", "")
+    )
 
-        session.pop("pending_action", None)
-        session.pop("pending_delete_candidates", None)
-        auth_sessions[session_key] = session
-
-        return {"ok": True, "message": "수입 삭제 완료"}
-    if tool_name == "update_expense_by_chat":
-        session_key = auth_header or "anonymous"
-        session = auth_sessions.get(session_key, {})
-        result = backend_api.update_expense_by_chat(
-            auth_header=auth_header,
-            date=arguments.get("date", ""),
-            amount=int(arguments.get("amount", 0)),
-            memo=arguments.get("memo", "")
-        )
 
-        candidates = result.get("candidates", [])
+@tool("delete_expense_by_chat", group="transaction", login_required=True, writes=True)
+async def _delete_expense_by_chat(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    result = await backend_api.delete_expense_by_chat(
+        auth_header=auth_header,
+        date=arguments["date"],
+        amount=int(arguments.get("amount", 0)),
+        memo=arguments.get("memo", "")
+    )
 
-        if not candidates:
-            return {"ok": True, "message": "수정할 지출 내역이 없습니다."}
+    if result.get("status") == 409:
+        candidates = result["candidates"]
 
-        # 후보군 저장
-        session["pending_action"] = "update"
-        session["pending_update_candidates"] = candidates
+        # ✅ 컨펌 단계 진입 표시
+        session["pending_action"] = "delete"
+        session["pending_delete_candidates"] = candidates
         session["pending_tx_type"] = "EXPENSE"
-        auth_sessions[session_key] = session
 
-        # 후보가 1개든 여러 개든 무조건 선택 유도
-        message = "수정할 항목을 선택하고 수정 내용을 말씀해주세요. 수정할 내역이 없다면 취소 또는 아니요 라고 입력해주세요.:\n"
+        message = "삭제 가능한 후보가 여러 개 있습니다:\n"
         for c in candidates:
-            message += f'{c["number"]}번. {c["date"]} {c["amount"]}원 "{c["memo"]}"\n'
-        message += "\n예: 1번 금액 xxxx원으로 수정. 날짜 어제로 수정. 메모 xx로 수정."
-
+            message += f'{c["number"]}번. {c["date"]} {c["amount"]}원 "{c["memo"]}" [{c["category"]}]\n'
+        message += "\n삭제 할 내역의 번호를 말해주세요. 모두 삭제를 원하시면 모두 삭제 또는 전부 삭제라고 입력해 주세요. 삭제할 내역이 없다면 취소 또는 아니요 라고 입력해주세요."
         return {"ok": False, "message": message, "candidates": candidates}
-    if tool_name == "update_income_by_chat":
-        session_key = auth_header or "anonymous"
-        session = auth_sessions.get(session_key, {})
-
-        result = backend_api.update_income_by_chat(
-            auth_header=auth_header,
-            date=arguments.get("date", ""),
-            amount=int(arguments.get("amount", 0)),
-            memo=arguments.get("memo", "")
-        )
 
-        candidates = result.get("candidates", [])
+    session.pop("pending_action", None)
+    session.pop("pending_delete_candidates", None)
 
-        if not candidates:
-            return {"ok": True, "message": "수정할 수입 내역이 없습니다."}
+    return {"ok": True, "message": "삭제 완료"}
 
-        session["pending_action"] = "update"
-        session["pending_update_candidates"] = candidates
+
+@tool("delete_income_by_chat", group="transaction", login_required=True, writes=True)
+async def _delete_income_by_chat(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    result = await backend_api.delete_income_by_chat(
+        auth_header=auth_header,
+        date=arguments["date"],
+        amount=int(arguments.get("amount", 0)),
+        memo=arguments.get("memo", "")
+    )
+
+    if result.get("status") == 409:
+        candidates = result["candidates"]
+
+        session["pending_action"] = "delete"
+        session["pending_delete_candidates"] = candidates
         session["pending_tx_type"] = "INCOME"
-        auth_sessions[session_key] = session
 
-        message = "수정할 수입 항목을 선택하고 수정 내용을 말씀해주세요. 수정할 내역이 없다면 취소 또는 아니요 라고 입력해주세요.:\n"
+        message = "삭제 가능한 수입 후보가 여러 개 있습니다:\n"
         for c in candidates:
-            message += f'{c["number"]}번. {c["date"]} {c["amount"]}원 "{c["memo"]}"\n'
-        message += "\n예: 1번 금액 xxxx원으로 수정. 날짜 어제로 수정. 메모 xx로 수정."
-
+            message += f'{c["number"]}번. {c["date"]} {c["amount"]}원 "{c["memo"]}" [{c["category"]}]\n'
+        message += "\n삭제 할 내역의 번호를 말해주세요. 모두 삭제를 원하시면 모두 삭제 또는 전부 삭제라고 입력해 주세요. 삭제할 내역이 없다면 취소 또는 아니요 라고 입력해주세요."
         return {"ok": False, "message": message, "candidates": candidates}
 
-    if tool_name == "get_expense_summary":
-        result = backend_api.get_expense_summary(
-            auth_header=auth_header,
-            period=arguments["period"],
-            date=arguments.get("date")
-        )
+    session.pop("pending_action", None)
+    session.pop("pending_delete_candidates", None)
 
-        if not result.get("ok"):
-            return result
-        
-        message = (
-            f'{result["start"]} 지출액은 {result["totalAmount"]:,}원입니다.'
-            if result["period"] == "day"
-            else (
-                f'({result["start"]} ~ {result["end"]})의 '
-                f'총 지출액은 {result["totalAmount"]:,}원입니다.'
-            )
+    return {"ok": True, "message": "수입 삭제 완료"}
+
+
+@tool("update_expense_by_chat", group="transaction", login_required=True)
+async def _update_expense_by_chat(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    result = await backend_api.update_expense_by_chat(
+        auth_header=auth_header,
+        date=arguments.get("date", ""),
+        amount=int(arguments.get("amount", 0)),
+        memo=arguments.get("memo", "")
+    )
+
+    candidates = result.get("candidates", [])
+
+    if not candidates:
+        return {"ok": True, "message": "수정할 지출 내역이 없습니다."}
+
+    # 후보군 저장
+    session["pending_action"] = "update"
+    session["pending_update_candidates"] = candidates
+    session["pending_tx_type"] = "EXPENSE"
+
+    # 후보가 1개든 여러 개든 무조건 선택 유도
+    message = "수정할 항목을 선택하고 수정 내용을 말씀해주세요. 수정할 내역이 없다면 취소 또는 아니요 라고 입력해주세요.:\n"
+    for c in candidates:
+        message += f'{c["number"]}번. {c["date"]} {c["amount"]}원 "{c["memo"]}"\n'
+    message += "\n예: 1번 금액 xxxx원으로 수정. 날짜 어제로 수정. 메모 xx로 수정."
+
+    return {"ok": False, "message": message, "candidates": candidates}
+
+
+@tool("update_income_by_chat", group="transaction", login_required=True)
+async def _update_income_by_chat(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+
+    result = await backend_api.update_income_by_chat(
+        auth_header=auth_header,
+        date=arguments.get("date", ""),
+        amount=int(arguments.get("amount", 0)),
+        memo=arguments.get("memo", "")
+    )
+
+    candidates = result.get("candidates", [])
+
+    if not candidates:
+        return {"ok": True, "message": "수정할 수입 내역이 없습니다."}
+
+    session["pending_action"] = "update"
+    session["pending_update_candidates"] = candidates
+    session["pending_tx_type"] = "INCOME"
+
+    message = "수정할 수입 항목을 선택하고 수정 내용을 말씀해주세요. 수정할 내역이 없다면 취소 또는 아니요 라고 입력해주세요.:\n"
+    for c in candidates:
+        message += f'{c["number"]}번. {c["date"]} {c["amount"]}원 "{c["memo"]}"\n'
+    message += "\n예: 1번 금액 xxxx원으로 수정. 날짜 어제로 수정. 메모 xx로 수정."
+
+    return {"ok": False, "message": message, "candidates": candidates}
+
+
+@tool("get_expense_summary", group="transaction", login_required=True, read_only=True, cacheable=True)
+async def _get_expense_summary(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    result = await backend_api.get_expense_summary(
+        auth_header=auth_header,
+        period=arguments["period"],
+        date=arguments.get("date")
+    )
+
+    if not result.get("ok"):
+        return result
+
+    message = (
+        f'{result["start"]} 지출액은 {result["totalAmount"]:,}원입니다.'
+        if result["period"] == "day"
+        else (
+            f'({result["start"]} ~ {result["end"]})의 '
+            f'총 지출액은 {result["totalAmount"]:,}원입니다.'
         )
-        return {
-            "ok": True,
-            "message": message,
-            "type": result["type"],
-            "period": result["period"],
-            "baseDate": result["baseDate"],
-            "start": result["start"],
-            "end": result["end"],
-            "totalAmount": result["totalAmount"],
-        }
+    )
+    return {
+        "ok": True,
+        "message": message,
+        "type": result["type"],
+        "period": result["period"],
+        "baseDate": result["baseDate"],
+        "start": result["start"],
+        "end": result["end"],
+        "totalAmount": result["totalAmount"],
+    }
+
+
+@tool("get_income_summary", group="transaction", login_required=True, read_only=True, cacheable=True)
+async def _get_income_summary(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    result = await backend_api.get_income_summary(
+        auth_header=auth_header,
+        period=arguments["period"],
+        date=arguments.get("date")
+    )
 
+    if not result.get("ok"):
+        return result
 
-    if tool_name == "get_income_summary":
-        result = backend_api.get_income_summary(
-            auth_header=auth_header,
-            period=arguments["period"],
-            date=arguments.get("date")
+    message = (
+        f'{result["start"]} 수입액은 {result["totalAmount"]:,}원입니다.'
+        if result["period"] == "day"
+        else (
+            f'({result["start"]} ~ {result["end"]})의 '
+            f'총 수입액은 {result["totalAmount"]:,}원입니다.'
         )
+    )
+
+    return {
+        "ok": True,
+        "message": message,
+        "type": result["type"],
+        "period": result["period"],
+        "baseDate": result["baseDate"],
+        "start": result["start"],
+        "end": result["end"],
+        "totalAmount": result["totalAmount"],
+    }
+
+
+@tool("get_top_expense_category", group="transaction", login_required=True, read_only=True, cacheable=True)
+async def _get_top_expense_category(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    result = await backend_api.get_top_expense_category(
+        auth_header=auth_header,
+        period=arguments["period"],
+        date=arguments.get("date")
+    )
 
-        if not result.get("ok"):
-            return result
+    if not result.get("ok"):
+        return result
+
+    category = result.get("category")
+    total = int(result.get("totalAmount", 0))
+    start = result.get("start")
+    end = result.get("end")
+
+    period = result.get("period")
+
+    # 기간 표시 문자열 만들기
+    if period == "day":
+        period_text = f"{start}"   # start == end == 해당 날짜
+    else:
+        period_text = f"{start} ~ {end}"
 
+    # 지출 데이터가 없는 경우
+    if not category or total == 0:
+        message = f"({period_text}) 기간 동안 지출 내역이 없습니다."
+    else:
         message = (
-            f'{result["start"]} 수입액은 {result["totalAmount"]:,}원입니다.'
-            if result["period"] == "day"
-            else (
-                f'({result["start"]} ~ {result["end"]})의 '
-                f'총 수입액은 {result["totalAmount"]:,}원입니다.'
-            )
-        )
+            f"({period_text}) 기간 동안 "
+            f'가장 많이 지출한 카테고리는 '
+            f'"{category}"이며 {total:,}원입니다.'
+        )
+
+    return {
+        "ok": True,
+        "message": message,
+        "period": result.get("period"),
+        "category": category,
+        "totalAmount": total,
+        "start": start,
+        "end": end,
+    }
 
-        return {
-            "ok": True,
-            "message": message,
-            "type": result["type"],
-            "period": result["period"],
-            "baseDate": result["baseDate"],
-            "start": result["start"],
-            "end": result["end"],
-            "totalAmount": result["totalAmount"],
-        }
 
-    if tool_name == "get_top_expense_category":
-        result = backend_api.get_top_expense_category(
-            auth_header=auth_header,
-            period=arguments["period"],
-            date=arguments.get("date")
-        )
+# reply-controller (CRUD)
+@tool("create_reply", group="reply")
+async def _create_reply(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.create_reply(
+        auth_header=auth_header,
+        bno=int(arguments["bno"]),
+        content=arguments["content"]
+    )
 
-        if not result.get("ok"):
-            return result
 
-        category = result.get("category")
-        total = int(result.get("totalAmount", 0))
-        start = result.get("start")
-        end = result.get("end")
+@tool("list_replies", group="reply", read_only=True)
+async def _list_replies(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.list_replies(
+        auth_header=auth_header,
+        bno=int(arguments["bno"]),
+        limit=int(arguments.get("limit", 10))
+    )
 
-        period = result.get("period")
 
-        # 기간 표시 문자열 만들기
-        if period == "day":
-            period_text = f"{start}"   # start == end == 해당 날짜
-        else:
-            period_text = f"{start} ~ {end}"
+@tool("delete_reply", group="reply")
+async def _delete_reply(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.delete_reply(
+        auth_header=auth_header,
+        reply_id=int(arguments["reply_id"])
+    )
 
-        # 지출 데이터가 없는 경우
-        if not category or total == 0:
-            message = f"({period_text}) 기간 동안 지출 내역이 없습니다."
-        else:
-            message = (
-                f"({period_text}) 기간 동안 "
-                f'가장 많이 지출한 카테고리는 '
-                f'"{category}"이며 {total:,}원입니다.'
-            )
 
+@tool("update_reply", group="reply")
+async def _update_reply(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.update_reply(
+        auth_header=auth_header,
+        reply_id=int(arguments["reply_id"]),
+        content=arguments["content"]
+    )
 
-        return {
-            "ok": True,
-            "message": message,
-            "period": result.get("period"),
-            "category": category,
-            "totalAmount": total,
-            "start": start,
-            "end": end,
-        }
+
+# notice-controller (CRUD)
+@tool("create_notice", group="notice", admin_only=True)
+async def _create_notice(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.create_notice(
+        auth_header=auth_header,
+        title=arguments["title"],
+        content=arguments["content"],
+        imageUrl=arguments.get("imageUrl", "")
+    )
 
 
+@tool("list_notices", group="notice", read_only=True)
+async def _list_notices(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.list_notices(
+        auth_header=auth_header,
+        limit=int(arguments.get("limit", 10))
+    )
 
-    # reply-controller (CRUD)
-    if tool_name == "create_reply":
-        return backend_api.create_reply(
-            auth_header=auth_header,
-            bno=int(arguments["bno"]),
-            content=arguments["content"]
-        )
-    if tool_name == "list_replies":
-        return backend_api.list_replies(
-            auth_header=auth_header,
-            bno=int(arguments["bno"]),
-            limit=int(arguments.get("limit", 10))
-        )
-    if tool_name == "delete_reply":
-        return backend_api.delete_reply(
-            auth_header=auth_header,
-            reply_id=int(arguments["reply_id"])
-        )
-    if tool_name == "update_reply":
-        return backend_api.update_reply(
-            auth_header=auth_header,
-            reply_id=int(arguments["reply_id"]),
-            content=arguments["content"]
-        )
-    
-    # notice-controller (CRUD)
-    if tool_name == "create_notice":
-        return backend_api.create_notice(
-            auth_header=auth_header,
-            title=arguments["title"],
-            content=arguments["content"],
-            imageUrl=arguments.get("imageUrl", "")
-        )
-    if tool_name == "list_notices":
-        return backend_api.list_notices(
-            auth_header=auth_header,
-            limit=int(arguments.get("limit", 10))
-        )
-    if tool_name == "delete_notice":
-        return backend_api.delete_notice(
-            auth_header=auth_header,
-            notice_id=int(arguments["notice_id"])
-        )
-    if tool_name == "update_notice":
-        return backend_api.update_notice(
-            auth_header=auth_header,
-            notice_id=int(arguments["notice_id"]),
-            title=arguments["title"],
-            content=arguments["content"],
-            imageUrl=arguments.get("imageUrl", "")
-        )
 
-    # member-controller (CRUD)
-    if tool_name == "list_members":
-        return backend_api.list_members(
-            auth_header=auth_header,
-            limit=int(arguments.get("limit", 10))
-        )
-    if tool_name == "verify_password":
-        return backend_api.verify_password(
-            auth_header=auth_header,
-            password=arguments["password"]
-        )
-    if tool_name == "delete_member":
-        return backend_api.delete_member(
-            auth_header=auth_header,
-            member_id=int(arguments["member_id"])
-        )
-    if tool_name == "update_member_info":
-        return backend_api.update_member_info(
-            auth_header=auth_header,
-            nickname=arguments.get("nickname"),
-            password=arguments.get("password")
-        )
+@tool("delete_notice", group="notice", admin_only=True)
+async def _delete_notice(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.delete_notice(
+        auth_header=auth_header,
+        notice_id=int(arguments["notice_id"])
+    )
 
-    # budget-controller (CRUD)
-    if tool_name == "create_budget":
-        return backend_api.create_budget(
-            auth_header=auth_header,
-            year=int(arguments["year"]),
-            month=int(arguments["month"]),
-            limitAmount=int(arguments["limitAmount"]),
-            usedAmount=int(arguments.get("usedAmount", 0))
-        )
-    if tool_name == "list_budgets":
-        return backend_api.list_budgets(
-            auth_header=auth_header,
-            mid=int(arguments["mid"]),
-            limit=int(arguments.get("limit", 10))
-        )
-    if tool_name == "adjust_budget_limit":
-        return backend_api.adjust_budget_limit(
-            auth_header=auth_header,
-            mid=int(arguments["mid"]),
-            delta=int(arguments["delta"])
-        )
 
-    # board-controller (CRUD)
-    if tool_name == "create_board":
-        return backend_api.create_board(
-            auth_header=auth_header,
-            title=arguments["title"],
-            content=arguments["content"],
-            imageUrl=arguments.get("imageUrl", "")
-        )
-    if tool_name == "get_board":
-        return backend_api.get_board(
-            auth_header=auth_header,
-            board_id=int(arguments["board_id"])
-        )
-    if tool_name == "delete_board":
-        return backend_api.delete_board(
-            auth_header=auth_header,
-            board_id=int(arguments["board_id"])
-        )
-    if tool_name == "list_boards":
-        return backend_api.list_boards(
-            auth_header=auth_header,
-            page=int(arguments.get("page", 1)),
-            limit=int(arguments.get("limit", 10)),
-            keyword=arguments.get("keyword", ""),
-            types=arguments.get("types", "")
-        )
-    if tool_name == "update_board":
-        return backend_api.update_board(
-            auth_header=auth_header,
-            board_id=int(arguments["board_id"]),
-            title=arguments["title"],
-            content=arguments["content"],
-            imageUrl=arguments.get("imageUrl", "")
-        )
+@tool("update_notice", group="notice", admin_only=True)
+async def _update_notice(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.update_notice(
+        auth_header=auth_header,
+        notice_id=int(arguments["notice_id"]),
+        title=arguments["title"],
+        content=arguments["content"],
+        imageUrl=arguments.get("imageUrl", "")
+    )
+
+
+# member-controller (CRUD)
+@tool("list_members", group="member", read_only=True, admin_only=True)
+async def _list_members(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.list_members(
+        auth_header=auth_header,
+        limit=int(arguments.get("limit", 10))
+    )
+
+
+@tool("verify_password", group="member")
+async def _verify_password(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.verify_password(
+        auth_header=auth_header,
+        password=arguments["password"]
+    )
+
+
+@tool("delete_member", group="member")
+async def _delete_member(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.delete_member(
+        auth_header=auth_header,
+        member_id=int(arguments["member_id"])
+    )
+
+
+@tool("update_member_info", group="member")
+async def _update_member_info(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.update_member_info(
+        auth_header=auth_header,
+        nickname=arguments.get("nickname"),
+        password=arguments.get("password")
+    )
+
+
+# budget-controller (CRUD)
+@tool("create_budget", group="budget")
+async def _create_budget(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.create_budget(
+        auth_header=auth_header,
+        year=int(arguments["year"]),
+        month=int(arguments["month"]),
+        limitAmount=int(arguments["limitAmount"]),
+        usedAmount=int(arguments.get("usedAmount", 0))
+    )
+
+
+@tool("list_budgets", group="budget", read_only=True)
+async def _list_budgets(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.list_budgets(
+        auth_header=auth_header,
+        mid=int(arguments["mid"]),
+        limit=int(arguments.get("limit", 10))
+    )
+
+
+@tool("adjust_budget_limit", group="budget")
+async def _adjust_budget_limit(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.adjust_budget_limit(
+        auth_header=auth_header,
+        mid=int(arguments["mid"]),
+        delta=int(arguments["delta"])
+    )
+
+
+# board-controller (CRUD)
+@tool("create_board", group="board")
+async def _create_board(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.create_board(
+        auth_header=auth_header,
+        title=arguments["title"],
+        content=arguments["content"],
+        imageUrl=arguments.get("imageUrl", "")
+    )
+
+
+@tool("get_board", group="board", read_only=True)
+async def _get_board(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.get_board(
+        auth_header=auth_header,
+        board_id=int(arguments["board_id"])
+    )
+
+
+@tool("delete_board", group="board")
+async def _delete_board(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.delete_board(
+        auth_header=auth_header,
+        board_id=int(arguments["board_id"])
+    )
+
+
+@tool("list_boards", group="board", read_only=True)
+async def _list_boards(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.list_boards(
+        auth_header=auth_header,
+        page=int(arguments.get("page", 1)),
+        limit=int(arguments.get("limit", 10)),
+        keyword=arguments.get("keyword", ""),
+        types=arguments.get("types", "")
+    )
+
+
+@tool("update_board", group="board")
+async def _update_board(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.update_board(
+        auth_header=auth_header,
+        board_id=int(arguments["board_id"]),
+        title=arguments["title"],
+        content=arguments["content"],
+        imageUrl=arguments.get("imageUrl", "")
+    )
+
+
+# authentication-controller (only sign-in)
+@tool("sign_in", group="auth")
+async def _sign_in(arguments: Dict[str, Any], auth_header: Optional[str], session: Dict[str, Any]) -> Dict[str, Any]:
+    return await backend_api.sign_in(
+        auth_header=auth_header,
+        username=arguments["username"],
+        password=arguments["password"]
+    )
 
-    # authentication-controller (only sign-in)
-    if tool_name == "sign_in":
-        return backend_api.sign_in(
-            auth_header=auth_header,
-            username=arguments["username"],
-            password=arguments["password"]
-        )
 
+# 백엔드 상태도 세션 상태도 바꾸지 않는 조회 tool (한 턴에서 동시에 실행해도 안전)
+READ_ONLY_TOOLS = tool_registry.names(read_only=True)
 
-    return {"ok": False, "error": f"Unknown tool: {tool_name}"}
 
 def parse_user_selection(message: str) -> list[int]:
     """
@@ -834,4 +942,6 @@ def require_login(auth_header: Optional[str]) -> Optional[Dict[str, Any]]:
             "ok": False,
             "message": "서비스 이용을 위해 로그인 또는 회원가입이 필요합니다."
         }
+    if auth.is_expired(auth_header):
+        return {"ok": False, "message": auth.EXPIRED_MESSAGE}
     return None
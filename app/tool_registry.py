@@ -0,0 +1,77 @@
+# app/tool_registry.py
+"""
+tool 이름 → (핸들러, 메타데이터) 등록부
+
+tool_executor의 핸들러가 @tool(...)로 자신을 등록하고, 실행은 이름으로 dict에서 바로 찾는다
+(if 분기를 위에서부터 차례로 비교하지 않는다).
+tool별 정책은 등록할 때 한 곳에 적고, 다른 계층은 여기서 읽는다.
+- login_required : 실행 전에 require_login 확인 (tool_executor)
+- read_only      : 백엔드/세션 상태를 바꾸지 않음 → 한 턴에서 동시에 실행 (main.run_tool_calls)
+- cacheable      : 사용자별 결과 캐시 사용 (result_cache)
+- writes         : 실행하면 그 사용자의 결과 캐시를 비운다 (result_cache)
+- group          : tool_router가 메시지별로 고르는 묶음. None이면 모델에 보내지 않는 내부 tool
+- admin_only     : 관리자 전용 (role이 확인된 일반 사용자에게는 보내지 않음, tool_router)
+- timeout        : tool 실행 전체 제한 시간(초). None이면 backend_api의 요청별 timeout만 적용
+
+핸들러는 async def handler(arguments, auth_header, session) -> dict 형태다.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional
+
+Handler = Callable[[Dict[str, Any], Optional[str], Any], Awaitable[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    name: str
+    handler: Handler
+    group: Optional[str] = None
+    login_required: bool = False
+    read_only: bool = False
+    cacheable: bool = False
+    writes: bool = False
+    admin_only: bool = False
+    timeout: Optional[float] = None
+
+
+REGISTRY: Dict[str, ToolSpec] = {}
+
+
+def tool(name: str, **meta: Any) -> Callable[[Handler], Handler]:
+    """핸들러 등록 데코레이터. 같은 이름을 두 번 등록하면 ValueError."""
+    def register(handler: Handler) -> Handler:
+        if name in REGISTRY:
+            raise ValueError(f"tool already registered: {name}")
+        REGISTRY[name] = ToolSpec(name=name, handler=handler, **meta)
+        return handler
+    return register
+
+
+def get(name: str) -> Optional[ToolSpec]:
+    return REGISTRY.get(name)
+
+
+def names(**meta: Any) -> FrozenSet[str]:
+    """메타데이터가 모두 일치하는 tool 이름. 예: names(read_only=True)"""
+    return frozenset(
+        spec.name for spec in REGISTRY.values()
+        if all(getattr(spec, key) == value for key, value in meta.items())
+    )
+
+
+def groups() -> Dict[str, List[str]]:
+    """group → tool 이름 목록 (등록 순서). 내부 tool(group=None)은 빠진다."""
+    out: Dict[str, List[str]] = {}
+    for spec in REGISTRY.values():
+        if spec.group is not None:
+            out.setdefault(spec.group, []).append(spec.name)
+    return out
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "registered": len(REGISTRY),
+        "groups": {group: len(tools) for group, tools in groups().items()},
+        "internal": sorted(spec.name for spec in REGISTRY.values() if spec.group is None),
+    }
@@ -0,0 +1,122 @@
+# app/tool_router.py
+"""
+메시지마다 모델에 보낼 tool 묶음을 고른다.
+
+TOOLS 전체(약 40개)를 매번 보내는 대신, 기본 그룹(가계부 거래)만 보내고
+메시지에 게시글/댓글/공지/회원/예산/로그인 키워드가 있을 때만 해당 그룹을 추가한다.
+
+배포별 설정(환경변수)
+- TOOL_ROUTER_MODE           : keyword(기본) | all (항상 전체 전송)
+- TOOL_ROUTER_GROUPS         : 이 배포에서 쓸 그룹 목록 (쉼표 구분, 기본: 전체)
+- TOOL_ROUTER_DEFAULT_GROUPS : 키워드와 상관없이 항상 보낼 그룹 (기본: transaction)
+"""
+from __future__ import annotations
+import json
+import os
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from app.tool_executor import tool_registry  # tool_executor를 import해야 tool이 등록된다
+from app.tool_schema import ACTIVE_TOOLS as TOOLS
+from app.tool_schema import count_tokens
+
+# 그룹별 tool 목록과 관리자 전용 여부는 tool_executor가 등록한 tool_registry 메타데이터에서 읽는다
+TOOL_GROUPS: Dict[str, List[str]] = tool_registry.groups()
+
+GROUP_KEYWORDS: Dict[str, List[str]] = {
+    "reply": ["댓글"],
+    "notice": ["공지"],
+    "member": ["회원", "닉네임", "비밀번호", "탈퇴", "내 정보"],
+    "budget": ["예산", "한도"],
+    "board": ["게시글", "게시판", "게시물", "글쓰기", "글 작성", "글 목록"],
+    "auth": ["로그인", "아이디"],
+}
+
+# 관리자(ADMIN)만 의미가 있는 tool - role이 확인된 일반 사용자에게는 보내지 않는다
+ADMIN_TOOLS = tool_registry.names(admin_only=True)
+
+ROUTER_MODE = os.getenv("TOOL_ROUTER_MODE", "keyword")
+ENABLED_GROUPS = [
+    g.strip() for g in os.getenv("TOOL_ROUTER_GROUPS", ",".join(TOOL_GROUPS)).split(",")
+    if g.strip() in TOOL_GROUPS
+]
+DEFAULT_GROUPS = [
+    g.strip() for g in os.getenv("TOOL_ROUTER_DEFAULT_GROUPS", "transaction").split(",")
+    if g.strip() in ENABLED_GROUPS
+]
+
+# 같은 그룹 조합이면 항상 같은 list 객체(같은 순서)를 돌려준다
+_SUBSETS: Dict[tuple, List[Dict[str, Any]]] = {}
+_SUBSET_TOKENS: Dict[int, int] = {}
+
+_STATS: Dict[str, Any] = {
+    "requests": 0,
+    "tools_sent": 0,
+    "input_tokens_full": 0,
+    "input_tokens_sent": 0,
+    "latency": {"full": [0, 0.0], "subset": [0, 0.0]},  # [호출 수, 누적 초]
+}
+
+
+def _tool_tokens(tools: List[Dict[str, Any]]) -> int:
+    key = id(tools)
+    if key not in _SUBSET_TOKENS:
+        _SUBSET_TOKENS[key] = count_tokens(json.dumps(tools, ensure_ascii=False))
+    return _SUBSET_TOKENS[key]
+
+
+def _subset(groups: FrozenSet[str], include_admin: bool) -> List[Dict[str, Any]]:
+    key = (groups, include_admin)
+    if key not in _SUBSETS:
+        names = {name for g in groups for name in TOOL_GROUPS[g]}
+        if not include_admin:
+            names -= ADMIN_TOOLS
+        # 원래 TOOLS 순서를 유지해야 같은 조합의 프롬프트가 항상 동일하다
+        _SUBSETS[key] = [t for t in TOOLS if t["name"] in names]
+    return _SUBSETS[key]
+
+
+def select_groups(message: str) -> FrozenSet[str]:
+    if ROUTER_MODE == "all":
+        return frozenset(ENABLED_GROUPS)
+    groups = set(DEFAULT_GROUPS)
+    for group, keywords in GROUP_KEYWORDS.items():
+        if group in ENABLED_GROUPS and any(k in message for k in keywords):
+            groups.add(group)
+    return frozenset(groups)
+
+
+def select_tools(message: str, role: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    메시지에 맞는 tool 목록을 고른다.
+    role이 주어지고 ADMIN이 아니면 관리자 전용 tool은 뺀다. (role을 모르면 백엔드 권한 검사에 맡긴다)
+    """
+    include_admin = role is None or role.upper() in ("ADMIN", "ROLE_ADMIN")
+    tools = _subset(select_groups(message), include_admin)
+
+    _STATS["requests"] += 1
+    _STATS["tools_sent"] += len(tools)
+    _STATS["input_tokens_full"] += _tool_tokens(TOOLS)
+    _STATS["input_tokens_sent"] += _tool_tokens(tools)
+    return tools
+
+
+def record_latency(tools: List[Dict[str, Any]], seconds: float) -> None:
+    """tool 묶음 크기별 모델 호출 시간을 기록한다 (전체 전송 vs 일부 전송 비교용)"""
+    bucket = _STATS["latency"]["full" if len(tools) == len(TOOLS) else "subset"]
+    bucket[0] += 1
+    bucket[1] += seconds
+
+
+def stats() -> Dict[str, Any]:
+    requests = _STATS["requests"]
+    latency = {
+        name: {"calls": calls, "avg_ms": round(total / calls * 1000, 1) if calls else None}
+        for name, (calls, total) in _STATS["latency"].items()
+    }
+    return {
+        "mode": ROUTER_MODE,
+        "requests": requests,
+        "avg_tools_sent": round(_STATS["tools_sent"] / requests, 2) if requests else 0.0,
+        "input_tokens_saved": _STATS["input_tokens_full"] - _STATS["input_tokens_sent"],
+        "latency": latency,
+    }
@@ -0,0 +1,141 @@
+# app/tool_schema.py
+"""
+TOOLS 스키마 압축 + tool별 토큰 리포트
+
+- verbose : app/tools.py의 TOOLS 그대로
+- compact : 설명문의 예시('예: ...')와 중복 표기('(선택)', 패턴과 같은 'YYYY-MM-DD' 안내)를 걷어내고,
+            batch tool의 거래 항목 스키마를 $defs 하나로 묶은 형태
+
+TOOL_SCHEMA_MODE=verbose|compact 로 모델에 보낼 형태를 고른다 (기본 verbose).
+tool_router는 여기서 고른 ACTIVE_TOOLS에서 묶음을 만든다.
+압축본은 시작 시 한 번만 만든다.
+
+    python -m app.tool_schema    # tool별 토큰 수 비교표 출력
+"""
+from __future__ import annotations
+import copy
+import json
+import os
+import re
+from typing import Any, Dict, List
+
+from app.tools import TOOLS
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+except Exception:  # tiktoken 미설치/오프라인이면 근사치 사용
+    _ENCODING = None
+
+SCHEMA_MODE = os.getenv("TOOL_SCHEMA_MODE", "verbose")
+
+# '예: '어제 외식 12000원 썼어', '교통비 1500원 추가해줘'.' 같은 예시 문장
+_EXAMPLE = re.compile(r"\s*예:\s*(?:(?:'[^']*'|\"[^\"]*\"|‘[^’]*’)\s*[,.]?\s*)+")
+_OPTIONAL_MARK = re.compile(r"\s*\(선택\)|,\s*선택(?=\))")
+_DATE_HINT = re.compile(r"\s*\(?YYYY-MM-DD\)?")
+
+# batch tool들이 공유하는 거래 항목 스키마 이름
+TRANSACTION_DEF = "transaction"
+
+
+def count_tokens(text: str) -> int:
+    """tiktoken(o200k_base)이 있으면 실제 토큰 수, 없으면 근사치"""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars)
+
+
+def tool_tokens(tool: Dict[str, Any]) -> int:
+    return count_tokens(json.dumps(tool, ensure_ascii=False, separators=(",", ":")))
+
+
+def _compact_text(text: str, has_pattern: bool = False) -> str:
+    text = _EXAMPLE.sub(" ", text)
+    text = _OPTIONAL_MARK.sub("", text)
+    if has_pattern:
+        text = _DATE_HINT.sub("", text)
+    return re.sub(r"\s{2,}", " ", text).strip()
+
+
+def _compact_properties(schema: Dict[str, Any]) -> None:
+    for prop in schema.get("properties", {}).values():
+        if "description" in prop:
+            desc = _compact_text(prop["description"], has_pattern="pattern" in prop)
+            if desc:
+                prop["description"] = desc
+            else:
+                del prop["description"]
+        if prop.get("type") == "object":
+            _compact_properties(prop)
+        if prop.get("type") == "array" and isinstance(prop.get("items"), dict):
+            _compact_properties(prop["items"])
+
+
+def _share_transaction_def(params: Dict[str, Any]) -> None:
+    """batch tool의 transactions.items 를 $defs/transaction 참조로 바꾼다."""
+    transactions = params.get("properties", {}).get("transactions")
+    if not transactions or not isinstance(transactions.get("items"), dict):
+        return
+    params.setdefault("$defs", {})[TRANSACTION_DEF] = transactions["items"]
+    transactions["items"] = {"$ref": f"#/$defs/{TRANSACTION_DEF}"}
+
+
+def compact_tool(tool: Dict[str, Any]) -> Dict[str, Any]:
+    compact = copy.deepcopy(tool)
+    compact["description"] = _compact_text(compact.get("description", ""))
+    params = compact.get("parameters", {})
+    _compact_properties(params)
+    _share_transaction_def(params)
+    return compact
+
+
+def compact_tools(tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [compact_tool(t) for t in tools]
+
+
+def token_report(tools: List[Dict[str, Any]] = TOOLS) -> List[Dict[str, Any]]:
+    """tool별 verbose/compact 토큰 수"""
+    report = []
+    for tool in tools:
+        verbose = tool_tokens(tool)
+        compact = tool_tokens(compact_tool(tool))
+        report.append({
+            "name": tool["name"],
+            "verbose_tokens": verbose,
+            "compact_tokens": compact,
+            "saved": verbose - compact,
+        })
+    return report
+
+
+def format_report(report: List[Dict[str, Any]]) -> str:
+    lines = [f"{'tool':<32}{'verbose':>9}{'compact':>9}{'saved':>8}"]
+    for row in sorted(report, key=lambda r: -r["verbose_tokens"]):
+        lines.append(
+            f"{row['name']:<32}{row['verbose_tokens']:>9}{row['compact_tokens']:>9}{row['saved']:>8}"
+        )
+    total_v = sum(r["verbose_tokens"] for r in report)
+    total_c = sum(r["compact_tokens"] for r in report)
+    lines.append(f"{'TOTAL':<32}{total_v:>9}{total_c:>9}{total_v - total_c:>8}")
+    lines.append(f"(tokenizer: {'tiktoken o200k_base' if _ENCODING is not None else 'approximate'})")
+    return "\n".join(lines)
+
+
+COMPACT_TOOLS = compact_tools(TOOLS)
+
+# 모델에 실제로 보낼 스키마 (TOOLS와 같은 순서)
+ACTIVE_TOOLS = COMPACT_TOOLS if SCHEMA_MODE == "compact" else TOOLS
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "mode": SCHEMA_MODE,
+        "tools": len(ACTIVE_TOOLS),
+        "verbose_tokens": sum(tool_tokens(t) for t in TOOLS),
+        "compact_tokens": sum(tool_tokens(t) for t in COMPACT_TOOLS),
+    }
+
+
+if __name__ == "__main__":
+    print(format_report(token_report()))
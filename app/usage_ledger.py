@@ -0,0 +1,128 @@
+# app/usage_ledger.py
+"""
+모델 호출 토큰/시간 장부 (요청별 → 세션별 → 사용자별)
+
+- 모델 호출마다 입력 토큰, 캐시된 입력 토큰, 출력 토큰, 호출 시간(wall time)을 기록한다.
+- /chat 한 턴은 begin_turn()/end_turn() 사이에서 처리되며, 그 사이에 응답을 받은 모든 모델 호출
+  (가드레일, 수정 JSON 추출, 단계 라우팅, 먼저 끝난 hedge 호출)이 그 턴에 합산된다.
+  hedging에서 지고 취소된 호출은 usage를 받지 못하므로 기록되지 않는다 (건수는 hedging.stats() 참고).
+- 턴 합계는 세션(session["usage"])과 사용자별 장부에 누적된다.
+  사용자 키는 auth.user_key(서명 확인된 subject, 아니면 토큰 해시)의 해시다.
+  토큰이 갱신돼도 같은 사용자로 합산되고, 관리자 API로 내보내도 토큰/subject가 드러나지 않는다.
+
+설정(환경변수)
+- USAGE_LEDGER_MAX_USERS : 메모리에 유지할 사용자 수 (기본 10000, 오래 안 쓴 사용자부터 제거)
+"""
+from __future__ import annotations
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from app import auth
+
+MAX_USERS = int(os.getenv("USAGE_LEDGER_MAX_USERS", "10000"))
+
+USAGE_FIELDS = ("calls", "input_tokens", "cached_tokens", "output_tokens", "model_seconds")
+
+# 지금 처리 중인 턴의 누적값
+_CURRENT_TURN: ContextVar[Optional[Dict[str, Any]]] = ContextVar("usage_turn", default=None)
+
+_USERS: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_TOTAL: Dict[str, Any] = {"turns": 0, **{f: 0 for f in USAGE_FIELDS}}
+
+
+def empty_usage() -> Dict[str, Any]:
+    usage: Dict[str, Any] = {f: 0 for f in USAGE_FIELDS}
+    usage["model_seconds"] = 0.0
+    return usage
+
+
+def user_key(auth_header: Optional[str]) -> str:
+    if not auth_header:
+        return "anonymous"
+    return hashlib.sha256(auth.user_key(auth_header).encode("utf-8")).hexdigest()[:16]
+
+
+def begin_turn():
+    """턴 시작. 반환값은 end_turn()에 그대로 넘긴다."""
+    turn = empty_usage()
+    turn["started"] = time.perf_counter()
+    return _CURRENT_TURN.set(turn)
+
+
+def record_call(model: str, usage, seconds: float) -> None:
+    """모델 호출 1건을 현재 턴(없으면 전체 합계에만)에 기록한다."""
+    input_tokens = getattr(usage, "input_tokens", 0) or 0
+    output_tokens = getattr(usage, "output_tokens", 0) or 0
+    cached = getattr(getattr(usage, "input_tokens_details", None), "cached_tokens", 0) or 0
+
+    targets = [_TOTAL]
+    turn = _CURRENT_TURN.get()
+    if turn is not None:
+        targets.append(turn)
+        models = turn.setdefault("models", {})
+        models[model] = models.get(model, 0) + 1
+    for target in targets:
+        target["calls"] += 1
+        target["input_tokens"] += input_tokens
+        target["cached_tokens"] += cached
+        target["output_tokens"] += output_tokens
+        target["model_seconds"] += seconds
+
+
+def end_turn(token, session: Optional[Dict[str, Any]], auth_header: Optional[str]) -> Dict[str, Any]:
+    """턴을 마치고 세션/사용자 장부에 합산한다. 이번 턴의 사용량을 반환한다."""
+    turn = _CURRENT_TURN.get() or empty_usage()
+    try:
+        _CURRENT_TURN.reset(token)
+    except ValueError:
+        # 스트림 generator가 다른 컨텍스트에서 정리되는 경우
+        _CURRENT_TURN.set(None)
+    turn["wall_seconds"] = time.perf_counter() - turn.pop("started", time.perf_counter())
+    _TOTAL["turns"] += 1
+
+    ledgers = [_user_ledger(user_key(auth_header))]
+    if session is not None:
+        ledgers.append(session.setdefault("usage", {"turns": 0, **empty_usage()}))
+    for ledger in ledgers:
+        ledger["turns"] += 1
+        for field in USAGE_FIELDS:
+            ledger[field] += turn[field]
+    return turn
+
+
+def _user_ledger(key: str) -> Dict[str, Any]:
+    ledger = _USERS.get(key)
+    if ledger is None:
+        ledger = _USERS[key] = {"turns": 0, **empty_usage()}
+        while len(_USERS) > MAX_USERS:
+            _USERS.popitem(last=False)
+    _USERS.move_to_end(key)
+    ledger["last_seen"] = time.time()
+    return ledger
+
+
+def _rounded(ledger: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: round(v, 3) if isinstance(v, float) else v for k, v in ledger.items()}
+
+
+def user_usage(key: str) -> Optional[Dict[str, Any]]:
+    ledger = _USERS.get(key)
+    return _rounded(ledger) if ledger is not None else None
+
+
+def top_users(limit: int = 20) -> List[Dict[str, Any]]:
+    """입력+출력 토큰이 많은 순서"""
+    ranked = sorted(
+        _USERS.items(),
+        key=lambda kv: kv[1]["input_tokens"] + kv[1]["output_tokens"],
+        reverse=True,
+    )
+    return [{"user": key, **_rounded(ledger)} for key, ledger in ranked[:limit]]
+
+
+def totals() -> Dict[str, Any]:
+    return {**_rounded(_TOTAL), "users": len(_USERS)}
@@ -0,0 +1,48 @@
+"""
+app.amount_parser 벤치마크
+
+    python bench/amount_parser_bench.py
+
+실제 메시지에서 모은 금액 표현 코퍼스로 parse_amount / find_amounts의 호출당 시간을 잰다.
+- parse_amount (cold): 캐시 없이 매번 실제 파싱
+- parse_amount (warm): 같은 표현이 반복되는 실제 트래픽 상황 (lru_cache 적중)
+- find_amounts      : 메시지 전체에서 금액 찾기 (모든 /chat 메시지에 대해 실행되는 경로)
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.amount_parser import find_amounts, parse_amount  # noqa: E402
+
+AMOUNTS = [
+    "8천원", "12000원", "12,000원", "1만2천원", "삼천오백원", "8.5천", "300만원",
+    "만원", "천원", "1만 5천원", "오만원", "2.5만", "4500", "1억 2천만원", "칠천원",
+    "백오십만원", "3만5000원", "1,200,000원", "구천원", "15000",
+]
+MESSAGES = [
+    "오늘 점심 8천원", "어제 택시 12000원", "월급 300만원 들어왔어", "커피 2잔 9천원",
+    "1번 금액 1800원으로 수정", "3일 전 배민 23,000원", "점심 삼천오백원",
+    "외식 12000원, 교통 1500원, 커피 4500원 등록해줘", "이번 달 지출 얼마야", "안녕",
+]
+
+
+def per_call_ns(fn, args, number):
+    total = timeit.timeit(lambda: [fn(a) for a in args], number=number)
+    return total / (number * len(args)) * 1e9
+
+
+def main():
+    number = 20000
+
+    # 캐시를 거치지 않는 원래 함수
+    uncached = parse_amount.__wrapped__
+    print(f"parse_amount (cold): {per_call_ns(uncached, AMOUNTS, number):8.1f} ns/call")
+    parse_amount.cache_clear()
+    print(f"parse_amount (warm): {per_call_ns(parse_amount, AMOUNTS, number):8.1f} ns/call")
+    print(f"find_amounts       : {per_call_ns(find_amounts, MESSAGES, number // 10):8.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
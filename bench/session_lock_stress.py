@@ -0,0 +1,112 @@
+"""
+세션 잠금 스트레스 테스트
+
+    python bench/session_lock_stress.py [--sessions 200] [--burst 8] [--latency-ms 20]
+
+백엔드는 httpx.MockTransport 대역(응답마다 --latency-ms 지연)으로 바꾸고 main._chat_turn을 직접 부른다.
+- 세션 하나: 삭제 후보가 있는 상태에서 "1번"을 --burst개 동시에 보낸다
+  → 삭제 확정(confirm) 백엔드 호출은 1번이어야 한다. 나머지는 후보가 없어 실패 안내를 받는다.
+- 세션 여러 개: 위와 같은 burst를 --sessions개 세션에 동시에 보낸다
+  → 세션마다 confirm 1번, 전체 시간은 (burst × 지연) 정도여야 한다 (사용자끼리는 기다리지 않음)
+비교용으로 잠금을 끈 결과도 함께 출력한다.
+턴마다 남는 chat_turn 로그가 결과를 가리지 않도록 로그 레벨은 --log-level(기본 WARNING)로 낮춘다.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx  # noqa: E402
+
+from app import backend_api_async, log, session_store  # noqa: E402
+from app import main as chat_main  # noqa: E402
+
+CANDIDATES = [
+    {"number": 1, "date": "2026-01-25", "amount": 8000, "memo": "점심", "category": "식비"},
+    {"number": 2, "date": "2026-01-25", "amount": 8000, "memo": "점심", "category": "식비"},
+]
+
+
+class _NoLock:
+    """비교용: 잠금을 끈 상태"""
+
+    async def acquire(self, key):
+        return None
+
+    def release(self, key):
+        return None
+
+    def stats(self):
+        return {}
+
+
+def install_backend(latency: float) -> dict:
+    confirms: dict = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        if request.url.path.endswith("/delete/confirm"):
+            auth = request.headers.get("Authorization", "")
+            confirms[auth] = confirms.get(auth, 0) + 1
+        return httpx.Response(200, json={"message": "선택된 항목 삭제 완료"})
+
+    backend_api_async._CLIENT = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return confirms
+
+
+async def run(sessions: int, burst: int, latency: float):
+    confirms = install_backend(latency)
+    auths = [f"Bearer stress-{i}" for i in range(sessions)]
+    for auth in auths:
+        session, token = await session_store.begin_turn(auth)
+        session.clear()
+        session.update(pending_action="delete", pending_tx_type="EXPENSE", pending_delete_candidates=CANDIDATES)
+        await session_store.end_turn(token)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(chat_main._chat_turn("1번", auth) for auth in auths for _ in range(burst)))
+    elapsed = time.perf_counter() - started
+
+    per_session = [confirms.get(auth, 0) for auth in auths]
+    turns = [session_store.current(auth).get("usage", {}).get("turns", 0) for auth in auths]
+    return elapsed, per_session, turns
+
+
+def report(label: str, elapsed: float, per_session: list, turns: list, burst: int) -> None:
+    doubled = sum(1 for c in per_session if c > 1)
+    print(
+        f"{label:<22} {elapsed * 1000:8.1f} ms  confirms/session max={max(per_session)} "
+        f"double-confirmed sessions={doubled}/{len(per_session)}  "
+        f"turns recorded ok={sum(1 for t in turns if t >= burst)}/{len(turns)}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--burst", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+    log.logger.setLevel(getattr(logging, args.log_level.upper()))
+    latency = args.latency_ms / 1000
+
+    locks = session_store._LOCKS
+    for enabled in (True, False):
+        session_store._LOCKS = locks if enabled else _NoLock()
+        state = "locked" if enabled else "no lock"
+        elapsed, per_session, turns = await run(1, args.burst, latency)
+        report(f"1 session  ({state})", elapsed, per_session, turns, args.burst)
+        elapsed, per_session, turns = await run(args.sessions, args.burst, latency)
+        report(f"{args.sessions} sessions ({state})", elapsed, per_session, turns, args.burst)
+    session_store._LOCKS = locks
+    print(locks.stats())
+    await backend_api_async.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
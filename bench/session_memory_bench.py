@@ -0,0 +1,94 @@
+"""
+세션 메모리 벤치마크 (plain dict vs SessionRecord)
+
+    python bench/session_memory_bench.py [--sessions 100000] [--pending 0.3] [--candidates 3]
+
+세션 N개를 만들고 tracemalloc으로 세션 1개당 바이트를 잰다.
+- 모든 세션: natural_count + usage(세션별 모델 사용량)
+- --pending 비율의 세션: 삭제/수정 컨펌 대기 (백엔드 409 응답의 후보 --candidates개)
+before는 지금까지처럼 백엔드 JSON을 그대로 담은 dict, after는 SessionRecord(후보는 튜플)다.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.session_record import SessionRecord  # noqa: E402
+from app.usage_ledger import empty_usage  # noqa: E402
+
+MEMOS = ["점심", "커피", "택시", "편의점", "배민", "마트 장보기", "스타벅스", "관리비", "교통카드 충전"]
+CATEGORIES = ["식비", "카페", "교통", "생활", "쇼핑", "주거"]
+
+
+def backend_candidates(rng: random.Random, count: int) -> list:
+    """백엔드 409 응답처럼 JSON 문자열에서 읽은 후보 목록 (세션마다 새 객체)"""
+    items = [
+        {
+            "number": i + 1,
+            "date": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "amount": rng.randrange(1000, 100000, 100),
+            "memo": rng.choice(MEMOS),
+            "category": rng.choice(CATEGORIES),
+        }
+        for i in range(count)
+    ]
+    return json.loads(json.dumps(items, ensure_ascii=False))
+
+
+def build(factory, sessions: int, pending: float, candidates: int) -> list:
+    rng = random.Random(42)
+    out = []
+    for _ in range(sessions):
+        session = factory()
+        session["natural_count"] = rng.randint(0, 2)
+        usage = session.setdefault("usage", {"turns": 0, **empty_usage()})
+        usage["turns"] += rng.randint(1, 50)
+        usage["input_tokens"] += rng.randint(1000, 100000)
+        usage["model_seconds"] += rng.random() * 10
+        if rng.random() < pending:
+            session["pending_action"] = rng.choice(["delete", "update"])
+            session["pending_tx_type"] = "EXPENSE"
+            key = "pending_delete_candidates" if session["pending_action"] == "delete" else "pending_update_candidates"
+            session[key] = backend_candidates(rng, candidates)
+        out.append(session)
+    return out
+
+
+def measure(factory, sessions: int, pending: float, candidates: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    built = build(factory, sessions, pending, candidates)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del built
+    return used / sessions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--pending", type=float, default=0.3)
+    parser.add_argument("--candidates", type=int, default=3)
+    args = parser.parse_args()
+
+    plain = measure(dict, args.sessions, args.pending, args.candidates)
+    record = measure(SessionRecord, args.sessions, args.pending, args.candidates)
+    print(f"sessions={args.sessions} pending={args.pending} candidates={args.candidates}")
+    print(f"before (dict)          : {plain:8.1f} bytes/session")
+    print(f"after  (SessionRecord) : {record:8.1f} bytes/session  ({record / plain:.0%})")
+
+    idle = measure(dict, args.sessions, 0.0, 0), measure(SessionRecord, args.sessions, 0.0, 0)
+    busy = measure(dict, args.sessions, 1.0, args.candidates), measure(SessionRecord, args.sessions, 1.0, args.candidates)
+    print(f"no pending   : {idle[0]:8.1f} → {idle[1]:8.1f} bytes/session")
+    print(f"all pending  : {busy[0]:8.1f} → {busy[1]:8.1f} bytes/session")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+세션 스냅숏 저장/복원 벤치마크
+
+    python bench/session_snapshot_bench.py [--sessions 1000000] [--pending 0.3] [--path /tmp/session_snapshot.bin]
+
+memory 저장소에 세션 N개(--pending 비율은 삭제/수정 후보 3개를 가진 컨펌 대기 상태)를 채운 뒤
+- write  : 스냅숏 파일 쓰기 시간과 크기
+- restore: 새 저장소로 복원하는 시간 (서버 시작 시 걸리는 시간)
+- access : 복원된 세션에 처음 접근할 때 SessionRecord로 바꾸는 비용
+- rewrite: 복원 직후 다시 스냅숏을 쓰는 시간 (접근하지 않은 세션은 다시 직렬화하지 않는다)
+을 재고, 일부 세션이 원래와 같은지 확인한다.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app import session_store  # noqa: E402
+from app.session_record import SessionRecord  # noqa: E402
+from app.session_store import MemoryBackend, SessionStore  # noqa: E402
+from app.usage_ledger import empty_usage  # noqa: E402
+
+MEMOS = ["점심", "커피", "택시", "편의점", "배민", "마트 장보기"]
+CATEGORIES = ["식비", "카페", "교통", "생활"]
+
+
+def fill(store: SessionStore, sessions: int, pending: float) -> None:
+    rng = random.Random(7)
+    for i in range(sessions):
+        session = SessionRecord()
+        session["natural_count"] = rng.randint(0, 2)
+        usage = session.setdefault("usage", {"turns": 0, **empty_usage()})
+        usage["turns"] += rng.randint(1, 50)
+        usage["input_tokens"] += rng.randint(1000, 100000)
+        if rng.random() < pending:
+            session["pending_action"] = "delete"
+            session["pending_tx_type"] = "EXPENSE"
+            session["pending_delete_candidates"] = [
+                {
+                    "number": n + 1,
+                    "date": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                    "amount": rng.randrange(1000, 100000, 100),
+                    "memo": rng.choice(MEMOS),
+                    "category": rng.choice(CATEGORIES),
+                }
+                for n in range(3)
+            ]
+        store[f"Bearer user-{i}"] = session
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    parser.add_argument("--pending", type=float, default=0.3)
+    parser.add_argument("--path", default="/tmp/session_snapshot_bench.bin")
+    args = parser.parse_args()
+
+    store = SessionStore(max_entries=args.sessions)
+    started = time.perf_counter()
+    fill(store, args.sessions, args.pending)
+    print(f"fill     : {time.perf_counter() - started:7.3f} s  ({args.sessions} sessions)")
+
+    started = time.perf_counter()
+    size = session_store.write_snapshot(store.snapshot_items(), args.path)
+    print(f"write    : {time.perf_counter() - started:7.3f} s  {size / 1e6:.1f} MB ({size / args.sessions:.0f} bytes/session)")
+
+    # 서버 시작 때와 같은 경로 (session_store.restore_snapshot)
+    restored = SessionStore(max_entries=args.sessions)
+    session_store.backend = MemoryBackend(restored)
+    started = time.perf_counter()
+    session_store.restore_snapshot(args.path)
+    print(f"restore  : {time.perf_counter() - started:7.3f} s  ({len(restored)} sessions)")
+
+    sample = random.Random(1).sample(range(args.sessions), min(10000, args.sessions))
+    started = time.perf_counter()
+    for i in sample:
+        restored.get(f"Bearer user-{i}")
+    per_access = (time.perf_counter() - started) / len(sample) * 1e6
+    print(f"access   : {per_access:7.2f} us  (first access after restore)")
+
+    mismatched = sum(
+        1 for i in sample
+        if restored.get(f"Bearer user-{i}").to_dict() != store.get(f"Bearer user-{i}").to_dict()
+    )
+    print(f"verified : {len(sample) - mismatched}/{len(sample)} sessions identical")
+
+    # 재시작 뒤 다음 스냅숏: 접근하지 않은 세션은 blob을 그대로 다시 쓴다
+    started = time.perf_counter()
+    session_store.write_snapshot(restored.snapshot_items(), args.path)
+    print(f"rewrite  : {time.perf_counter() - started:7.3f} s  (after restore, {len(sample)} sessions touched)")
+    os.remove(args.path)
+
+
+if __name__ == "__main__":
+    main()
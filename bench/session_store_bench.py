@@ -0,0 +1,79 @@
+"""
+app.session_store 벤치마크 (memory vs redis 프로토콜 저장소)
+
+    python bench/session_store_bench.py                           # 내장 RESP 대역 서버로
+    python bench/session_store_bench.py --url redis://localhost:6379/0   # 실제 Redis로
+
+- 워커 2개(저장소 인스턴스 2개)가 같은 세션을 보는지 확인한다:
+  워커 A에서 삭제 후보(pending_*)를 저장 → 워커 B의 다음 턴에서 그대로 읽힘
+- 턴 하나(begin_turn → 세션 수정 → end_turn)의 평균 시간과 턴당 왕복 수를 잰다.
+내장 대역 서버는 tests/resp_standin.py의 RespStandin이다 (GET/SET(EX)/EXPIRE/DEL/PING만 구현한 메모리 dict).
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app import session_store  # noqa: E402
+from app.session_store import MemoryBackend, RedisBackend, RespClient  # noqa: E402
+from tests.resp_standin import RespStandin  # noqa: E402
+
+
+async def run_turns(backend, turns: int, users: int) -> float:
+    session_store.backend = backend
+    started = time.perf_counter()
+    for i in range(turns):
+        auth = f"Bearer user-{i % users}"
+        session, token = await session_store.begin_turn(auth)
+        session["natural_count"] = session.get("natural_count", 0) + 1
+        await session_store.end_turn(token)
+    return (time.perf_counter() - started) / turns
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None, help="실제 Redis 주소 (없으면 내장 대역 서버)")
+    parser.add_argument("--turns", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=500)
+    args = parser.parse_args()
+
+    standin = None
+    url = args.url
+    if url is None:
+        standin = RespStandin()
+        url = await standin.start()
+
+    # 워커 2개가 같은 저장소를 공유하는지
+    worker_a = RedisBackend(RespClient(url), prefix="bench:session:")
+    worker_b = RedisBackend(RespClient(url), prefix="bench:session:")
+    session_store.backend = worker_a
+    session, token = await session_store.begin_turn("Bearer shared")
+    session.update(pending_action="delete", pending_tx_type="EXPENSE",
+                   pending_delete_candidates=[{"number": 1, "date": "2026-01-25", "amount": 8000}])
+    await session_store.end_turn(token)
+    session_store.backend = worker_b
+    session, token = await session_store.begin_turn("Bearer shared")
+    await session_store.end_turn(token)
+    print(f"worker B sees pending_action={session.get('pending_action')!r}, "
+          f"candidates={len(session.get('pending_delete_candidates', []))}")
+
+    memory = MemoryBackend()
+    redis = RedisBackend(RespClient(url), prefix="bench:session:")
+    memory_us = await run_turns(memory, args.turns, args.users) * 1e6
+    redis_us = await run_turns(redis, args.turns, args.users) * 1e6
+    rt = redis.client.round_trips / args.turns
+    print(f"memory : {memory_us:8.1f} us/turn")
+    print(f"redis  : {redis_us:8.1f} us/turn  ({rt:.2f} round trips/turn, {url})")
+    print(redis.stats())
+
+    for backend in (worker_a, worker_b, redis):
+        await backend.aclose()
+    if standin is not None:
+        await standin.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
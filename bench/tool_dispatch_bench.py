@@ -0,0 +1,100 @@
+"""
+tool 분기(dispatch) 비용 마이크로벤치마크 (if 분기 체인 vs tool_registry)
+
+    python bench/tool_dispatch_bench.py [--number 200000]
+
+TOOLS의 tool마다 "이름 → 실행할 핸들러"를 찾는 데 드는 시간만 잰다 (백엔드 호출은 하지 않는다).
+- before: 예전 _execute_tool_call과 같은 순서의 `if tool_name == ...` 체인
+  (중간에 transaction_tools set을 매 호출 만들고 로그인 확인 여부를 보는 것까지 포함)
+- after : tool_registry.get(tool_name) + 메타데이터(login_required) 확인
+체인 아래쪽 tool(sign_in, update_board 등)일수록 before가 느려지고, after는 tool과 상관없이 일정하다.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.tool_executor import tool_registry  # noqa: E402  (tool_executor를 import해야 tool이 등록된다)
+from app.tools import TOOLS  # noqa: E402
+
+# 예전 if 체인의 분기 순서
+CONFIRM_BRANCHES = [
+    "confirm_delete_by_chat", "confirm_delete_income_by_chat",
+    "update_expense_by_chat_confirm", "update_income_by_chat_confirm",
+]
+LATEST_BRANCHES = ["delete_latest_transaction", "update_latest_transaction"]
+BRANCHES = [
+    "create_expense", "create_expense_batch", "create_income", "create_income_batch",
+    "top_expense_weekday_avg", "list_expenses", "list_incomes", "delete_expense", "update_expense",
+    "delete_expense_by_chat", "delete_income_by_chat", "update_expense_by_chat", "update_income_by_chat",
+    "get_expense_summary", "get_income_summary", "get_top_expense_category",
+    "create_reply", "list_replies", "delete_reply", "update_reply",
+    "create_notice", "list_notices", "delete_notice", "update_notice",
+    "list_members", "verify_password", "delete_member", "update_member_info",
+    "create_budget", "list_budgets", "adjust_budget_limit",
+    "create_board", "get_board", "delete_board", "list_boards", "update_board",
+    "sign_in",
+]
+TRANSACTION_TOOLS = [
+    "create_expense", "create_expense_batch", "create_income", "create_income_batch",
+    "list_expenses", "list_incomes", "delete_expense", "update_expense",
+    "delete_expense_by_chat", "delete_income_by_chat", "update_expense_by_chat", "update_income_by_chat",
+    "get_expense_summary", "get_income_summary", "get_top_expense_category",
+    "top_expense_weekday_avg", "delete_latest_transaction", "update_latest_transaction",
+]
+
+
+def build_if_chain():
+    """예전 분기 구조를 그대로 흉내 낸 함수 (반환값은 분기 번호, 로그인 확인 여부)"""
+    lines = ["def dispatch(tool_name):"]
+    for i, name in enumerate(CONFIRM_BRANCHES):
+        lines.append(f"    if tool_name == {name!r}:\n        return {i}, False")
+    lines.append("    transaction_tools = {" + ", ".join(repr(n) for n in TRANSACTION_TOOLS) + "}")
+    for i, name in enumerate(LATEST_BRANCHES, len(CONFIRM_BRANCHES)):
+        lines.append(f"    if tool_name == {name!r}:\n        return {i}, False")
+    lines.append("    login = tool_name in transaction_tools")
+    for i, name in enumerate(BRANCHES, len(CONFIRM_BRANCHES) + len(LATEST_BRANCHES)):
+        lines.append(f"    if tool_name == {name!r}:\n        return {i}, login")
+    lines.append("    return None, False")
+    namespace: dict = {}
+    exec("\n".join(lines), namespace)
+    return namespace["dispatch"]
+
+
+def registry_dispatch(tool_name):
+    spec = tool_registry.get(tool_name)
+    if spec is None:
+        return None, False
+    return spec.handler, spec.login_required
+
+
+def per_call_ns(func, name: str, number: int) -> float:
+    return min(timeit.repeat(lambda: func(name), number=number, repeat=5)) / number * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=200000)
+    args = parser.parse_args()
+
+    if_chain = build_if_chain()
+    names = [t["name"] for t in TOOLS]
+    for name in names:
+        assert if_chain(name)[1] == registry_dispatch(name)[1], name
+
+    print(f"{'tool':<32} {'before(ns)':>10} {'after(ns)':>10}")
+    before_total = after_total = 0.0
+    for name in names:
+        before = per_call_ns(if_chain, name, args.number)
+        after = per_call_ns(registry_dispatch, name, args.number)
+        before_total += before
+        after_total += after
+        print(f"{name:<32} {before:10.1f} {after:10.1f}")
+    count = len(names)
+    print(f"{'mean':<32} {before_total / count:10.1f} {after_total / count:10.1f}  ({count} tools)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Redis 프로토콜(RESP) 대역 서버 (tests, bench/session_store_bench.py 공용)
+
+GET/SET(EX)/EXPIRE/DEL/PING만 구현한 메모리 dict다. TTL은 ttl dict에 적어만 두고 실제로 지우지는 않는다.
+받은 명령은 commands에 순서대로 남고, fail에 넣은 명령은 -ERR로 응답한다.
+"""
+import asyncio
+from typing import Any, Dict, List, Set, Tuple
+
+from app.session_store import _read_reply
+
+
+class RespStandin:
+    def __init__(self) -> None:
+        self.data: Dict[bytes, bytes] = {}
+        self.ttl: Dict[bytes, int] = {}
+        self.commands: List[Tuple[Any, ...]] = []
+        self.fail: Set[bytes] = set()
+        self._server = None
+
+    async def start(self) -> str:
+        """서버를 띄우고 redis:// 주소를 돌려준다."""
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"redis://127.0.0.1:{port}/0"
+
+    async def close(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    def _reply(self, args: List[bytes]) -> bytes:
+        cmd = args[0].upper()
+        if cmd in self.fail:
+            return b"-ERR injected failure\r\n"
+        if cmd == b"GET":
+            value = self.data.get(args[1])
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+        if cmd == b"SET":
+            self.data[args[1]] = args[2]
+            if len(args) >= 5 and args[3].upper() == b"EX":
+                self.ttl[args[1]] = int(args[4])
+            return b"+OK\r\n"
+        if cmd == b"EXPIRE":
+            if args[1] not in self.data:
+                return b":0\r\n"
+            self.ttl[args[1]] = int(args[2])
+            return b":1\r\n"
+        if cmd == b"DEL":
+            return b":%d\r\n" % sum(self.data.pop(k, None) is not None for k in args[1:])
+        if cmd == b"PING":
+            return b"+PONG\r\n"
+        return b"-ERR unknown command\r\n"
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """연결 하나"""
+        try:
+            while True:
+                args = await _read_reply(reader)
+                self.commands.append(tuple(args))
+                writer.write(self._reply(args))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            writer.close()
@@ -0,0 +1,80 @@
+import pytest
+
+from app.amount_parser import find_amount, find_amounts, parse_amount
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("8천원", 8000),
+        ("12000원", 12000),
+        ("12,000원", 12000),
+        ("1,200,000원", 1200000),
+        ("1만2천원", 12000),
+        ("1만 5천원", 15000),
+        ("3만5000원", 35000),
+        ("8.5천", 8500),
+        ("2.5만", 25000),
+        ("300만원", 3000000),
+        ("만원", 10000),
+        ("천원", 1000),
+        ("오만원", 50000),
+        ("칠천원", 7000),
+        ("구천원", 9000),
+        ("삼천오백원", 3500),
+        ("백오십만원", 1500000),
+        ("구천구백구십구", 9999),
+        ("삼천오백오십오원", 3555),
+        ("1억 2천만원", 120000000),
+        ("4500", 4500),
+    ],
+)
+def test_parse_amount(text, expected):
+    assert parse_amount(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "원", "0", "1,2,3", "12,00", "1,200,00원", "천천히"])
+def test_parse_amount_rejects(text):
+    assert parse_amount(text) is None
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("오늘 점심 8천원", [8000]),
+        ("어제 택시 12000원", [12000]),
+        ("월급 300만원 들어왔어", [3000000]),
+        ("커피 2잔 9천원", [9000]),
+        ("1번 금액 1800원으로 수정", [1800]),
+        ("3일 전 배민 23,000원", [23000]),
+        ("점심 삼천오백원", [3500]),
+        ("과자 구천구백구십구원", [9999]),
+        ("삼천오백오십오원 썼어", [3555]),
+        ("외식 12000원, 교통 1500원, 커피 4500원 등록해줘", [12000, 1500, 4500]),
+        ("커피 4500, 점심 8000", [4500, 8000]),
+        ("5만이면 괜찮아", [50000]),
+        ("1만2천500원", [12500]),
+        ("이번 달 지출 얼마야", []),
+        ("만나서 천천히 얘기하자", []),
+        ("2026-01-05 점심", []),
+        ("1,2,3", []),
+        ("1,2,3원", []),
+        ("1,200,00원", []),
+        ("안녕", []),
+    ],
+)
+def test_find_amounts(message, expected):
+    assert [amount for amount, _ in find_amounts(message)] == expected
+
+
+def test_find_amounts_span():
+    message = "점심 구천구백구십구원 썼어"
+    [(amount, (start, end))] = find_amounts(message)
+    assert amount == 9999
+    assert message[start:end] == "구천구백구십구원"
+
+
+def test_find_amount_requires_single_amount():
+    assert find_amount("점심 8천원") == 8000
+    assert find_amount("점심 8천원 커피 4천원") is None
+    assert find_amount("점심") is None
@@ -0,0 +1,66 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+import pytest
+
+from app import auth
+
+SECRET = b"test-secret"
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def make_token(claims, secret=SECRET, alg="HS256"):
+    signed = _b64(json.dumps({"alg": alg, "typ": "JWT"}).encode()) + "." + _b64(json.dumps(claims).encode())
+    digest = {"HS256": hashlib.sha256, "HS512": hashlib.sha512}[alg]
+    return "Bearer " + signed + "." + _b64(hmac.new(secret, signed.encode(), digest).digest())
+
+
+@pytest.fixture(autouse=True)
+def clean_cache(monkeypatch):
+    monkeypatch.setattr(auth, "JWT_SECRET", SECRET)
+    auth._CACHE.clear()
+    yield
+    auth._CACHE.clear()
+
+
+def test_verified_tokens_share_subject_key():
+    first = make_token({"sub": "alice", "exp": time.time() + 60})
+    refreshed = make_token({"sub": "alice", "exp": time.time() + 3600}, alg="HS512")
+    assert auth.user_key(first) == auth.user_key(refreshed) == "sub:alice"
+
+
+def test_forged_subject_is_not_trusted():
+    forged = make_token({"sub": "alice"}, secret=b"attacker")
+    assert auth.inspect(forged).verified is False
+    assert auth.user_key(forged).startswith("tok:")
+    assert auth.user_key(forged) != auth.user_key(make_token({"sub": "alice"}))
+
+
+def test_without_secret_keys_by_token_hash(monkeypatch):
+    monkeypatch.setattr(auth, "JWT_SECRET", b"")
+    token = make_token({"sub": "alice"})
+    key = auth.user_key(token)
+    assert key.startswith("tok:") and "alice" not in key
+    assert auth.user_key(make_token({"sub": "alice", "iat": 1})) != key
+
+
+def test_opaque_and_missing_headers():
+    assert auth.user_key(None) == "anonymous"
+    assert auth.user_key("") == "anonymous"
+    opaque = auth.user_key("Bearer not-a-jwt")
+    assert opaque.startswith("tok:") and "not-a-jwt" not in opaque
+
+
+def test_expiry_and_role():
+    expired = make_token({"sub": "alice", "role": "ROLE_USER", "exp": time.time() - auth.EXP_LEEWAY - 10})
+    assert auth.is_expired(expired)
+    assert auth.reject_expired(expired)
+    assert auth.role(expired) == "ROLE_USER"
+    assert not auth.is_expired(make_token({"sub": "alice", "exp": time.time() + 60}))
+    assert not auth.is_expired("Bearer not-a-jwt")
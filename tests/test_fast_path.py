@@ -0,0 +1,148 @@
+from datetime import date
+
+import pytest
+
+from app import fast_path
+
+TODAY = date(2026, 1, 25)
+
+
+def _match(message):
+    return fast_path._match(message, TODAY)
+
+
+@pytest.mark.parametrize(
+    "message, tool_name, amount, category, day",
+    [
+        ("오늘 점심 8천원", "create_expense", 8000, "외식", "2026-01-25"),
+        ("어제 택시 12000원", "create_expense", 12000, "교통", "2026-01-24"),
+        ("배민 23,500원 결제", "create_expense", 23500, "배달", "2026-01-25"),
+        ("월급 300만원 들어왔어", "create_income", 3000000, "월급", "2026-01-25"),
+        ("엄마한테 용돈 5만원 받았어", "create_income", 50000, "용돈", "2026-01-25"),
+    ],
+)
+def test_record_messages(message, tool_name, amount, category, day):
+    result = _match(message)
+    assert result is not None
+    assert result.tool_name == tool_name
+    assert result.arguments["amount"] == amount
+    assert result.arguments["category"] == category
+    assert result.arguments["date"] == day
+    assert result.confidence >= fast_path.MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "사장님한테 용돈 5만원 드렸어",
+        "조카 용돈 3만원 줬어",
+        "부모님께 용돈 20만원 보냈어",
+        "용돈 5만원 줌",
+        "동생 용돈 5만원 줌",
+        "조카 용돈 3만원 주기로 했어",
+        "할머니께 용돈 10만원 드려야지",
+    ],
+)
+def test_giving_allowance_is_not_income(message):
+    assert _match(message) is None
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "점심 8천원 얼마야",          # 조회
+        "어제 택시 12000원 삭제",     # 삭제
+        "점심 8천원 커피 4천원",      # 금액 2개 (batch)
+        "점심 커피 월급 8천원",       # 지출/수입 키워드가 섞임
+        "8천원",                      # 카테고리 없음
+        "점심 먹었어",                # 금액 없음
+        "점심 8천원이면 싸네",        # 가정
+        "내일 점심 8천원 쓸 예정",    # 앞으로의 일
+        "택시비 만원 넘게 나올까",    # 추측
+        "월급 300만원 받고싶다",      # 바람
+        "점심 8천원 쓰지 말걸",       # 후회
+        "점심 8천원 아니야",          # 부정
+        "점심 8천원 안 썼어",
+        "점심 8천원 환불 받았어",     # 환불
+        "친구가 점심 8천원 샀어",     # 남이 낸 돈
+        "커피값 5천원 아끼자",        # 절약
+        "택시 타고 갈까 버스 탈까 1500원 차이",
+        "",
+    ],
+)
+def test_ambiguous_messages_go_to_model(message):
+    assert _match(message) is None
+
+
+def test_date_mask_keeps_amount():
+    result = _match("3일 전 커피 4500원")
+    assert result.arguments["date"] == "2026-01-22"
+    assert result.arguments["amount"] == 4500
+
+
+@pytest.mark.parametrize(
+    "message, amount",
+    [
+        ("점심 라면 5천원", 5000),
+        ("저녁 안주 2만원", 20000),
+        ("내가 점심 8천원 샀어", 8000),
+        ("점심 8천원 샀어", 8000),
+    ],
+)
+def test_reject_patterns_keep_plain_records(message, amount):
+    result = _match(message)
+    assert result.tool_name == "create_expense"
+    assert result.arguments["amount"] == amount
+    assert result.confidence >= fast_path.MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize(
+    "message, new_data",
+    [
+        ("1번 금액 1800원으로 수정", {"amount": 1800}),
+        ("1번 메모 과자로 수정", {"memo": "과자"}),
+        ("1번 메모는 점심으로 바꿔", {"memo": "점심"}),
+        ('1번 메모를 "편의점 간식"으로 변경해줘', {"memo": "편의점 간식"}),
+        ('1번 메모를 "수정"으로 변경', {"memo": "수정"}),
+        ("1번 금액 1800원, 메모 과자로 수정", {"amount": 1800, "memo": "과자"}),
+    ],
+)
+def test_extract_update(message, new_data):
+    assert fast_path.extract_update(message, TODAY) == {"candidateIndex": 1, "newData": new_data}
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "1번 메모 수정",
+        "1번 메모 변경",
+        "1번 메모 바꿔줘",
+        "1번 메모 고쳐줘",
+        "1번 메모를 수정하고 싶어",
+        "1번 메모 바꾸고 싶어",
+        "2번 내용 수정해줘",
+        "1번 날짜 어제, 메모 변경해줘",
+        "1번 메모 로",
+        "메모 과자로 수정",  # 번호 없음
+    ],
+)
+def test_extract_update_without_new_value_falls_back(message):
+    assert fast_path.extract_update(message, TODAY) is None
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "월급 300만원이면 적은 편이야",
+        "택시 타고 갈까 버스 탈까 1500원 차이",
+    ],
+)
+def test_relaxed_match_keeps_write_floor(message):
+    assert fast_path.match_relaxed(message, TODAY) is None
+
+
+def test_relaxed_match_accepts_records():
+    result = fast_path.match_relaxed("점심 김치찌개 8천원", TODAY)
+    assert result.tool_name == "create_expense"
+    assert result.arguments["amount"] == 8000
+    assert fast_path.RELAXED_MIN_CONFIDENCE <= result.confidence
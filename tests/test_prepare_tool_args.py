@@ -0,0 +1,46 @@
+import pytest
+
+from app.main import prepare_tool_args
+
+
+def test_update_search_does_not_take_new_amount():
+    message = "어제 점심 금액 9천원으로 수정해줘"
+    args = prepare_tool_args("update_expense_by_chat", {"date": "2026-01-24", "memo": "점심"}, message)
+    assert "amount" not in args
+
+    args = prepare_tool_args("update_income_by_chat", {"date": "2026-01-24", "amount": 9000}, message)
+    assert "amount" not in args
+
+
+@pytest.mark.parametrize(
+    "model_amount, expected",
+    [
+        (8000, 8000),   # 검색 조건으로 적힌 금액은 그대로 둔다
+        (9000, None),   # '9천원으로'는 새 값
+        (1, None),      # 자리표시 값
+        (7000, None),   # 메시지에 없는 금액
+    ],
+)
+def test_update_search_checks_model_amount(model_amount, expected):
+    message = "8천원짜리 점심 9천원으로 바꿔줘"
+    args = prepare_tool_args("update_expense_by_chat", {"memo": "점심", "amount": model_amount}, message)
+    assert args.get("amount") == expected
+
+
+@pytest.mark.parametrize(
+    "args, expected",
+    [
+        ({}, 8500),
+        ({"amount": 1}, 8500),
+        ({"amount": 8000}, 8500),  # 모델이 '8.5천'을 잘못 읽음
+        ({"amount": 8500}, 8500),
+    ],
+)
+def test_create_fills_amount_from_message(args, expected):
+    result = prepare_tool_args("create_expense", {"date": "2026-01-25", **args}, "점심 8.5천")
+    assert result["amount"] == expected
+
+
+def test_create_keeps_model_amount_without_single_parsed_amount():
+    result = prepare_tool_args("create_expense", {"amount": 12000}, "점심 8천원이랑 커피 4천원")
+    assert result["amount"] == 12000
@@ -0,0 +1,48 @@
+import pytest
+
+from app import result_cache
+
+
+@pytest.fixture(autouse=True)
+def clean_cache(monkeypatch):
+    monkeypatch.setattr(result_cache, "MAX_ENTRIES", 4)
+    for store in (result_cache._ENTRIES, result_cache._USER_KEYS, result_cache._GENERATIONS):
+        store.clear()
+    yield
+
+
+def _read(user, result=None):
+    key = result_cache.make_key(user, "list_expenses", {"limit": 10, "message": "최근 지출"})
+    return key, result_cache.generation(user), result or {"ok": True, "items": []}
+
+
+def test_hit_and_invalidate():
+    key, gen, result = _read("sub:alice")
+    result_cache.put(key, result, gen)
+    assert result_cache.get(key) == result
+    result_cache.invalidate_user("sub:alice")
+    assert result_cache.get(key) is None
+
+
+def test_write_during_read_is_not_cached():
+    key, gen, result = _read("sub:alice")
+    result_cache.invalidate_user("sub:alice")
+    result_cache.put(key, result, gen)
+    assert result_cache.get(key) is None
+
+
+def test_generations_are_bounded():
+    for i in range(100):
+        result_cache.invalidate_user(f"tok:{i}")
+    assert len(result_cache._GENERATIONS) == result_cache.MAX_ENTRIES
+
+
+def test_evicted_generation_never_matches_old_read():
+    key, gen, result = _read("sub:alice")
+    result_cache.invalidate_user("sub:alice")
+    key, gen, result = _read("sub:alice")
+    for i in range(10):  # alice의 쓰기 번호가 LRU에서 밀려난다
+        result_cache.invalidate_user(f"tok:{i}")
+    result_cache.invalidate_user("sub:alice")
+    result_cache.put(key, result, gen)
+    assert result_cache.get(key) is None
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from app import session_store
+from app.session_store import KeyedLock, MemoryBackend, SessionStore
+
+CANDIDATES = [
+    {"number": 1, "date": "2026-01-25", "amount": 8000, "memo": "점심", "category": "식비"},
+    {"number": 2, "date": "2026-01-25", "amount": 8000, "memo": "점심", "category": "식비"},
+]
+
+
+@pytest.fixture(autouse=True)
+def memory_backend(monkeypatch):
+    backend = MemoryBackend(SessionStore())
+    monkeypatch.setattr(session_store, "backend", backend)
+    monkeypatch.setattr(session_store, "_LOCKS", KeyedLock())
+    return backend
+
+
+async def _set_pending(auth):
+    session, token = await session_store.begin_turn(auth)
+    session.update(pending_action="delete", pending_tx_type="EXPENSE", pending_delete_candidates=CANDIDATES)
+    await session_store.end_turn(token)
+
+
+async def _confirm_turn(auth, confirms):
+    """'1번' 턴: 후보가 남아 있으면 삭제 확정(백엔드 호출 대역)을 보내고 후보를 지운다."""
+    session, token = await session_store.begin_turn(auth)
+    try:
+        if session.get("pending_action") == "delete":
+            await asyncio.sleep(0.01)
+            confirms.append(auth)
+            session.pop("pending_action", None)
+            session.pop("pending_delete_candidates", None)
+    finally:
+        await session_store.end_turn(token)
+
+
+def test_concurrent_confirms_on_one_session_run_once():
+    confirms = []
+
+    async def main():
+        await _set_pending("Bearer a")
+        await asyncio.gather(*(_confirm_turn("Bearer a", confirms) for _ in range(8)))
+
+    asyncio.run(main())
+    assert confirms == ["Bearer a"]
+    assert session_store._LOCKS.stats()["active_keys"] == 0
+
+
+def test_each_session_confirms_once_under_load():
+    confirms = []
+    auths = [f"Bearer user-{i}" for i in range(20)]
+
+    async def main():
+        for auth in auths:
+            await _set_pending(auth)
+        await asyncio.gather(*(_confirm_turn(auth, confirms) for auth in auths for _ in range(4)))
+
+    asyncio.run(main())
+    assert sorted(confirms) == sorted(auths)
+
+
+def test_other_user_does_not_wait_on_held_lock():
+    async def main():
+        _, held = await session_store.begin_turn("Bearer a")
+        try:
+            # 같은 세션은 잠금이 풀릴 때까지 기다린다
+            same = asyncio.ensure_future(session_store.begin_turn("Bearer a"))
+            await asyncio.sleep(0.01)
+            assert not same.done()
+
+            # 다른 사용자는 바로 턴을 시작한다
+            _, other = await asyncio.wait_for(session_store.begin_turn("Bearer b"), timeout=0.5)
+            await session_store.end_turn(other)
+        finally:
+            await session_store.end_turn(held)
+        _, token = await asyncio.wait_for(same, timeout=0.5)
+        await session_store.end_turn(token)
+
+    asyncio.run(main())
+    assert session_store._LOCKS.stats()["active_keys"] == 0
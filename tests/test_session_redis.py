@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+from app import session_store
+from app.session_store import RedisBackend, RespClient, SessionRecord
+from tests.resp_standin import RespStandin
+
+CANDIDATE = {"number": 1, "date": "2026-01-25", "amount": 8000, "memo": "점심", "category": "식비"}
+
+
+def run_with_backend(test):
+    """대역 서버와 RedisBackend를 띄워 test(standin, backend, url)를 실행한다."""
+    async def main():
+        standin = RespStandin()
+        url = await standin.start()
+        backend = RedisBackend(RespClient(url), prefix="test:session:", idle_ttl=600)
+        try:
+            return await test(standin, backend, url)
+        finally:
+            await backend.aclose()
+            await standin.close()
+
+    return asyncio.run(main())
+
+
+def test_load_sends_get_and_expire_in_one_round_trip():
+    async def test(standin, backend, url):
+        key = backend._key("sub:alice").encode()
+        standin.data[key] = json.dumps({"natural_count": 2, "_seen": 0}).encode()
+
+        session, state = await backend.load("sub:alice")
+        assert isinstance(session, SessionRecord)
+        assert session["natural_count"] == 2
+        assert state == standin.data[key]
+        assert standin.commands == [(b"GET", key), (b"EXPIRE", key, b"600")]
+        assert standin.ttl[key] == 600
+        assert backend.client.round_trips == 1
+
+    run_with_backend(test)
+
+
+def test_save_sets_with_expiry():
+    async def test(standin, backend, url):
+        session, state = await backend.load("sub:alice")
+        session.update(pending_action="delete", pending_tx_type="EXPENSE", pending_delete_candidates=[CANDIDATE])
+        await backend.save("sub:alice", session, state)
+
+        key = backend._key("sub:alice").encode()
+        assert standin.commands[-1][:2] == (b"SET", key)
+        assert standin.commands[-1][3:] == (b"EX", b"600")
+        stored = json.loads(standin.data[key])
+        assert stored.pop("_seen") > 0
+        restored = SessionRecord.from_dict(stored)
+        assert restored["pending_action"] == "delete"
+        assert restored["pending_delete_candidates"][0]["memo"] == "점심"
+        assert backend.stats()["saves"] == 1
+
+    run_with_backend(test)
+
+
+def test_unchanged_session_is_not_saved():
+    async def test(standin, backend, url):
+        session, state = await backend.load("sub:alice")
+        session["natural_count"] = 1
+        await backend.save("sub:alice", session, state)
+
+        session, state = await backend.load("sub:alice")
+        sent = len(standin.commands)
+        await backend.save("sub:alice", session, state)
+        assert len(standin.commands) == sent
+        assert backend.stats()["skipped_saves"] == 1
+
+    run_with_backend(test)
+
+
+def test_failed_load_does_not_overwrite():
+    async def test(standin, backend, url):
+        key = backend._key("sub:alice").encode()
+        standin.data[key] = json.dumps({"natural_count": 3}).encode()
+        standin.fail.add(b"GET")
+
+        session, state = await backend.load("sub:alice")
+        assert session == SessionRecord()
+        session["natural_count"] = 1
+        await backend.save("sub:alice", session, state)
+
+        assert not any(command[0] == b"SET" for command in standin.commands)
+        assert json.loads(standin.data[key]) == {"natural_count": 3}
+        assert backend.stats()["errors"] == 1
+
+    run_with_backend(test)
+
+
+def test_turns_share_session_across_workers(monkeypatch):
+    async def test(standin, backend, url):
+        other = RedisBackend(RespClient(url), prefix="test:session:")
+        try:
+            monkeypatch.setattr(session_store, "backend", backend)
+            session, token = await session_store.begin_turn("Bearer shared")
+            session.update(pending_action="delete", pending_delete_candidates=[CANDIDATE])
+            await session_store.end_turn(token)
+
+            monkeypatch.setattr(session_store, "backend", other)
+            session, token = await session_store.begin_turn("Bearer shared")
+            await session_store.end_turn(token)
+            assert session["pending_action"] == "delete"
+            assert session["pending_delete_candidates"][0]["amount"] == 8000
+        finally:
+            await other.aclose()
+
+    run_with_backend(test)
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from app import session_store
+from app.session_store import MemoryBackend, SessionStore
+
+CANDIDATE = {"number": 1, "date": "2026-01-25", "amount": 8000, "memo": "점심", "category": "식비"}
+
+
+@pytest.fixture
+def memory_backend(monkeypatch, tmp_path):
+    monkeypatch.setattr(session_store, "SNAPSHOT_PATH", str(tmp_path / "snapshot.bin"))
+    backend = MemoryBackend(SessionStore())
+    monkeypatch.setattr(session_store, "backend", backend)
+    return backend
+
+
+def test_snapshot_round_trip(memory_backend, tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    memory_backend.store["sub:alice"] = {"natural_count": 1, "pending_action": "delete",
+                                         "pending_delete_candidates": [CANDIDATE]}
+    asyncio.run(session_store.save_snapshot(path))
+
+    restored = MemoryBackend(SessionStore())
+    session_store.backend = restored
+    assert session_store.restore_snapshot(path) == 1
+    session = restored.store["sub:alice"]
+    assert session["pending_action"] == "delete"
+    assert session["pending_delete_candidates"][0]["date"] == "2026-01-25"
+
+
+def test_sessions_are_frozen_before_the_write_thread(memory_backend, monkeypatch, tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    memory_backend.store["sub:alice"] = {"natural_count": 1}
+    write = session_store.write_snapshot
+
+    def write_after_change(items, path):
+        # 스레드에서 쓰는 중에 루프 쪽 요청이 세션을 바꾼 상황
+        memory_backend.store["sub:alice"]["pending_action"] = "delete"
+        return write(items, path)
+
+    monkeypatch.setattr(session_store, "write_snapshot", write_after_change)
+    asyncio.run(session_store.save_snapshot(path))
+
+    session_store.backend = MemoryBackend(SessionStore())
+    session_store.restore_snapshot(path)
+    assert "pending_action" not in session_store.backend.store["sub:alice"]
+
+
+def test_unexpected_errors_are_logged_not_raised(memory_backend, monkeypatch, tmp_path):
+    def broken(items, path):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(session_store, "write_snapshot", broken)
+    errors = session_store._SNAPSHOT_STATS["errors"]
+    asyncio.run(session_store.save_snapshot(str(tmp_path / "snapshot.bin")))
+    assert session_store._SNAPSHOT_STATS["errors"] == errors + 1
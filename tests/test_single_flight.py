@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from app import single_flight
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    single_flight._INFLIGHT.clear()
+    single_flight._RECENT.clear()
+    yield
+
+
+def test_followers_share_leader_result():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"reply": "ok"}
+
+    async def main():
+        key = single_flight.make_key("Bearer a", "점심 8천원")
+        return await asyncio.gather(*(single_flight.run(key, work) for _ in range(3)))
+
+    assert asyncio.run(main()) == [{"reply": "ok"}] * 3
+    assert len(calls) == 1
+
+
+def test_follower_takes_over_when_leader_is_cancelled():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"reply": len(calls)}
+
+    async def main():
+        key = single_flight.make_key("Bearer a", "점심 8천원")
+        leader = asyncio.create_task(single_flight.run(key, work))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(single_flight.run(key, work)) for _ in range(2)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers)
+
+    assert asyncio.run(main()) == [{"reply": 2}, {"reply": 2}]
+    assert len(calls) == 2
+    assert not single_flight._INFLIGHT
@@ -0,0 +1,23 @@
+from app import auth, usage_ledger
+from tests.test_auth import SECRET, make_token
+
+
+def test_user_key_follows_verified_subject(monkeypatch):
+    monkeypatch.setattr(auth, "JWT_SECRET", SECRET)
+    auth._CACHE.clear()
+    first = make_token({"sub": "alice", "iat": 1})
+    rotated = make_token({"sub": "alice", "iat": 2})
+    assert usage_ledger.user_key(first) == usage_ledger.user_key(rotated)
+    assert usage_ledger.user_key(first) != usage_ledger.user_key(make_token({"sub": "bob"}))
+    assert "alice" not in usage_ledger.user_key(first)
+    assert usage_ledger.user_key(None) == "anonymous"
+    auth._CACHE.clear()
+
+
+def test_turn_is_added_to_user_ledger():
+    token = usage_ledger.begin_turn()
+    usage_ledger.record_call("test-model", type("Usage", (), {"input_tokens": 100, "output_tokens": 5})(), 0.1)
+    turn = usage_ledger.end_turn(token, None, "Bearer opaque-token")
+    assert turn["calls"] == 1 and turn["input_tokens"] == 100
+    ledger = usage_ledger.user_usage(usage_ledger.user_key("Bearer opaque-token"))
+    assert ledger["turns"] >= 1 and ledger["input_tokens"] >= 100